@@ -0,0 +1,230 @@
+import math
+import re
+from typing import List, Optional, Tuple, Union
+
+from .tools import add, subtract, multiply, divide, square, cube, power
+
+
+Number = Union[int, float]
+
+# Largest number of decimal digits a power, square, cube or product may
+# produce before we give up and let the LLM agent handle the request.
+MAX_RESULT_DIGITS = 300
+
+
+class ArithmeticParseError(ValueError):
+    """Raised when the input is not a well-formed arithmetic expression."""
+
+
+_QUESTION_PREFIX = re.compile(
+    r"^\s*(?:what\s+is|what's|whats|calculate|compute|evaluate|solve)\s*:?\s*",
+    re.IGNORECASE,
+)
+_QUESTION_SUFFIX = re.compile(r"[\s?.!=]+$")
+
+_NUMBER = r"-?\d+(?:\.\d+)?"
+_PREFIX_FORMS = [
+    (re.compile(rf"^add\s+({_NUMBER})\s+(?:and|to)\s+({_NUMBER})$"), "{0} + {1}"),
+    (re.compile(rf"^(?:the\s+)?sum\s+of\s+({_NUMBER})\s+and\s+({_NUMBER})$"), "{0} + {1}"),
+    (re.compile(rf"^subtract\s+({_NUMBER})\s+from\s+({_NUMBER})$"), "{1} - {0}"),
+    (re.compile(rf"^multiply\s+({_NUMBER})\s+(?:and|by|with)\s+({_NUMBER})$"), "{0} * {1}"),
+    (re.compile(rf"^(?:the\s+)?product\s+of\s+({_NUMBER})\s+and\s+({_NUMBER})$"), "{0} * {1}"),
+    (re.compile(rf"^divide\s+({_NUMBER})\s+by\s+({_NUMBER})$"), "{0} / {1}"),
+    (re.compile(rf"^(?:the\s+)?square\s+(?:of\s+)?({_NUMBER})$"), "{0}²"),
+    (re.compile(rf"^(?:the\s+)?cube\s+(?:of\s+)?({_NUMBER})$"), "{0}³"),
+    (re.compile(rf"^raise\s+({_NUMBER})\s+to\s+the\s+power\s+of\s+({_NUMBER})$"), "{0} ^ {1}"),
+]
+_INFIX_WORDS = [
+    (re.compile(r"\bplus\b"), "+"),
+    (re.compile(r"\bminus\b"), "-"),
+    (re.compile(r"\b(?:times|multiplied\s+by)\b"), "*"),
+    (re.compile(r"\bdivided\s+by\b"), "/"),
+    (re.compile(r"\bto\s+the\s+power\s+of\b"), "^"),
+    (re.compile(r"\bsquared\b"), "²"),
+    (re.compile(r"\bcubed\b"), "³"),
+]
+
+_TOKEN = re.compile(r"\s*(?:(\d+(?:\.\d+)?)|(\*\*|[-+*/×÷^()²³]))")
+
+
+def _tokenize(expression: str) -> List[str]:
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match:
+            raise ArithmeticParseError(f"Unexpected input at: {expression[position:]}")
+        tokens.append(match.group(1) or match.group(2))
+        position = match.end()
+    if not tokens:
+        raise ArithmeticParseError("Empty expression")
+    return tokens
+
+
+def _digits(value: Number) -> float:
+    """Approximate number of integer digits of a value (0 for |value| <= 1)."""
+    if isinstance(value, complex) or abs(value) <= 1:
+        return 0.0
+    if isinstance(value, int):
+        return value.bit_length() * math.log10(2)
+    return math.log10(abs(value))
+
+
+def _check_digits(digits: float):
+    if digits > MAX_RESULT_DIGITS:
+        raise OverflowError("Result too large for the fast path")
+
+
+def _apply_power(base: Number, exponent: Number) -> Number:
+    if not isinstance(exponent, complex) and exponent > 0:
+        _check_digits(exponent * _digits(base))
+    if base == 0 and exponent < 0:
+        raise ArithmeticParseError("Zero cannot be raised to a negative power")
+    return power.func(base, exponent)
+
+
+class _Parser:
+    """Recursive-descent parser that evaluates with the math agent's tools.
+
+    expr    := term (('+' | '-') term)*
+    term    := unary (('*' | '×' | '/' | '÷') unary)*
+    unary   := ('+' | '-') unary | power
+    power   := postfix (('^' | '**') unary)?
+    postfix := primary ('²' | '³')*
+    primary := NUMBER | '(' expr ')'
+    """
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+        self.position = 0
+
+    def _peek(self) -> Optional[str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def _next(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise ArithmeticParseError("Unexpected end of expression")
+        self.position += 1
+        return token
+
+    def parse(self) -> Number:
+        value = self._expr()
+        if self._peek() is not None:
+            raise ArithmeticParseError(f"Unexpected token: {self._peek()}")
+        return value
+
+    def _expr(self) -> Number:
+        value = self._term()
+        while self._peek() in ("+", "-"):
+            if self._next() == "+":
+                value = add.func(value, self._term())
+            else:
+                value = subtract.func(value, self._term())
+        return value
+
+    def _term(self) -> Number:
+        value = self._unary()
+        while self._peek() in ("*", "×", "/", "÷"):
+            if self._next() in ("*", "×"):
+                factor = self._unary()
+                _check_digits(_digits(value) + _digits(factor))
+                value = multiply.func(value, factor)
+            else:
+                divisor = self._unary()
+                if divisor == 0:
+                    raise ArithmeticParseError("Division by zero")
+                value = divide.func(value, divisor)
+        return value
+
+    def _unary(self) -> Number:
+        if self._peek() == "-":
+            self._next()
+            return subtract.func(0, self._unary())
+        if self._peek() == "+":
+            self._next()
+            return self._unary()
+        return self._power()
+
+    def _power(self) -> Number:
+        base = self._postfix()
+        if self._peek() in ("^", "**"):
+            self._next()
+            return _apply_power(base, self._unary())
+        return base
+
+    def _postfix(self) -> Number:
+        value = self._primary()
+        while self._peek() in ("²", "³"):
+            exponent = 2 if self._next() == "²" else 3
+            _check_digits(exponent * _digits(value))
+            value = square.func(value) if exponent == 2 else cube.func(value)
+        return value
+
+    def _primary(self) -> Number:
+        token = self._next()
+        if token == "(":
+            value = self._expr()
+            if self._next() != ")":
+                raise ArithmeticParseError("Missing closing parenthesis")
+            return value
+        if token[0].isdigit():
+            return float(token) if "." in token else int(token)
+        raise ArithmeticParseError(f"Unexpected token: {token}")
+
+
+def _normalize(text: str) -> str:
+    """Strip question phrasing and rewrite word operators as symbols."""
+    expression = _QUESTION_PREFIX.sub("", text.strip())
+    expression = _QUESTION_SUFFIX.sub("", expression).strip().lower()
+
+    for pattern, template in _PREFIX_FORMS:
+        match = pattern.match(expression)
+        if match:
+            return template.format(*match.groups())
+
+    for pattern, symbol in _INFIX_WORDS:
+        expression = pattern.sub(symbol, expression)
+    return expression
+
+
+def _format_number(value: Number) -> str:
+    if isinstance(value, float):
+        if value.is_integer():
+            return str(int(value))
+        return f"{value:.10g}"
+    return str(value)
+
+
+def solve(text: str) -> Optional[Tuple[str, Number]]:
+    """Evaluate a plain arithmetic request without the LLM.
+
+    Returns the normalized expression and its value, or None when the input is
+    not a well-formed expression and should go to the LLM agent instead.
+    """
+    if len(text) > 200:
+        return None
+
+    expression = _normalize(text)
+    try:
+        value = _Parser(_tokenize(expression)).parse()
+    except (ArithmeticParseError, OverflowError, ValueError, ZeroDivisionError):
+        return None
+
+    # e.g. a fractional power of a negative number; leave those to the LLM
+    if isinstance(value, complex):
+        return None
+
+    # A bare number is not a question worth answering on the fast path
+    if len(_tokenize(expression)) == 1:
+        return None
+
+    return expression, value
+
+
+def format_solution(expression: str, value: Number) -> str:
+    """Render a fast-path result the way the math agent reports answers."""
+    return f"{expression} = {_format_number(value)}"
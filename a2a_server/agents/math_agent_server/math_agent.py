@@ -1,9 +1,12 @@
 from a2a_server.common.base_agent import BaseAgent
+from a2a_server.common.metrics import stats_metrics
 from a2a_server.common.models import MathResponseFormat
 from a2a_server.common.prompts import MATH_AGENT_PROMPT
 from langgraph.prebuilt import create_react_agent
+from .fast_path import solve, format_solution
 from .tools import add, subtract, multiply, divide, square, cube, power
-from logger import logger
+from logger import debug_enabled, logger
+from settings import settings
 
 
 class MathAgent(BaseAgent):
@@ -11,6 +14,9 @@ class MathAgent(BaseAgent):
 
     def __init__(self):
         super().__init__(model_name="gpt-4o-mini", temperature=0.0)
+        self.fast_path_enabled = settings.MATH_FAST_PATH_ENABLED
+        self.fast_path_hits = 0
+        self.llm_fallbacks = 0
 
     def get_tools(self):
         """Return math tools."""
@@ -30,25 +36,78 @@ class MathAgent(BaseAgent):
             model=self.llm,
             tools=self.get_tools(),
             prompt=self.get_prompt(),
-            debug=True,
+            debug=debug_enabled(),
             checkpointer=self.memory,
+            pre_model_hook=self.get_pre_model_hook(),
             response_format=self.get_response_format(),
         )
 
+    def _try_fast_path(self, input_text: str):
+        """Answer well-formed arithmetic directly, without an LLM round trip."""
+        if not self.fast_path_enabled:
+            return None
+
+        solution = solve(input_text)
+        if solution is None:
+            return None
+
+        return MathResponseFormat(math_output=format_solution(*solution))
+
+    def get_stats(self):
+        """Return how often the deterministic fast path answered a request."""
+        total = self.fast_path_hits + self.llm_fallbacks
+        return {
+            "fast_path_hits": self.fast_path_hits,
+            "llm_fallbacks": self.llm_fallbacks,
+            "fast_path_ratio": self.fast_path_hits / total if total else 0.0,
+        }
+
+    def collect_metrics(self):
+        return super().collect_metrics() + stats_metrics(
+            "math_agent",
+            "Math agent fast path usage",
+            self.get_stats(),
+            counters=("fast_path_hits", "llm_fallbacks"),
+        )
+
     async def invoke_agent(self, input_text: str, session_id: str):
+        fast_response = self._try_fast_path(input_text)
+        if fast_response is not None:
+            self.fast_path_hits += 1
+            logger.info("Math fast path answered: %s", fast_response.math_output)
+            return self._process_response(fast_response)
+
+        self.llm_fallbacks += 1
         try:
             messages = {"messages": [("user", input_text)]}
-            config = {"configurable": {"thread_id": session_id}}
+            config = self.run_config(session_id)
 
-            await self.agent.ainvoke(input=messages, config=config, debug=True)
+            await self.agent.ainvoke(
+                input=messages, config=config, debug=debug_enabled()
+            )
 
             result = self.agent.get_state(config).values.get("structured_response")
             return self._process_response(result)
 
         except Exception as e:
-            logger.info(f"Error running agent: {str(e)}")
+            logger.info("Error running agent: %s", e)
             return f"Error running query: {str(e)}"
 
+    async def stream_agent(self, input_text: str, session_id: str):
+        fast_response = self._try_fast_path(input_text)
+        if fast_response is not None:
+            self.fast_path_hits += 1
+            logger.info("Math fast path answered: %s", fast_response.math_output)
+            yield {
+                "is_task_complete": True,
+                "content": self._process_response(fast_response),
+            }
+            return
+
+        self.llm_fallbacks += 1
+        async for event in super().stream_agent(input_text, session_id):
+            yield event
+
     def _process_response(self, response):
         """Process the math agent's response."""
         if isinstance(response, MathResponseFormat):
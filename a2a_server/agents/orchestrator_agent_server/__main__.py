@@ -1,60 +1,56 @@
+from a2a.types import DataPart
 from a2a_server.common.base_agent_server import BaseAgentServer
 from a2a_server.common.base_agent_executor import BaseAgentExecutor
 from .orchestrator_agent import OrchestratorAgent
-from a2a.utils import new_agent_text_message
 from logger import logger
+from settings import settings
 
 
 class OrchestratorExecutor(BaseAgentExecutor):
     def __init__(self):
         super().__init__()
-        # Define remote agent addresses
-        remote_agents = [
-            "http://localhost:10004",
-            "http://localhost:10005",
-        ]
-        self.agent = OrchestratorAgent(remote_agents)
+        # Addresses serving the same agent card are pooled as replicas
+        self.agent = OrchestratorAgent(settings.REMOTE_AGENT_URLS)
 
     def get_agent(self):
         return self.agent
 
-    async def execute(self, context, event_queue):
-        """Override to handle orchestrator's special execution flow."""
-        try:
-            await self._ensure_agent_ready()
-
-            user_input = context.get_user_input()
-            session_id = context.context_id or "default"
+    def batch_queries(self, context):
+        """Queries of a batch request: a data part of the form {"queries": [...]}."""
+        for part in context.message.parts if context.message else []:
+            if isinstance(part.root, DataPart):
+                queries = part.root.data.get("queries")
+                if isinstance(queries, list) and queries:
+                    return [str(query) for query in queries]
+        return None
+
+    def agent_events(self, context, user_input: str, session_id: str):
+        queries = self.batch_queries(context)
+        if queries:
+            return self.agent.stream_batch(queries, session_id)
+        return super().agent_events(context, user_input, session_id)
+
+    def format_result(self, result) -> str:
+        """Format the orchestrator's execution result for output."""
+        logger.info("Orchestrator result: %s", result)
+
+        if isinstance(result, dict):
+            if result.get("status") == "completed":
+                # Format the execution summary
+                output = f"Execution Summary: {result.get('summary', 'Completed')}\n\n"
+                combined_result = []
+                for task_id, task_result in result.get("results", {}).items():
+                    output += f"Task {task_id} ({task_result.get('agent')}): {task_result.get('result', 'No result')}\n"
+                    combined_result.append(
+                        f"{task_result.get('task')} is {task_result.get('result')}"
+                    )
 
-            # Process through the orchestrator
-            result = await self.agent.process_query(user_input, session_id)
-            logger.info(f"Orchestrator result: {result}")
+                # Add the combined 'result' field
+                result["result"] = " and ".join(combined_result)
+                return output
+            return str(result)
 
-            # Format the result for output
-            if isinstance(result, dict):
-                if result.get("status") == "completed":
-                    # Format the execution summary
-                    output = (
-                        f"Execution Summary: {result.get('summary', 'Completed')}\n\n"
-                    )
-                    combined_result = []
-                    for task_id, task_result in result.get("results", {}).items():
-                        output += f"Task {task_id} ({task_result.get('agent')}): {task_result.get('result', 'No result')}\n"
-                        combined_result.append(
-                            f"{task_result.get('task')} is {task_result.get('result')}"
-                        )
-
-                    # Add the combined 'result' field
-                    result["result"] = " and ".join(combined_result)
-                    result = output
-                else:
-                    result = str(result)
-
-            await event_queue.enqueue_event(new_agent_text_message(result))
-
-        except Exception as e:
-            logger.info(f"Error in orchestrator execution: {e}")
-            raise
+        return result
 
 
 class OrchestratorServer(BaseAgentServer):
@@ -1,12 +1,46 @@
 import asyncio
-from typing import List, Dict, Any, Set
+import json
+import logging
+import random
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from a2a.types import (
+    Message,
+    Task as A2ATask,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatusUpdateEvent,
+)
+from langchain_core.messages import AIMessage, HumanMessage
 from langgraph.prebuilt import create_react_agent
 
-from a2a_server.common.base_agent import BaseAgent
+from a2a_server.common.agent_card_cache import AgentCardCache
+from a2a_server.common.base_agent import BaseAgent, is_failure_reply
+from a2a_server.common.circuit_breaker import CLOSED, HALF_OPEN, CircuitOpenError
+from a2a_server.common.concurrency import ConcurrencyLimiter
 from a2a_server.common.prompts import ORCHESTRATOR_AGENT_PROMPT
+from a2a_server.common.metrics import Metric, merge_metrics, stats_metrics
 from a2a_server.common.models import OrchestratorResponseFormat, ExecutionPlan, Task
+from a2a_server.common.plan_cache import PlanCache
+from a2a_server.common.plan_stream import PlanStreamParser
 from a2a_server.common.remote_agent_connection import RemoteAgentConnection
-from logger import logger
+from a2a_server.common.replica_pool import Replica, ReplicaPool
+from a2a_server.common.result_cache import RemoteResultCache, normalize_input
+from a2a_server.common.retry import RetryPolicy, is_retryable
+from a2a_server.common.scheduler import DataflowScheduler
+from a2a_server.common.skill_router import SkillRouter
+from a2a_server.common.speculation import PlanSpeculation, SpeculationStats
+from a2a_server.common.tracing import Span, get_tracer
+from logger import debug_enabled, logger
+from settings import settings
+
+
+ProgressCallback = Callable[[str], None]
+TaskCallback = Callable[[Dict[str, Any]], None]
+
+# LangGraph node that writes the structured response of a ReAct agent
+STRUCTURED_RESPONSE_NODE = "generate_structured_response"
 
 
 class OrchestratorAgent(BaseAgent):
@@ -14,9 +48,66 @@ class OrchestratorAgent(BaseAgent):
 
     def __init__(self, remote_agent_addresses: List[str]):
         self.remote_agent_addresses = remote_agent_addresses
-        self.remote_connections: Dict[str, RemoteAgentConnection] = {}
+        # Agent name -> pool of replicas serving that agent's card
+        self.remote_connections: Dict[str, ReplicaPool] = {}
         self.available_agents: Dict[str, Dict[str, Any]] = {}
 
+        self.card_cache = AgentCardCache(
+            settings.AGENT_CARD_CACHE_DIR, ttl=settings.AGENT_CARD_CACHE_TTL
+        )
+
+        self.plan_cache = (
+            PlanCache(
+                max_entries=settings.PLAN_CACHE_MAX_ENTRIES,
+                ttl=settings.PLAN_CACHE_TTL,
+                templated=settings.PLAN_CACHE_TEMPLATES,
+            )
+            if settings.PLAN_CACHE_ENABLED
+            else None
+        )
+
+        # Shared by every session handled by this orchestrator
+        self.concurrency = ConcurrencyLimiter(
+            global_limit=settings.GLOBAL_MAX_IN_FLIGHT,
+            default_agent_limit=settings.AGENT_MAX_IN_FLIGHT,
+            agent_limits=settings.AGENT_CONCURRENCY_LIMITS,
+        )
+
+        self.result_cache = (
+            RemoteResultCache(
+                max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+                default_ttl=settings.RESULT_CACHE_DEFAULT_TTL,
+                agent_ttls=settings.RESULT_CACHE_AGENT_TTLS,
+                # Agents report their own failures as text; never cache those
+                is_cacheable=lambda result: bool(result)
+                and not is_failure_reply(result),
+            )
+            if settings.RESULT_CACHE_ENABLED
+            else None
+        )
+
+        self.speculation_stats = SpeculationStats()
+
+        self.router = (
+            SkillRouter(
+                min_confidence=settings.SKILL_ROUTER_MIN_CONFIDENCE,
+                min_score=settings.SKILL_ROUTER_MIN_SCORE,
+                min_coverage=settings.SKILL_ROUTER_MIN_COVERAGE,
+            )
+            if settings.SKILL_ROUTER_ENABLED
+            else None
+        )
+        # Background planner runs that check routing decisions
+        self._shadow_checks: Set[asyncio.Task] = set()
+
+        self.batch_stats = {"batches": 0, "queries": 0, "duplicates": 0}
+
+        self.retry_policy = RetryPolicy(
+            max_retries=settings.TASK_MAX_RETRIES,
+            backoff_base=settings.RETRY_BACKOFF_BASE,
+            backoff_max=settings.RETRY_BACKOFF_MAX,
+        )
+
         super().__init__(model_name="gpt-4.1", temperature=0.0)
 
     def get_tools(self):
@@ -42,60 +133,150 @@ class OrchestratorAgent(BaseAgent):
         """Return the response format."""
         return OrchestratorResponseFormat
 
+    async def _connect_remote_agent(self, address: str) -> RemoteAgentConnection:
+        """Resolve a single remote agent, bounded by the discovery timeout."""
+        return await asyncio.wait_for(
+            RemoteAgentConnection.create_from_url(address, card_cache=self.card_cache),
+            timeout=settings.AGENT_DISCOVERY_TIMEOUT,
+        )
+
+    def _register_agent(self, connection: RemoteAgentConnection):
+        """Register a connected agent and store its capabilities for planning.
+
+        Addresses serving a card with the same name are replicas of one agent
+        and share a pool.
+        """
+        card = connection.card
+
+        pool = self.remote_connections.get(card.name)
+        if pool is not None:
+            if pool.add(connection):
+                self._scale_agent_limit(card.name)
+            return
+
+        pool = ReplicaPool(
+            card.name,
+            strategy=settings.REPLICA_STRATEGY,
+            ewma_alpha=settings.REPLICA_EWMA_ALPHA,
+            error_threshold=settings.REPLICA_ERROR_THRESHOLD,
+            slow_factor=settings.REPLICA_SLOW_FACTOR,
+            ejection_time=settings.REPLICA_EJECTION_TIME,
+            min_samples=settings.REPLICA_MIN_SAMPLES,
+        )
+        pool.add(connection)
+        self.remote_connections[card.name] = pool
+        self._scale_agent_limit(card.name)
+
+        # Store agent capabilities for planning
+        self.available_agents[card.name] = {
+            "description": card.description,
+            "skills": (
+                [
+                    {
+                        "name": skill.name,
+                        "description": skill.description,
+                        "examples": skill.examples,
+                        "tags": skill.tags,
+                    }
+                    for skill in card.skills
+                ]
+                if card.skills
+                else []
+            ),
+        }
+
+        # Cached plans were built against the previous roster
+        if self.plan_cache:
+            self.plan_cache.set_roster(self.available_agents)
+        if self.router:
+            self.router.set_agents(self.available_agents)
+
+    def _scale_agent_limit(self, agent_name: str):
+        """Allow the configured per-agent concurrency on every replica."""
+        per_replica = settings.AGENT_CONCURRENCY_LIMITS.get(
+            agent_name, settings.AGENT_MAX_IN_FLIGHT
+        )
+        replicas = len(self.remote_connections[agent_name])
+        self.concurrency.set_agent_limit(agent_name, per_replica * replicas)
+
     async def _initialize_agent(self):
         """Initialize the orchestrator agent and remote connections."""
-        for address in self.remote_agent_addresses:
-            try:
-                connection = await RemoteAgentConnection.create_from_url(address)
-                card = connection.card
-
-                self.remote_connections[card.name] = connection
-
-                # Store agent capabilities for planning
-                self.available_agents[card.name] = {
-                    "description": card.description,
-                    "skills": (
-                        [
-                            {
-                                "name": skill.name,
-                                "description": skill.description,
-                                "examples": skill.examples,
-                            }
-                            for skill in card.skills
-                        ]
-                        if card.skills
-                        else []
-                    ),
-                }
-                logger.info(f"Connected to agent: {card.name} at {address}")
-            except Exception as e:
-                logger.error(f"Failed to connect to {address}: {e}")
+        # Resolve every remote agent concurrently so a downed agent only costs
+        # its own timeout instead of delaying the others
+        connections = await asyncio.gather(
+            *[
+                self._connect_remote_agent(address)
+                for address in self.remote_agent_addresses
+            ],
+            return_exceptions=True,
+        )
+
+        for address, connection in zip(self.remote_agent_addresses, connections):
+            if isinstance(connection, BaseException):
+                logger.error("Failed to connect to %s: %r", address, connection)
+                continue
+
+            self._register_agent(connection)
+            logger.info("Connected to agent: %s at %s", connection.card.name, address)
 
         self.agent = create_react_agent(
             model=self.llm,
             tools=self.get_tools(),
             prompt=self.get_prompt(),
-            debug=True,
+            debug=debug_enabled(),
             checkpointer=self.memory,
+            pre_model_hook=self.get_pre_model_hook(),
             response_format=self.get_response_format(),
         )
 
-    async def invoke_agent(self, input_text: str, session_id: str):
-        try:
-            # Agent initialization is now handled by _ensure_initialized
-            logger.info("Available agents:", self.available_agents)
+    async def invoke_agent(
+        self, input_text: str, session_id: str, on_task: Optional[TaskCallback] = None
+    ):
+        """Plan a query. `on_task` receives each task as soon as it is generated."""
+        with get_tracer().span("orchestrator.plan") as span:
+            try:
+                # Agent initialization is now handled by _ensure_initialized
+                logger.info("Available agents: %s", self.available_agents)
 
-            messages = {"messages": [("user", input_text)]}
-            config = {"configurable": {"thread_id": session_id}}
+                messages = {"messages": [("user", input_text)]}
+                config = self.run_config(session_id)
 
-            await self.agent.ainvoke(input=messages, config=config, debug=True)
+                if on_task is None:
+                    await self.agent.ainvoke(
+                        input=messages, config=config, debug=debug_enabled()
+                    )
+                else:
+                    await self._stream_plan(messages, config, on_task)
 
-            result = self.agent.get_state(config).values.get("structured_response")
-            return self._process_response(result)
+                result = self.agent.get_state(config).values.get("structured_response")
+                return self._process_response(result)
 
-        except Exception as e:
-            logger.info(f"Error running agent: {str(e)}")
-            return f"Error running query: {str(e)}"
+            except Exception as e:
+                span.record_error(e)
+                logger.info("Error running agent: %s", e)
+                return f"Error running query: {str(e)}"
+
+    async def _stream_plan(
+        self, messages: Dict[str, Any], config: Dict[str, Any], on_task: TaskCallback
+    ):
+        """Run the planner, parsing tasks out of its structured output as it streams."""
+        parser = PlanStreamParser()
+        async for event in self.agent.astream_events(
+            messages, config=config, version="v2"
+        ):
+            if (
+                event["event"] != "on_chat_model_stream"
+                or event.get("metadata", {}).get("langgraph_node")
+                != STRUCTURED_RESPONSE_NODE
+            ):
+                continue
+            chunk = event["data"]["chunk"]
+            # JSON mode streams content; function calling streams tool call args
+            text = chunk.content if isinstance(chunk.content, str) else ""
+            for tool_call_chunk in getattr(chunk, "tool_call_chunks", None) or []:
+                text += tool_call_chunk.get("args") or ""
+            for entry in parser.feed(text):
+                on_task(entry)
 
     def _process_response(self, response) -> Dict[str, Any]:
         """Process the orchestrator's response and normalize status."""
@@ -110,93 +291,167 @@ class OrchestratorAgent(BaseAgent):
 
         return {"status": "error", "error": "Unable to create execution plan"}
 
-    def _build_execution_graph(self, tasks: List[Task]) -> Dict[int, List[int]]:
-        """Build a dependency graph for tasks."""
-        graph = {}
-        for task in tasks:
-            graph[task.order] = task.dependencies.copy()
-        return graph
-
-    def _find_ready_tasks(
-        self, graph: Dict[int, List[int]], completed: Set[int]
-    ) -> List[int]:
-        """Find tasks that are ready to execute (all dependencies completed)."""
-        ready = []
-        for task_id, deps in graph.items():
-            if task_id not in completed and all(dep in completed for dep in deps):
-                ready.append(task_id)
-        return ready
-
-    async def execute_plan(self, plan: ExecutionPlan) -> Dict[str, Any]:
-        """Execute the plan with parallel execution support."""
-        results = {}
-        completed_tasks = set()
+    async def _run_task(
+        self,
+        task: Task,
+        results: Dict[int, Any],
+        progress_callback: Optional[ProgressCallback] = None,
+        deadline: Optional[float] = None,
+        height: int = 1,
+        speculation: Optional[PlanSpeculation] = None,
+    ) -> None:
+        """Execute a single task and record its outcome in the shared results.
+
+        The task gets an equal share of the time left until `deadline` with the
+        `height - 1` tasks that still have to run after it on its longest path.
+        """
+        if progress_callback:
+            progress_callback(f"Task {task.order} ({task.agent_name}) started")
+
+        loop = asyncio.get_running_loop()
+        task_deadline = None
+        if deadline is not None:
+            task_deadline = loop.time() + (deadline - loop.time()) / height
+        counters = {"retries": 0, "hedges": 0}
+        started = time.perf_counter()
 
-        # Build task lookup
-        task_lookup = {task.order: task for task in plan.tasks}
+        try:
+            result = await self._execute_single_task(
+                task, results, progress_callback, task_deadline, counters, speculation
+            )
+        except CircuitOpenError as e:
+            # Fails fast without touching the agent; report why so the caller
+            # can tell an unavailable agent from a failed task
+            logger.warning("Task %s skipped: %s", task.order, e)
+            results[task.order] = {
+                "status": "error",
+                "agent": task.agent_name,
+                "task": task.task_description,
+                "result": str(e),
+                **e.to_dict(),
+                **counters,
+            }
+        except Exception as e:
+            logger.error("Task %s failed with exception: %s", task.order, e)
+            results[task.order] = {
+                "status": "error",
+                "agent": task.agent_name,
+                "task": task.task_description,
+                "result": str(e),
+                **counters,
+            }
+        else:
+            logger.info("Task %s completed successfully", task.order)
+            results[task.order] = {
+                "status": "success",
+                "agent": task.agent_name,
+                "task": task.task_description,
+                "result": result,
+                **counters,
+            }
 
-        # Build dependency graph
-        dependency_graph = self._build_execution_graph(plan.tasks)
+        results[task.order]["duration"] = time.perf_counter() - started
+
+        if progress_callback:
+            result = results[task.order]["result"]
+            progress_callback(f"Task {task.order} ({task.agent_name}): {result}")
+
+    async def execute_plan(
+        self,
+        plan: ExecutionPlan,
+        progress_callback: Optional[ProgressCallback] = None,
+        deadline: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Execute the plan, starting each task as soon as its dependencies finish.
+
+        If given, `progress_callback` receives a line of text whenever a task
+        starts, reports progress from its remote agent, or finishes. `deadline`
+        is an event loop time by which the whole plan must finish; it defaults
+        to `REQUEST_BUDGET` seconds from now.
+        """
+        if deadline is None:
+            deadline = asyncio.get_running_loop().time() + settings.REQUEST_BUDGET
+        scheduler = DataflowScheduler(plan.tasks)
+
+        logger.info("Executing plan with %s tasks", len(plan.tasks))
+        if logger.isEnabledFor(logging.DEBUG):
+            dependency_graph = {task.order: task.dependencies for task in plan.tasks}
+            logger.debug("Dependency graph: %s", dependency_graph)
+
+        validation_error = scheduler.validate()
+        if validation_error:
+            logger.error(validation_error)
+            return {
+                "status": "error",
+                "error": "Circular dependency or unresolvable dependencies detected",
+                "results": {},
+            }
 
-        logger.info(f"Executing plan with {len(plan.tasks)} tasks")
-        logger.info(f"Dependency graph: {dependency_graph}")
+        results = await self._run_scheduler(scheduler, progress_callback, deadline)
+        return self._plan_outcome(plan.summary, results)
 
-        while len(completed_tasks) < len(plan.tasks):
-            # Find tasks ready to execute
-            ready_tasks = self._find_ready_tasks(dependency_graph, completed_tasks)
+    async def _run_scheduler(
+        self,
+        scheduler: DataflowScheduler,
+        progress_callback: Optional[ProgressCallback],
+        deadline: float,
+    ) -> Dict[int, Any]:
+        """Run the scheduler's tasks and return their results in plan order.
 
-            if not ready_tasks:
-                # Check for circular dependencies or other issues
-                remaining_tasks = set(task_lookup.keys()) - completed_tasks
-                logger.error(
-                    f"No ready tasks found, but {len(remaining_tasks)} tasks remaining: {remaining_tasks}"
+        A scheduler that is still open may receive tasks while this runs.
+        """
+        results = {}
+        # An open plan is still growing, so heights are taken as tasks start
+        heights = scheduler.heights() if scheduler.closed else None
+        speculation = None
+        if settings.SPECULATIVE_EXECUTION:
+            speculation = PlanSpeculation(
+                self.speculation_stats,
+                scheduler.tasks,
+                scheduler.dependents,
+                deadline,
+            )
+        try:
+            await scheduler.run(
+                lambda task: self._run_task(
+                    task,
+                    results,
+                    progress_callback,
+                    deadline,
+                    (heights or scheduler.heights())[task.order],
+                    speculation,
                 )
-                return {
-                    "status": "error",
-                    "error": "Circular dependency or unresolvable dependencies detected",
-                    "results": results,
-                }
-
-            logger.info(
-                f"Executing {len(ready_tasks)} tasks in parallel: {ready_tasks}"
             )
-
-            # Execute ready tasks in parallel
-            task_coroutines = []
-            for task_id in ready_tasks:
-                task = task_lookup[task_id]
-                coroutine = self._execute_single_task(task, results)
-                task_coroutines.append((task_id, coroutine))
-
-            # Wait for all parallel tasks to complete
-            task_results = await asyncio.gather(
-                *[coro for _, coro in task_coroutines], return_exceptions=True
+        except asyncio.CancelledError:
+            logger.info(
+                "Plan cancelled: %s running task(s) cancelled, %s never started",
+                len(scheduler.started - scheduler.finished),
+                len(scheduler.tasks) - len(scheduler.started),
             )
+            raise
+        finally:
+            if speculation:
+                await speculation.aclose()
+
+        # Only a plan that arrived incrementally can leave tasks behind
+        for order in scheduler.blocked():
+            task = scheduler.tasks[order]
+            results[order] = {
+                "status": "error",
+                "agent": task.agent_name,
+                "task": task.task_description,
+                "result": "Blocked by a circular or unresolvable dependency",
+            }
 
-            # Process results
-            for (task_id, _), result in zip(task_coroutines, task_results):
-                task = task_lookup[task_id]
-
-                if isinstance(result, Exception):
-                    logger.error(f"Task {task_id} failed with exception: {result}")
-                    results[task_id] = {
-                        "status": "error",
-                        "agent": task.agent_name,
-                        "task": task.task_description,
-                        "result": str(result),
-                    }
-                else:
-                    logger.info(f"Task {task_id} completed successfully")
-                    results[task_id] = {
-                        "status": "success",
-                        "agent": task.agent_name,
-                        "task": task.task_description,
-                        "result": result,
-                    }
-
-                completed_tasks.add(task_id)
+        # Tasks finish in completion order; report them in plan order
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Concurrency stats: %s", self.concurrency.get_stats())
+        return dict(sorted(results.items()))
 
-            logger.info(f"Completed tasks so far: {completed_tasks}")
+    def _plan_outcome(self, summary: str, results: Dict[int, Any]) -> Dict[str, Any]:
+        """Overall status of an executed plan, with its results and counters."""
+        retries = sum(result.get("retries", 0) for result in results.values())
+        hedges = sum(result.get("hedges", 0) for result in results.values())
 
         # Check if all tasks completed successfully
         failed_tasks = [
@@ -206,15 +461,136 @@ class OrchestratorAgent(BaseAgent):
         ]
 
         if failed_tasks:
-            logger.warning(f"Some tasks failed: {failed_tasks}")
+            logger.warning("Some tasks failed: %s", failed_tasks)
             return {
                 "status": "partial_success",
-                "summary": f"{plan.summary} (with {len(failed_tasks)} failed tasks)",
+                "summary": f"{summary} (with {len(failed_tasks)} failed tasks)",
                 "results": results,
                 "failed_tasks": failed_tasks,
+                "retries": retries,
+                "hedges": hedges,
             }
 
-        return {"status": "completed", "summary": plan.summary, "results": results}
+        return {
+            "status": "completed",
+            "summary": summary,
+            "results": results,
+            "retries": retries,
+            "hedges": hedges,
+        }
+
+    def get_plan_cache_stats(self) -> Dict[str, Any]:
+        """Return plan cache hit and miss statistics."""
+        return self.plan_cache.get_stats() if self.plan_cache else {}
+
+    def get_result_cache_stats(self) -> Dict[str, Any]:
+        """Return remote result cache hit ratio, size and eviction statistics."""
+        return self.result_cache.get_stats() if self.result_cache else {}
+
+    def get_batch_stats(self) -> Dict[str, Any]:
+        """Return how many batches and queries were processed and de-duplicated."""
+        return dict(self.batch_stats)
+
+    def get_router_stats(self) -> Dict[str, Any]:
+        """Return how many queries skipped planning and how often that was right."""
+        return self.router.get_stats() if self.router else {}
+
+    def get_speculation_stats(self) -> Dict[str, Any]:
+        """Return how many speculative task starts were used or wasted."""
+        return self.speculation_stats.get_stats()
+
+    def get_concurrency_stats(self) -> Dict[str, Any]:
+        """Return per-agent and global queue depth and wait time statistics."""
+        return self.concurrency.get_stats()
+
+    def get_unavailable_agents(self) -> List[str]:
+        """Agents whose every replica currently has an open circuit breaker."""
+        return [
+            name
+            for name, pool in self.remote_connections.items()
+            if not pool.is_available()
+        ]
+
+    def get_breaker_stats(self) -> Dict[str, Any]:
+        """Return circuit breaker state for every replica of every agent."""
+        return {
+            name: {
+                replica.url: replica.connection.breaker.get_stats()
+                for replica in pool.replicas
+            }
+            for name, pool in self.remote_connections.items()
+        }
+
+    def get_replica_stats(self) -> Dict[str, Any]:
+        """Return per-replica load and health for every agent."""
+        return {
+            name: pool.get_stats() for name, pool in self.remote_connections.items()
+        }
+
+    def collect_metrics(self) -> List[Metric]:
+        """Cache, concurrency and per-downstream health metrics."""
+        metrics = super().collect_metrics()
+        metrics += stats_metrics(
+            "orchestrator_plan_cache",
+            "Orchestrator plan cache",
+            self.get_plan_cache_stats(),
+            counters=("hits", "template_hits", "misses", "evictions", "invalidations"),
+        )
+        metrics += stats_metrics(
+            "orchestrator_result_cache",
+            "Remote task result cache",
+            self.get_result_cache_stats(),
+            counters=("hits", "coalesced", "misses", "evictions"),
+        )
+        metrics += stats_metrics(
+            "orchestrator_speculation",
+            "Speculatively started dependent tasks",
+            self.get_speculation_stats(),
+            counters=("started", "hits", "misses", "abandoned", "wasted_seconds"),
+        )
+        metrics += stats_metrics(
+            "orchestrator_router",
+            "Skill router",
+            self.get_router_stats(),
+            counters=("routed", "planned", "shadow_checks", "shadow_agreements"),
+        )
+        metrics += stats_metrics(
+            "orchestrator_batch",
+            "Batch queries",
+            self.get_batch_stats(),
+            counters=("batches", "queries", "duplicates"),
+        )
+
+        concurrency = self.get_concurrency_stats()
+        limiters = {"global": concurrency["global"], **concurrency["agents"]}
+        for agent, stats in limiters.items():
+            metrics += stats_metrics(
+                "orchestrator_concurrency",
+                "Orchestrator concurrency limiter",
+                {key: stats[key] for key in ("limit", "in_flight", "queue_depth")},
+                labels={"agent": agent},
+            )
+
+        breaker_states = {CLOSED: 0, HALF_OPEN: 1}
+        for agent, pool in self.get_replica_stats().items():
+            for replica in pool["replicas"]:
+                stats = {
+                    key: replica[key]
+                    for key in ("outstanding", "requests", "errors", "ejections")
+                }
+                stats["ejected"] = int(replica["ejected"])
+                stats["circuit_state"] = breaker_states.get(
+                    replica["circuit"]["state"], 2
+                )
+                metrics += stats_metrics(
+                    "orchestrator_replica",
+                    "Downstream agent replica (circuit_state: 0 closed, 1 half open, "
+                    "2 open)",
+                    stats,
+                    counters=("requests", "errors", "ejections"),
+                    labels={"agent": agent, "url": replica["url"]},
+                )
+        return merge_metrics(metrics)
 
     def _normalize_agent_name(self, name: str) -> str:
         """Normalize agent name by removing spaces and converting to lowercase."""
@@ -230,36 +606,378 @@ class OrchestratorAgent(BaseAgent):
         return None
 
     async def _execute_single_task(
-        self, task: Task, previous_results: Dict[int, Any]
+        self,
+        task: Task,
+        previous_results: Dict[int, Any],
+        progress_callback: Optional[ProgressCallback] = None,
+        deadline: Optional[float] = None,
+        counters: Optional[Dict[str, int]] = None,
+        speculation: Optional[PlanSpeculation] = None,
     ) -> str:
         """Execute a single task."""
+        with get_tracer().span(
+            "orchestrator.task", order=task.order, agent=task.agent_name
+        ) as span:
+            return await self._execute_traced_task(
+                task,
+                previous_results,
+                progress_callback,
+                deadline,
+                counters,
+                span,
+                speculation,
+            )
+
+    def _resolve_agent(self, task: Task) -> Tuple[str, ReplicaPool]:
+        """Return the name and replica pool of the agent a task is assigned to."""
+        if task.agent_name not in self.remote_connections:
+            raise Exception(f"Agent {task.agent_name} not available")
+
+        actual_agent_name = self._find_agent_by_name(task.agent_name)
+
+        if not actual_agent_name:
+            available_agents = list(self.remote_connections.keys())
+            raise Exception(
+                f"Agent '{task.agent_name}' not found. Available agents: {available_agents}"
+            )
+
+        return actual_agent_name, self.remote_connections[actual_agent_name]
+
+    async def _execute_traced_task(
+        self,
+        task: Task,
+        previous_results: Dict[int, Any],
+        progress_callback: Optional[ProgressCallback],
+        deadline: Optional[float],
+        counters: Optional[Dict[str, int]],
+        span: Span,
+        speculation: Optional[PlanSpeculation] = None,
+    ) -> str:
         try:
-            if task.agent_name not in self.remote_connections:
-                raise Exception(f"Agent {task.agent_name} not available")
+            actual_agent_name, pool = self._resolve_agent(task)
+
+            with get_tracer().span("orchestrator.process_task_input"):
+                processed_input = self._process_task_input(task, previous_results)
+            if counters is None:
+                counters = {"retries": 0, "hedges": 0}
+
+            speculative = None
+            if speculation:
+                self._speculate_dependents(
+                    task,
+                    actual_agent_name,
+                    processed_input,
+                    previous_results,
+                    speculation,
+                )
+                if task.order in speculation:
+                    speculative = speculation.claim(task.order, processed_input)
+                    counters["speculation"] = "hit" if speculative else "miss"
 
-            actual_agent_name = self._find_agent_by_name(task.agent_name)
+            if speculative:
+                result, speculative_counters = await speculative
+                counters.update(speculative_counters)
+            else:
+                result = await self._call_agent(
+                    task,
+                    actual_agent_name,
+                    pool,
+                    processed_input,
+                    progress_callback,
+                    deadline,
+                    counters,
+                    span,
+                )
+            span.set_attributes(**counters)
+            logger.info("Task %s result: %s", task.order, result)
 
-            if not actual_agent_name:
-                available_agents = list(self.remote_connections.keys())
-                raise Exception(
-                    f"Agent '{task.agent_name}' not found. Available agents: {available_agents}"
+            return result
+
+        except Exception as e:
+            logger.error("Error executing task %s: %s", task.order, e)
+            raise
+
+    async def _call_agent(
+        self,
+        task: Task,
+        agent_name: str,
+        pool: ReplicaPool,
+        processed_input: str,
+        progress_callback: Optional[ProgressCallback],
+        deadline: Optional[float],
+        counters: Dict[str, int],
+        span: Span,
+    ) -> str:
+        """Call a task's agent through the result cache and a concurrency slot."""
+
+        async def call_agent() -> str:
+            async with self.concurrency.slot(agent_name) as waited:
+                span.set_attribute("queue_wait", waited)
+                logger.info(
+                    "Executing task %s on %s after waiting %.3fs: %s",
+                    task.order,
+                    agent_name,
+                    waited,
+                    processed_input,
                 )
+                on_progress = None
+                if progress_callback:
 
-            connection = self.remote_connections[actual_agent_name]
+                    def on_progress(text: str):
+                        progress_callback(
+                            f"Task {task.order} ({agent_name}) progress: {text}"
+                        )
 
-            processed_input = self._process_task_input(task, previous_results)
+                return await self._call_with_retries(
+                    pool, processed_input, on_progress, deadline, counters
+                )
 
-            logger.info(
-                f"Executing task {task.order} on {actual_agent_name}: {processed_input}"
+        if self.result_cache:
+            # Cache hits and calls coalesced onto an identical in-flight call
+            # never take a concurrency slot
+            result, counters["cache"] = await self.result_cache.get_or_call(
+                agent_name, processed_input, call_agent, deadline
             )
-            result = await self._call_remote_agent(connection, processed_input)
-            logger.info(f"Task {task.order} result: {result}")
-
             return result
+        return await call_agent()
+
+    def _predict_result(self, agent_name: str, processed_input: str) -> Optional[str]:
+        """The result a task will return, if it can be known before calling the agent.
+
+        Either the result cache already holds it, or the agent is one whose
+        answer the math fast path can compute locally. Prediction is only an
+        optimization, so any error in it means there is no prediction.
+        """
+        try:
+            if self.result_cache and self.result_cache.ttl_for(agent_name) > 0:
+                cached = self.result_cache.peek(agent_name, processed_input)
+                if cached is not None:
+                    return cached
+
+            if (
+                settings.MATH_FAST_PATH_ENABLED
+                and agent_name in settings.SPECULATION_FAST_PATH_AGENTS
+            ):
+                # Imported lazily: the math agent package also loads its server
+                from a2a_server.agents.math_agent_server.fast_path import (
+                    format_solution,
+                    solve,
+                )
 
+                solution = solve(processed_input)
+                if solution is not None:
+                    return format_solution(*solution)
         except Exception as e:
-            logger.error(f"Error executing task {task.order}: {e}")
-            raise
+            logger.warning("Could not predict the result of %s: %s", agent_name, e)
+        return None
+
+    def _speculate_dependents(
+        self,
+        task: Task,
+        agent_name: str,
+        processed_input: str,
+        previous_results: Dict[int, Any],
+        speculation: PlanSpeculation,
+    ):
+        """Start the tasks that depend on `task` early if its result is predictable.
+
+        Only dependents whose other dependencies have already succeeded are
+        started; their input is built from the predicted result.
+        """
+        dependents = speculation.dependents_of(task.order)
+        if not dependents:
+            return
+        predicted = self._predict_result(agent_name, processed_input)
+        if predicted is None:
+            return
+
+        predicted_results = {
+            **previous_results,
+            task.order: {"status": "success", "result": predicted},
+        }
+        for dependent in dependents:
+            if dependent.order in speculation or any(
+                predicted_results.get(dep, {}).get("status") != "success"
+                for dep in dependent.dependencies
+            ):
+                continue
+            try:
+                dependent_agent, dependent_pool = self._resolve_agent(dependent)
+                predicted_input = self._process_task_input(dependent, predicted_results)
+            except Exception:
+                continue
+            logger.info(
+                "Speculatively starting task %s on predicted result of task %s",
+                dependent.order,
+                task.order,
+            )
+
+            async def speculate(
+                dependent=dependent,
+                dependent_agent=dependent_agent,
+                dependent_pool=dependent_pool,
+                predicted_input=predicted_input,
+            ) -> Tuple[str, Dict[str, Any]]:
+                counters = {"retries": 0, "hedges": 0}
+                with get_tracer().span(
+                    "orchestrator.speculative_task",
+                    order=dependent.order,
+                    agent=dependent.agent_name,
+                ) as span:
+                    result = await self._call_agent(
+                        dependent,
+                        dependent_agent,
+                        dependent_pool,
+                        predicted_input,
+                        None,
+                        speculation.deadline,
+                        counters,
+                        span,
+                    )
+                return result, counters
+
+            speculation.start(dependent.order, predicted_input, speculate)
+
+    async def _call_with_retries(
+        self,
+        pool: ReplicaPool,
+        task_text: str,
+        on_progress: Optional[ProgressCallback],
+        deadline: Optional[float],
+        counters: Dict[str, int],
+    ) -> str:
+        """Call the agent, retrying transport failures until the deadline."""
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        while True:
+            if deadline is not None and deadline <= loop.time():
+                raise TimeoutError("Task deadline exceeded before the call was made")
+
+            try:
+                # The deadline is enforced by the calls themselves so that a
+                # timeout counts against the replica's circuit breaker
+                return await self._call_hedged(
+                    pool, task_text, on_progress, counters, deadline
+                )
+            except Exception as e:
+                # A timeout with budget left is the transport's own total
+                # timeout, which is worth retrying; allow for timers firing a
+                # clock tick early
+                timed_out = isinstance(e, asyncio.TimeoutError)
+                if timed_out and deadline is not None and deadline - loop.time() < 0.01:
+                    raise TimeoutError(
+                        f"No response from {pool.name} before the task deadline"
+                    )
+                if attempt >= self.retry_policy.max_retries or not (
+                    timed_out or is_retryable(e)
+                ):
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+                if deadline is not None and loop.time() + delay >= deadline:
+                    raise
+
+                attempt += 1
+                counters["retries"] += 1
+                logger.warning(
+                    "Retrying call to %s in %.2fs (retry %s/%s): %r",
+                    pool.name,
+                    delay,
+                    attempt,
+                    self.retry_policy.max_retries,
+                    e,
+                )
+                await asyncio.sleep(delay)
+
+    def _hedge_delay(self, pool: ReplicaPool) -> Optional[float]:
+        """How long to wait before hedging a call, or None to not hedge."""
+        if not settings.HEDGING_ENABLED or len(pool) < 2:
+            return None
+        quantile = pool.latency_quantile(settings.HEDGE_QUANTILE)
+        if quantile is None:
+            return None
+        return max(quantile, settings.HEDGE_MIN_DELAY)
+
+    async def _call_replica(
+        self,
+        pool: ReplicaPool,
+        replica: Replica,
+        task_text: str,
+        on_progress: Optional[ProgressCallback],
+        deadline: Optional[float] = None,
+    ) -> str:
+        timeout = None
+        if deadline is not None:
+            timeout = deadline - asyncio.get_running_loop().time()
+        async with pool.lease(replica) as leased:
+            return await self._call_remote_agent(
+                leased.connection, task_text, on_progress, timeout
+            )
+
+    async def _call_hedged(
+        self,
+        pool: ReplicaPool,
+        task_text: str,
+        on_progress: Optional[ProgressCallback],
+        counters: Dict[str, int],
+        deadline: Optional[float] = None,
+    ) -> str:
+        """Call one replica; if it is slower than usual, race a second replica."""
+        primary = pool.select()
+        hedge_delay = self._hedge_delay(pool)
+        if hedge_delay is None:
+            return await self._call_replica(
+                pool, primary, task_text, on_progress, deadline
+            )
+
+        calls = [
+            asyncio.create_task(
+                self._call_replica(pool, primary, task_text, on_progress, deadline)
+            )
+        ]
+        try:
+            done, _ = await asyncio.wait(calls, timeout=hedge_delay)
+            if not done:
+                secondary = pool.select(exclude=[primary])
+                if secondary is not None:
+                    counters["hedges"] += 1
+                    logger.info(
+                        "Hedging call to %s on %s after %.2fs",
+                        pool.name,
+                        secondary.url,
+                        hedge_delay,
+                    )
+                    calls.append(
+                        asyncio.create_task(
+                            self._call_hedge(pool, secondary, task_text, deadline)
+                        )
+                    )
+
+            # First successful answer wins; fail only if every call failed
+            pending = set(calls)
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for call in done:
+                    if call.exception() is None:
+                        return call.result()
+                if not pending:
+                    return next(iter(done)).result()
+        finally:
+            for call in calls:
+                call.cancel()
+
+    async def _call_hedge(
+        self,
+        pool: ReplicaPool,
+        replica: Replica,
+        task_text: str,
+        deadline: Optional[float] = None,
+    ) -> str:
+        """The duplicate call of a hedge, in its own per-agent concurrency slot."""
+        async with self.concurrency.slot(pool.name):
+            # Progress from the duplicate call would only repeat itself
+            return await self._call_replica(pool, replica, task_text, None, deadline)
 
     def _process_task_input(self, task: Task, previous_results: Dict[int, Any]) -> str:
         """Process task input, potentially incorporating results from dependencies."""
@@ -283,6 +1001,23 @@ class OrchestratorAgent(BaseAgent):
 
         return processed_input
 
+    def _text_from_parts(self, parts) -> Optional[str]:
+        """Return the text of the first text part, if any."""
+        for part in parts or []:
+            if hasattr(part, "root") and hasattr(part.root, "text"):
+                return part.root.text.strip()
+        return None
+
+    def _text_from_task(self, task: A2ATask) -> Optional[str]:
+        """Return a task's final text: its last artifact, else its status message."""
+        for artifact in reversed(task.artifacts or []):
+            text = self._text_from_parts(artifact.parts)
+            if text is not None:
+                return text
+        if task.status and task.status.message:
+            return self._text_from_parts(task.status.message.parts)
+        return None
+
     def _extract_text_from_response(self, response) -> str:
         """Extract clean text from a message response object."""
         try:
@@ -294,11 +1029,17 @@ class OrchestratorAgent(BaseAgent):
                 # This might be the message directly
                 message = response
 
+            # Agents that report through tasks return their text as artifacts
+            if isinstance(message, A2ATask):
+                text = self._text_from_task(message)
+                if text is not None:
+                    return text
+
             # Extract text from message parts
             if hasattr(message, "parts") and message.parts:
-                for part in message.parts:
-                    if hasattr(part, "root") and hasattr(part.root, "text"):
-                        return part.root.text.strip()
+                text = self._text_from_parts(message.parts)
+                if text is not None:
+                    return text
 
             # Fallback: try to get text content directly
             if hasattr(message, "text"):
@@ -308,33 +1049,452 @@ class OrchestratorAgent(BaseAgent):
             return str(message)
 
         except Exception as e:
-            logger.warning(f"Error extracting text from response: {e}")
+            logger.warning("Error extracting text from response: %s", e)
             return str(response)
 
     async def _call_remote_agent(
-        self, connection: RemoteAgentConnection, task_text: str
+        self,
+        connection: RemoteAgentConnection,
+        task_text: str,
+        on_progress: Optional[ProgressCallback] = None,
+        timeout: Optional[float] = None,
     ) -> str:
         """Call a remote agent and get the response."""
+        if not connection.supports_streaming:
+            response = await connection.send_message(task_text, timeout)
+
+            # Extract clean text from response instead of raw object
+            return self._extract_text_from_response(response)
+
+        final_text = None
+        async for response in connection.send_message_streaming(task_text, timeout):
+            if hasattr(response.root, "error"):
+                raise Exception(f"Remote agent error: {response.root.error.message}")
+
+            event = response.root.result
+            if isinstance(event, TaskArtifactUpdateEvent):
+                text = self._text_from_parts(event.artifact.parts)
+                if text is not None:
+                    final_text = (
+                        f"{final_text}{text}" if event.append and final_text else text
+                    )
+            elif isinstance(event, TaskStatusUpdateEvent):
+                text = (
+                    self._text_from_parts(event.status.message.parts)
+                    if event.status.message
+                    else None
+                )
+                if event.status.state == TaskState.failed:
+                    raise Exception(f"Remote task failed: {text}")
+                if text and on_progress and not event.final:
+                    on_progress(text)
+            elif isinstance(event, A2ATask):
+                final_text = self._text_from_task(event) or final_text
+            elif isinstance(event, Message):
+                final_text = self._text_from_parts(event.parts)
+
+        return final_text if final_text is not None else ""
+
+    async def stream_agent(self, input_text: str, session_id: str):
+        """Stream per-task progress while the query is planned and executed."""
+        events: asyncio.Queue = asyncio.Queue()
+
+        def report_progress(text: str):
+            events.put_nowait(
+                {"is_task_complete": False, "kind": "progress", "content": text}
+            )
 
-        response = await connection.send_message(task_text)
+        async def run_query():
+            try:
+                return await self.process_query(input_text, session_id, report_progress)
+            finally:
+                events.put_nowait(None)
 
-        # Extract clean text from response instead of raw object
-        return self._extract_text_from_response(response)
+        query_task = asyncio.create_task(run_query())
+        try:
+            while (event := await events.get()) is not None:
+                yield event
+            yield {"is_task_complete": True, "content": await query_task}
+        finally:
+            if not query_task.done():
+                query_task.cancel()
+                # Let the plan release its concurrency slots and cancel its
+                # downstream tasks before reporting the cancellation
+                await asyncio.gather(query_task, return_exceptions=True)
+
+    async def stream_batch(self, queries: List[str], session_id: str):
+        """Process independent queries together, yielding each result as it finishes.
+
+        Identical queries are processed once. Every query shares the plan cache,
+        the skill router, the result cache (which coalesces identical sub-tasks
+        across queries) and the global concurrency limits, and at most
+        `BATCH_MAX_CONCURRENCY` queries are in progress at a time.
+        """
+        # Normalized query -> positions in the batch
+        positions: Dict[str, List[int]] = {}
+        for index, query in enumerate(queries):
+            positions.setdefault(normalize_input(query), []).append(index)
+        self.batch_stats["batches"] += 1
+        self.batch_stats["queries"] += len(queries)
+        self.batch_stats["duplicates"] += len(queries) - len(positions)
+        logger.info(
+            "Processing batch of %s queries (%s unique)", len(queries), len(positions)
+        )
 
-    async def process_query(self, query: str, session_id: str) -> Dict[str, Any]:
-        """Process a query through planning and execution."""
+        semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+        # Separate threads keep the queries' planner memory apart, from each
+        # other and from any earlier batch sent on the same session
+        batch_id = uuid.uuid4().hex
+        thread_ids = [
+            f"{session_id}-batch-{batch_id}-{number}"
+            for number in range(len(positions))
+        ]
+
+        async def run_query(number: int, key: str) -> Tuple[str, Dict[str, Any]]:
+            query = queries[positions[key][0]]
+            async with semaphore:
+                try:
+                    result = await self.process_query(query, thread_ids[number])
+                except Exception as e:
+                    logger.error("Batch query failed: %s: %s", query, e)
+                    result = {"status": "error", "error": str(e)}
+            return key, result
+
+        pending = [
+            asyncio.create_task(run_query(number, key))
+            for number, key in enumerate(positions)
+        ]
+        failed: List[int] = []
+        try:
+            for next_result in asyncio.as_completed(pending):
+                key, result = await next_result
+                completed = (
+                    isinstance(result, dict) and result.get("status") == "completed"
+                )
+                for index in positions[key]:
+                    if not completed:
+                        failed.append(index)
+                    yield {
+                        "is_task_complete": False,
+                        "kind": "artifact",
+                        "name": f"result-{index}",
+                        "content": result,
+                        "metadata": {"query_index": index, "query": queries[index]},
+                    }
+        finally:
+            for query_task in pending:
+                query_task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await asyncio.gather(*(self._drop_thread(tid) for tid in thread_ids))
+
+        summary = (
+            f"{len(queries)} queries ({len(positions)} unique): "
+            f"{len(queries) - len(failed)} completed, {len(failed)} failed"
+        )
+        yield {
+            "is_task_complete": True,
+            "content": {
+                "status": "completed" if not failed else "partial_success",
+                "summary": summary,
+                "results": {},
+                "failed_queries": sorted(failed),
+            },
+        }
+
+    def _plan_targets(self, plan_response: Dict[str, Any], agents: List[str]) -> bool:
+        """Whether a plan response has a task for any of the given agents."""
+        if not agents or not isinstance(plan_response.get("plan"), dict):
+            return False
+        targets = {
+            self._normalize_agent_name(task.get("agent_name", ""))
+            for task in plan_response["plan"].get("tasks", [])
+        }
+        return any(self._normalize_agent_name(agent) in targets for agent in agents)
+
+    def _route_query(
+        self, query: str, unavailable: List[str], span: Span
+    ) -> Optional[Dict[str, Any]]:
+        """A one-task plan for a query the skill router is confident about.
+
+        A sample of routed queries is also planned in the background to check
+        that the planner would have picked the same single agent.
+        """
+        decision = self.router.route(query, tuple(unavailable))
+        span.set_attributes(
+            routed=decision.routed, route_confidence=decision.confidence
+        )
+        if not decision.routed:
+            return None
+
+        logger.info(
+            "Routed query to %s with confidence %.2f: %s",
+            decision.agent_name,
+            decision.confidence,
+            query,
+        )
+        if random.random() < settings.SKILL_ROUTER_SHADOW_RATE:
+            shadow = asyncio.create_task(
+                self._shadow_check(query, decision.agent_name)
+            )
+            self._shadow_checks.add(shadow)
+            shadow.add_done_callback(self._shadow_checks.discard)
+
+        return {
+            "status": "ready",
+            "plan": {
+                "tasks": [
+                    {
+                        "agent_name": decision.agent_name,
+                        "task_description": "Answer the query",
+                        "task_input": query,
+                        "order": 1,
+                        "dependencies": [],
+                    }
+                ],
+                "summary": f"Answer the query with {decision.agent_name}",
+            },
+        }
+
+    def _has_history(self, session_id: str) -> bool:
+        """Whether the planner already holds earlier turns of this session."""
+        if self.memory is None:
+            return False
+        state = self.agent.get_state({"configurable": {"thread_id": session_id}})
+        return bool(state.values.get("messages"))
+
+    async def _drop_thread(self, thread_id: str):
+        """Delete a planner thread that is not needed after its query."""
+        if self.memory is None:
+            return
+        try:
+            await self.memory.adelete_thread(thread_id)
+        except Exception as e:
+            logger.warning("Could not delete planner thread %s: %s", thread_id, e)
+
+    async def _record_turn(
+        self, session_id: str, query: str, plan_response: Dict[str, Any]
+    ):
+        """Add a turn that was planned without the planner to its session memory.
+
+        Follow-ups planned by the LLM then see the query and the plan it got.
+        """
+        if self.memory is None:
+            return
+        try:
+            await self.agent.aupdate_state(
+                {"configurable": {"thread_id": session_id}},
+                {
+                    "messages": [
+                        HumanMessage(content=query),
+                        AIMessage(content=json.dumps(plan_response["plan"])),
+                    ]
+                },
+                as_node=STRUCTURED_RESPONSE_NODE,
+            )
+        except Exception as e:
+            logger.warning("Could not record turn for session %s: %s", session_id, e)
 
-        plan_response = await self.invoke_agent(query, session_id)
-        logger.info(f"Plan response: {plan_response}")
+    async def _shadow_check(self, query: str, agent_name: str):
+        """Plan a routed query and record whether the planner agrees."""
+        # A throwaway session keeps the check out of the user's conversation
+        plan_response = await self.invoke_agent(
+            query, f"router-shadow-{uuid.uuid4().hex}"
+        )
+        if not (
+            isinstance(plan_response, dict)
+            and plan_response.get("status") == "ready"
+            and plan_response.get("plan")
+        ):
+            return
+
+        planned = {
+            self._normalize_agent_name(task.get("agent_name", ""))
+            for task in plan_response["plan"].get("tasks", [])
+        }
+        agreed = planned == {self._normalize_agent_name(agent_name)}
+        self.router.record_shadow(agreed)
+        if not agreed:
+            logger.info(
+                "Skill router sent %r to %s; the planner chose %s",
+                query,
+                agent_name,
+                sorted(planned),
+            )
+
+    async def aclose(self):
+        """Cancel shadow routing checks that are still running."""
+        shadow_checks = list(self._shadow_checks)
+        for shadow in shadow_checks:
+            shadow.cancel()
+        await asyncio.gather(*shadow_checks, return_exceptions=True)
+        await super().aclose()
+
+    async def _plan_incrementally(
+        self,
+        planner_input: str,
+        session_id: str,
+        progress_callback: Optional[ProgressCallback],
+        deadline: float,
+    ) -> Tuple[Any, Optional[asyncio.Task]]:
+        """Plan a query while executing each task as soon as it is generated.
+
+        Returns the plan response and, for a ready plan, the execution task
+        that is still finishing the plan's results.
+        """
+        scheduler = DataflowScheduler([], closed=False)
+        execution = asyncio.create_task(
+            self._run_scheduler(scheduler, progress_callback, deadline)
+        )
+
+        def on_task(entry: Dict[str, Any]):
+            try:
+                task = Task(**entry)
+            except (TypeError, ValueError):
+                # The complete plan is checked once planning ends
+                return
+            if scheduler.add_task(task):
+                logger.info("Task %s planned, handed to the scheduler", task.order)
+
+        try:
+            plan_response = await self.invoke_agent(planner_input, session_id, on_task)
+            ready = (
+                isinstance(plan_response, dict)
+                and plan_response.get("status") == "ready"
+                and plan_response.get("plan")
+            )
+            if ready:
+                # Tasks the stream did not yield, e.g. from a model that does
+                # not stream its structured output
+                for task in ExecutionPlan(**plan_response["plan"]).tasks:
+                    scheduler.add_task(task)
+        except BaseException:
+            execution.cancel()
+            await asyncio.gather(execution, return_exceptions=True)
+            raise
+        scheduler.close()
+
+        if not ready:
+            if scheduler.started:
+                logger.warning(
+                    "Planning ended with status %s after %s task(s) started; "
+                    "cancelling them",
+                    plan_response.get("status")
+                    if isinstance(plan_response, dict)
+                    else "error",
+                    len(scheduler.started),
+                )
+            execution.cancel()
+            await asyncio.gather(execution, return_exceptions=True)
+            return plan_response, None
+        return plan_response, execution
+
+    async def process_query(
+        self,
+        query: str,
+        session_id: str,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """Process a query through planning and execution."""
+        with get_tracer().span(
+            "orchestrator.process_query", session_id=session_id, query=query
+        ) as span:
+            return await self._process_query(query, session_id, progress_callback, span)
+
+    async def _process_query(
+        self,
+        query: str,
+        session_id: str,
+        progress_callback: Optional[ProgressCallback],
+        span: Span,
+    ) -> Dict[str, Any]:
+        deadline = asyncio.get_running_loop().time() + settings.REQUEST_BUDGET
+        planning_started = time.perf_counter()
+        unavailable = self.get_unavailable_agents()
+        # A follow-up may refer to earlier turns only the planner can see, so
+        # it is neither served from nor stored in the plan cache, nor routed
+        has_history = self._has_history(session_id)
+
+        plan_response = None
+        if self.plan_cache and not has_history:
+            plan_response = self.plan_cache.get(query)
+        if plan_response is not None and self._plan_targets(plan_response, unavailable):
+            # Replan around the agents that are down instead of failing fast
+            logger.info("Skipping cached plan that targets %s", unavailable)
+            plan_response = None
+
+        # Execution already under way while an incremental plan was generated
+        execution: Optional[asyncio.Task] = None
+        routed_plan = None
+        if plan_response is None and self.router and not has_history:
+            routed_plan = self._route_query(query, unavailable, span)
+
+        plan_cache_hit = plan_response is not None
+        span.set_attribute("plan_cache_hit", plan_cache_hit)
+        if plan_cache_hit:
+            logger.info("Plan cache hit for query: %s", query)
+            await self._record_turn(session_id, query, plan_response)
+        elif routed_plan is not None:
+            plan_response = routed_plan
+            await self._record_turn(session_id, query, plan_response)
+        else:
+            planner_input = query
+            if unavailable:
+                planner_input = (
+                    f"{query}\n\n(Currently unavailable agents, do not plan tasks "
+                    f"for them: {', '.join(unavailable)})"
+                )
+            if settings.INCREMENTAL_PLANNING:
+                plan_response, execution = await self._plan_incrementally(
+                    planner_input, session_id, progress_callback, deadline
+                )
+            else:
+                plan_response = await self.invoke_agent(planner_input, session_id)
+            # A plan shaped around an outage should not outlive it
+            if (
+                self.plan_cache
+                and not unavailable
+                and not has_history
+                and isinstance(plan_response, dict)
+                and plan_response.get("status") == "ready"
+                and plan_response.get("plan")
+            ):
+                self.plan_cache.put(query, plan_response)
+        logger.info("Plan response: %s", plan_response)
+        timings = {
+            "planning": time.perf_counter() - planning_started,
+            "plan_cache_hit": plan_cache_hit,
+        }
+        if isinstance(plan_response, dict):
+            span.set_attribute("plan_status", plan_response.get("status"))
 
         if isinstance(plan_response, dict):
             if plan_response.get("status") == "ready" and plan_response.get("plan"):
-                execution_result = await self.execute_plan(
-                    ExecutionPlan(**plan_response["plan"])
-                )
-                logger.info(f"Execution result: {execution_result}")
+                execution_started = time.perf_counter()
+                if execution is None:
+                    execution_result = await self.execute_plan(
+                        ExecutionPlan(**plan_response["plan"]),
+                        progress_callback,
+                        deadline,
+                    )
+                else:
+                    execution_result = self._plan_outcome(
+                        plan_response["plan"].get("summary", ""), await execution
+                    )
+                timings["execution"] = time.perf_counter() - execution_started
+                task_results = execution_result.get("results", {})
+                timings["tasks"] = [
+                    {
+                        "order": order,
+                        "agent": task_result.get("agent"),
+                        "duration": task_result.get("duration", 0.0),
+                        "cache": task_result.get("cache"),
+                    }
+                    for order, task_result in task_results.items()
+                ]
+                execution_result["timings"] = timings
+                logger.info("Execution result: %s", execution_result)
                 return execution_result
             else:
-                return plan_response
+                return {**plan_response, "timings": timings}
 
         return {"status": "error", "error": "Unexpected response format"}
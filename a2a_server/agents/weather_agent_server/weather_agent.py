@@ -1,10 +1,12 @@
 from a2a_server.common.base_agent import BaseAgent
+from a2a_server.common.metrics import merge_metrics, stats_metrics
 from a2a_server.common.models import WeatherResponseFormat
 from a2a_server.common.prompts import WEATHER_AGENT_PROMPT
-from langchain_mcp_adapters.client import MultiServerMCPClient
+from a2a_server.mcp.session_pool import MCPToolPool
 from langgraph.prebuilt import create_react_agent
 import json
-from logger import logger
+from logger import debug_enabled, logger
+from settings import settings
 
 
 class WeatherAgent(BaseAgent):
@@ -12,6 +14,7 @@ class WeatherAgent(BaseAgent):
 
     def __init__(self):
         super().__init__(model_name="gpt-4o", temperature=0.0)
+        self.mcp_pool = None
 
     def get_tools(self):
         """Return weather tools."""
@@ -32,42 +35,73 @@ class WeatherAgent(BaseAgent):
             # Load MCP configuration
             with open("a2a_server/mcp/servers.json", "r") as f:
                 mcp_config = json.load(f)
-            logger.info(f"MCP Config: {mcp_config}")
-            # Connect to MCP server and get tools
-            client = MultiServerMCPClient(mcp_config)
+            logger.info("MCP Config: %s", mcp_config)
+            # Keep long-lived sessions to each MCP server instead of spawning
+            # a new stdio subprocess per session
+            self.mcp_pool = MCPToolPool(
+                mcp_config,
+                pool_size=settings.MCP_POOL_SIZE,
+                health_check_interval=settings.MCP_HEALTH_CHECK_INTERVAL,
+            )
             logger.info("Connecting to MCP server via STDIO...")
-            client_tools = await client.get_tools()
+            client_tools = await self.mcp_pool.start()
             tools = client_tools + self.get_tools()
-            logger.info(f"Client tools: {client_tools}")
+            logger.info("Client tools: %s", client_tools)
 
             # Create the agent with MCP tools
             self.agent = create_react_agent(
                 model=self.llm,
                 tools=tools,
                 prompt=self.get_prompt(),
-                debug=True,
+                debug=debug_enabled(),
                 checkpointer=self.memory,
+                pre_model_hook=self.get_pre_model_hook(),
                 response_format=self.get_response_format(),
             )
             logger.info("WeatherAgent initialized with MCP tools")
         except Exception as e:
-            logger.info(f"Error getting agent: {str(e)}")
+            logger.info("Error getting agent: %s", e)
             return f"Error running query: {str(e)}"
 
     async def invoke_agent(self, input_text: str, session_id: str):
         try:
             messages = {"messages": [("user", input_text)]}
-            config = {"configurable": {"thread_id": session_id}}
+            config = self.run_config(session_id)
 
-            await self.agent.ainvoke(input=messages, config=config, debug=True)
+            await self.agent.ainvoke(
+                input=messages, config=config, debug=debug_enabled()
+            )
 
             result = self.agent.get_state(config).values.get("structured_response")
             return self._process_response(result)
 
         except Exception as e:
-            logger.info(f"Error running agent: {str(e)}")
+            logger.info("Error running agent: %s", e)
             return f"Error running query: {str(e)}"
 
+    async def aclose(self):
+        """Shut down the pooled MCP sessions."""
+        if self.mcp_pool is not None:
+            await self.mcp_pool.close()
+
+    def get_mcp_stats(self):
+        """Return per-server MCP session pool statistics."""
+        if self.mcp_pool is None:
+            return {}
+        return self.mcp_pool.get_stats()
+
+    def collect_metrics(self):
+        metrics = super().collect_metrics()
+        for server, stats in self.get_mcp_stats().items():
+            metrics += stats_metrics(
+                "mcp_session_pool",
+                "MCP session pool",
+                stats,
+                counters=("restarts",),
+                labels={"server": server},
+            )
+        return merge_metrics(metrics)
+
     def _process_response(self, response):
         """Process the weather agent's response."""
         if isinstance(response, WeatherResponseFormat):
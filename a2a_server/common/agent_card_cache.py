@@ -0,0 +1,84 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+from a2a.types import AgentCard
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+from logger import logger
+
+
+class AgentCardCache:
+    """On-disk cache of resolved agent cards with a TTL.
+
+    A cached card younger than the TTL is returned without touching the network;
+    an older one is fetched again.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = 300.0):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+
+    def _entry_path(self, agent_url: str) -> Path:
+        digest = hashlib.sha1(agent_url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def _load_entry(self, agent_url: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_path(agent_url)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable agent card cache entry %s: %s", path, e)
+            return None
+
+    def _store_entry(self, agent_url: str, entry: Dict[str, Any]):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(agent_url)
+        # A temp file of its own per writer: concurrent resolves (or workers)
+        # each replace the entry atomically
+        tmp_file = tempfile.NamedTemporaryFile(
+            "w", dir=self.cache_dir, suffix=".tmp", delete=False
+        )
+        try:
+            with tmp_file:
+                json.dump(entry, tmp_file)
+            os.replace(tmp_file.name, path)
+        except BaseException:
+            # Never leave a half-written temp file behind in the cache directory
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_file.name)
+            raise
+
+    async def _save_entry(self, agent_url: str, entry: Dict[str, Any]):
+        """Store an entry off the event loop; the cache is only an optimization."""
+        try:
+            await asyncio.to_thread(self._store_entry, agent_url, entry)
+        except OSError as e:
+            logger.warning("Could not cache agent card for %s: %s", agent_url, e)
+
+    async def get_card(self, client: httpx.AsyncClient, agent_url: str) -> AgentCard:
+        """Return the agent card for the URL, fetching it if not freshly cached."""
+        entry = await asyncio.to_thread(self._load_entry, agent_url)
+        now = time.time()
+
+        if entry and now - entry.get("fetched_at", 0) < self.ttl:
+            return AgentCard.model_validate(entry["card"])
+
+        card_url = agent_url.rstrip("/") + AGENT_CARD_WELL_KNOWN_PATH
+        response = await client.get(card_url)
+        response.raise_for_status()
+        card_data = response.json()
+        card = AgentCard.model_validate(card_data)
+        await self._save_entry(
+            agent_url, {"url": agent_url, "fetched_at": now, "card": card_data}
+        )
+        return card
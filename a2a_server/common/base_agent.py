@@ -1,9 +1,23 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, AsyncIterator, Dict, List, Union
 from langchain_openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.checkpoint.memory import MemorySaver
+from logger import logger
 from settings import settings
+from .checkpointers import create_checkpointer, get_memory_stats, make_history_trimmer
+from .stub_llm import STUB_PREFIX, create_stub_model
+from .metrics import Metric, MetricsCallbackHandler, stats_metrics
+from .tracing import get_tracer
+
+
+# Replies agents send in place of an answer ("Error running query: ...",
+# "Unable to process math request", ...); they must never be cached or reused
+FAILURE_REPLY_PREFIXES = ("Error running query", "Unable to process")
+
+
+def is_failure_reply(text: str) -> bool:
+    """Whether an agent's reply reports a failure instead of an answer."""
+    return text.startswith(FAILURE_REPLY_PREFIXES)
 
 
 class BaseAgent(ABC):
@@ -13,8 +27,16 @@ class BaseAgent(ABC):
         self,
         model_name: str = "gpt-4o",
         temperature: float = 0.0,
-        use_memory: bool = True,
+        use_memory: Union[bool, str] = True,
     ):
+        """Create the LLM and checkpointer.
+
+        `use_memory` may be False (no memory), True (the backend selected by
+        `CHECKPOINTER_BACKEND`) or the name of a checkpointer backend
+        ("memory", "bounded" or "sqlite").
+        """
+        # Run every agent on one model, e.g. for benchmarks
+        model_name = settings.LLM_MODEL_OVERRIDE or model_name
 
         if model_name.startswith("gemini"):
             self.llm = ChatGoogleGenerativeAI(
@@ -31,8 +53,22 @@ class BaseAgent(ABC):
                 temperature=temperature,
                 max_retries=10,
             )
+        elif model_name.startswith(STUB_PREFIX):
+            self.llm = create_stub_model(
+                model_name,
+                latency=settings.STUB_LLM_LATENCY,
+                distribution=settings.STUB_LLM_LATENCY_DISTRIBUTION,
+                spread=settings.STUB_LLM_LATENCY_SPREAD,
+                seed=settings.STUB_LLM_SEED,
+            )
 
-        self.memory = MemorySaver() if use_memory else None
+        if use_memory:
+            backend = (
+                use_memory if isinstance(use_memory, str) else settings.CHECKPOINTER_BACKEND
+            )
+            self.memory = create_checkpointer(backend, name=type(self).__name__.lower())
+        else:
+            self.memory = None
         self.agent = None
         self._initialized = False
 
@@ -47,6 +83,36 @@ class BaseAgent(ABC):
             await self._initialize_agent()
             self._initialized = True
 
+    async def aclose(self):
+        """Release resources held by the agent (tool sessions etc.)."""
+        pass
+
+    def get_pre_model_hook(self):
+        """Return the hook that bounds stored conversation history, if enabled."""
+        if self.memory is None or settings.MEMORY_MAX_MESSAGES <= 0:
+            return None
+        return make_history_trimmer(settings.MEMORY_MAX_MESSAGES)
+
+    def run_config(self, session_id: str) -> Dict[str, Any]:
+        """LangGraph run config for a session; traces and times LLM and tool calls."""
+        callbacks = get_tracer().callbacks()
+        if settings.METRICS_ENABLED:
+            callbacks.append(MetricsCallbackHandler())
+        return {"configurable": {"thread_id": session_id}, "callbacks": callbacks}
+
+    def collect_metrics(self) -> List[Metric]:
+        """Metrics built from the agent's stats when /metrics is scraped."""
+        return stats_metrics(
+            "agent_checkpointer",
+            "Conversation state held by the checkpointer",
+            self.get_memory_stats(),
+            counters=("evicted_threads", "trimmed_checkpoints", "commits"),
+        )
+
+    def get_memory_stats(self):
+        """Return the checkpointer's memory usage statistics."""
+        return get_memory_stats(self.memory)
+
     @abstractmethod
     def get_tools(self):
         """Return the list of tools for this agent."""
@@ -67,6 +133,68 @@ class BaseAgent(ABC):
         """Invoke the agent with the given input."""
         pass
 
+    async def stream_agent(
+        self, input_text: str, session_id: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream LangGraph step and token events, then the processed response.
+
+        Every event is a dict with `is_task_complete` and `content`. Intermediate
+        events also carry a `kind` of "step" or "token".
+        """
+        messages = {"messages": [("user", input_text)]}
+        config = self.run_config(session_id)
+
+        try:
+            async for mode, chunk in self.agent.astream(
+                messages, config=config, stream_mode=["updates", "messages"]
+            ):
+                if mode == "messages":
+                    message, metadata = chunk
+                    # Only the ReAct model node produces user-facing text
+                    if (
+                        metadata.get("langgraph_node") == "agent"
+                        and isinstance(message.content, str)
+                        and message.content
+                    ):
+                        yield {
+                            "is_task_complete": False,
+                            "kind": "token",
+                            "content": message.content,
+                        }
+                    continue
+
+                for node, update in chunk.items():
+                    step = self._describe_step(node, update)
+                    if step:
+                        yield {
+                            "is_task_complete": False,
+                            "kind": "step",
+                            "content": step,
+                        }
+
+            result = self.agent.get_state(config).values.get("structured_response")
+            yield {"is_task_complete": True, "content": self._process_response(result)}
+
+        except Exception as e:
+            logger.info("Error streaming agent: %s", e)
+            yield {
+                "is_task_complete": True,
+                "content": f"Error running query: {str(e)}",
+            }
+
+    def _describe_step(self, node: str, update: Any) -> str:
+        """Describe a completed graph step for progress updates."""
+        if not isinstance(update, dict):
+            return ""
+        for message in update.get("messages", []):
+            tool_calls = getattr(message, "tool_calls", None)
+            if tool_calls:
+                names = ", ".join(call["name"] for call in tool_calls)
+                return f"Calling tools: {names}"
+            if getattr(message, "type", None) == "tool":
+                return f"Tool {message.name} finished"
+        return ""
+
     @abstractmethod
     def _process_response(self, response: Any) -> Any:
         """Process the agent's response."""
@@ -1,11 +1,23 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Dict, List
 from a2a.server.agent_execution import AgentExecutor
 from a2a.server.agent_execution.context import RequestContext
 from a2a.server.events.event_queue import EventQueue
-from a2a.utils import new_agent_text_message
-from a2a.types import InternalError, UnsupportedOperationError
+from a2a.server.tasks import TaskUpdater
+from a2a.utils import new_agent_text_message, new_task
+from a2a.types import (
+    InternalError,
+    Part,
+    TaskNotCancelableError,
+    TaskState,
+    TextPart,
+)
 from a2a.utils.errors import ServerError
 from abc import abstractmethod
 from logger import logger
+from .metrics import EXECUTIONS_IN_FLIGHT, Metric
+from .tracing import extract, get_tracer
 
 
 class BaseAgentExecutor(AgentExecutor):
@@ -13,6 +25,9 @@ class BaseAgentExecutor(AgentExecutor):
 
     def __init__(self):
         self._agent_initialized = False
+        self._init_lock = asyncio.Lock()
+        # Running executions by A2A task id, so that they can be cancelled
+        self._running: Dict[str, asyncio.Task] = {}
 
     @abstractmethod
     def get_agent(self):
@@ -21,35 +36,137 @@ class BaseAgentExecutor(AgentExecutor):
 
     async def _ensure_agent_ready(self):
         """Ensure the agent is ready for execution."""
+        if self._agent_initialized:
+            return
+
+        # Concurrent first requests (or a warm-up racing a request) initialize once
+        async with self._init_lock:
+            if not self._agent_initialized:
+                agent = self.get_agent()
+                await agent._ensure_initialized()
+                self._agent_initialized = True
+
+    async def warm_up(self):
+        """Initialize the agent ahead of the first request."""
+        logger.info("Warming up %s", type(self).__name__)
+        await self._ensure_agent_ready()
+
+    async def aclose(self):
+        """Release the agent's resources if it was initialized."""
+        if self._agent_initialized:
+            await self.get_agent().aclose()
+
+    def collect_metrics(self) -> List[Metric]:
+        """Scrape-time metrics from the agent, once it is initialized."""
         if not self._agent_initialized:
-            agent = self.get_agent()
-            await agent._ensure_initialized()
-            self._agent_initialized = True
+            return []
+        return self.get_agent().collect_metrics()
 
-    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
-        """Execute the agent with the given context."""
-        try:
-            # Ensure agent is ready
-            await self._ensure_agent_ready()
+    def format_result(self, result) -> str:
+        """Convert the agent's final result into the text sent to the client."""
+        # Convert result to string if necessary
+        if isinstance(result, dict):
+            return str(result)
+        return result
 
-            user_input = context.get_user_input()
-            session_id = context.context_id or "default"
+    def agent_events(
+        self, context: RequestContext, user_input: str, session_id: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """The agent's event stream for a request.
 
-            logger.info(f"USER INPUT: {user_input}")
+        Events are dicts with `is_task_complete` and `content`. Intermediate
+        events with a `kind` of "artifact" are sent as a result artifact of
+        their own, named by `name` and carrying `metadata`.
+        """
+        return self.get_agent().stream_agent(user_input, session_id)
 
-            agent = self.get_agent()
-            result = await agent.invoke_agent(user_input, session_id)
+    def result_metadata(self, result) -> dict:
+        """Metadata attached to the result artifact, e.g. per-phase timings."""
+        if isinstance(result, dict) and "timings" in result:
+            return {"timings": dict(result["timings"])}
+        return {}
 
-            # Convert result to string if necessary
-            if isinstance(result, dict):
-                result = str(result)
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        """Execute the agent, streaming progress as task status updates."""
+        message = context.message
+        with get_tracer().span(
+            "agent.execute",
+            parent=extract(message.metadata if message else None),
+            agent=type(self.get_agent()).__name__,
+        ) as span:
+            EXECUTIONS_IN_FLIGHT.inc()
+            task = None
+            try:
+                # Ensure agent is ready
+                await self._ensure_agent_ready()
 
-            await event_queue.enqueue_event(new_agent_text_message(result))
+                user_input = context.get_user_input()
+                session_id = context.context_id or "default"
 
-        except Exception as e:
-            logger.error(f"An error occurred while streaming the response: {e}")
-            raise ServerError(error=InternalError()) from e
+                logger.info("USER INPUT: %s", user_input)
+
+                task = context.current_task
+                if not task:
+                    task = new_task(context.message)
+                    await event_queue.enqueue_event(task)
+                updater = TaskUpdater(event_queue, task.id, task.context_id)
+                span.set_attributes(task_id=task.id, input_chars=len(user_input))
+                self._running[task.id] = asyncio.current_task()
+
+                async for event in self.agent_events(context, user_input, session_id):
+                    if event["is_task_complete"]:
+                        metadata = self.result_metadata(event["content"])
+                        started = time.perf_counter()
+                        result = self.format_result(event["content"])
+                        timings = metadata.setdefault("timings", {})
+                        timings["formatting"] = time.perf_counter() - started
+                        if span.sampled:
+                            metadata["trace_id"] = span.trace_id
+                        await updater.add_artifact(
+                            [Part(root=TextPart(text=result))],
+                            name="result",
+                            metadata=metadata,
+                        )
+                        await updater.complete()
+                    elif event.get("kind") == "artifact":
+                        metadata = self.result_metadata(event["content"])
+                        metadata.update(event.get("metadata") or {})
+                        text = self.format_result(event["content"])
+                        await updater.add_artifact(
+                            [Part(root=TextPart(text=text))],
+                            name=event.get("name", "result"),
+                            metadata=metadata,
+                        )
+                    else:
+                        await updater.update_status(
+                            TaskState.working,
+                            new_agent_text_message(
+                                event["content"], task.context_id, task.id
+                            ),
+                        )
+
+            except asyncio.CancelledError:
+                logger.info("Execution of task %s cancelled", context.task_id)
+                raise
+            except Exception as e:
+                logger.error("An error occurred while streaming the response: %s", e)
+                raise ServerError(error=InternalError()) from e
+            finally:
+                EXECUTIONS_IN_FLIGHT.dec()
+                if task is not None:
+                    self._running.pop(task.id, None)
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
-        """Cancel operation - not supported by default."""
-        raise ServerError(error=UnsupportedOperationError())
+        """Cancel a running task and report it as canceled.
+
+        Cancelling the execution aborts the agent's LangGraph run. The
+        orchestrator also cancels its plan and the tasks it started on
+        downstream agents.
+        """
+        running = self._running.pop(context.task_id, None)
+        if running is None or running.done():
+            raise ServerError(error=TaskNotCancelableError())
+
+        running.cancel()
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        await updater.cancel()
@@ -1,10 +1,50 @@
+import socket
 import uvicorn
+from contextlib import asynccontextmanager
 from a2a.server.tasks import InMemoryTaskStore
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.apps import A2AStarletteApplication
+from starlette.requests import Request
+from starlette.responses import Response
 from .agent_card_loader import AgentCardLoader
+from .http_transport import close_shared_transport
+from .metrics import CONTENT_TYPE, registry, track_request
+from .tracing import get_tracer
 from abc import ABC, abstractmethod
+from typing import List, Optional
 from logger import logger
+from settings import settings
+
+
+class InstrumentedRequestHandler(DefaultRequestHandler):
+    """Request handler that counts and times every A2A method it serves."""
+
+    async def on_message_send(self, *args, **kwargs):
+        with track_request("message/send"):
+            return await super().on_message_send(*args, **kwargs)
+
+    async def on_message_send_stream(self, *args, **kwargs):
+        with track_request("message/stream"):
+            async for event in super().on_message_send_stream(*args, **kwargs):
+                yield event
+
+    async def on_get_task(self, *args, **kwargs):
+        with track_request("tasks/get"):
+            return await super().on_get_task(*args, **kwargs)
+
+    async def on_cancel_task(self, *args, **kwargs):
+        with track_request("tasks/cancel"):
+            return await super().on_cancel_task(*args, **kwargs)
+
+    async def on_resubscribe_to_task(self, *args, **kwargs):
+        with track_request("tasks/resubscribe"):
+            async for event in super().on_resubscribe_to_task(*args, **kwargs):
+                yield event
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Serve every registered metric in Prometheus text format."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
 
 
 class BaseAgentServer(ABC):
@@ -13,6 +53,7 @@ class BaseAgentServer(ABC):
     def __init__(self, host: str = "localhost", port: int = 10000):
         self.host = host
         self.port = port
+        self.executor = None
 
     @abstractmethod
     def get_card_name(self) -> str:
@@ -24,32 +65,71 @@ class BaseAgentServer(ABC):
         """Return the executor instance for this agent."""
         pass
 
-    def run(self):
-        """Run the agent server."""
+    @asynccontextmanager
+    async def lifespan(self, app):
+        """Application lifespan: optional eager warm-up, connection cleanup on shutdown."""
+        if settings.EAGER_AGENT_WARMUP and self.executor:
+            try:
+                await self.executor.warm_up()
+            except Exception as e:
+                # Fall back to lazy initialization on the first request
+                logger.error("Agent warm-up failed: %s", e)
         try:
-            # Load the agent card from JSON
-            card_name = self.get_card_name()
-            agent_card = AgentCardLoader.load_card(card_name)
+            yield
+        finally:
+            if self.executor:
+                await self.executor.aclose()
+            await close_shared_transport()
+            get_tracer().close()
 
-            # Update the URL with the actual host and port
-            agent_card.url = f"http://{self.host}:{self.port}/"
+    def build_app(self):
+        """Build the ASGI application serving this agent."""
+        # Load the agent card from JSON
+        card_name = self.get_card_name()
+        agent_card = AgentCardLoader.load_card(card_name)
 
-            # Create the executor
-            executor = self.get_executor()
+        # Update the URL with the actual host and port
+        agent_card.url = f"http://{self.host}:{self.port}/"
 
-            # Create the request handler
-            request_handler = DefaultRequestHandler(
-                agent_executor=executor, task_store=InMemoryTaskStore
-            )
+        # Create the executor
+        self.executor = self.get_executor()
 
-            # Create and run the server
-            server = A2AStarletteApplication(
-                http_handler=request_handler, agent_card=agent_card
-            )
+        # Create the request handler
+        handler_class = (
+            InstrumentedRequestHandler
+            if settings.METRICS_ENABLED
+            else DefaultRequestHandler
+        )
+        request_handler = handler_class(
+            agent_executor=self.executor, task_store=InMemoryTaskStore()
+        )
+
+        server = A2AStarletteApplication(
+            http_handler=request_handler, agent_card=agent_card
+        )
+        app = server.build(lifespan=self.lifespan)
+        if settings.METRICS_ENABLED:
+            registry.add_collector(self.executor.collect_metrics)
+            app.add_route("/metrics", metrics_endpoint, methods=["GET"])
+        return app
 
-            logger.info(f"Starting {card_name} server on {self.host}:{self.port}")
-            uvicorn.run(server.build(), host=self.host, port=self.port)
+    def run(self, sockets: Optional[List[socket.socket]] = None):
+        """Run the agent server, optionally on sockets bound by a supervisor."""
+        try:
+            config = uvicorn.Config(
+                self.build_app(),
+                host=self.host,
+                port=self.port,
+                timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+            )
+            logger.info(
+                "Starting %s server on %s:%s",
+                self.get_card_name(),
+                self.host,
+                self.port,
+            )
+            uvicorn.Server(config).run(sockets=sockets)
 
         except Exception as e:
-            logger.error(f"An error occurred during server startup: {e}")
+            logger.error("An error occurred during server startup: %s", e)
             raise
@@ -0,0 +1,627 @@
+import asyncio
+import atexit
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Set
+
+from langchain_core.messages import RemoveMessage, trim_messages
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+from logger import logger
+from settings import settings
+
+
+class BoundedMemorySaver(MemorySaver):
+    """In-memory checkpointer with bounded threads and history.
+
+    Only the latest `max_checkpoints_per_thread` checkpoints of each thread are
+    kept, together with the channel blobs and pending writes they reference.
+    Threads idle for longer than `thread_ttl` are dropped, and the least
+    recently used threads are evicted beyond `max_threads`.
+    """
+
+    def __init__(
+        self,
+        max_threads: int = 1000,
+        max_checkpoints_per_thread: int = 2,
+        thread_ttl: float = 3600.0,
+    ):
+        super().__init__()
+        self.max_threads = max_threads
+        self.max_checkpoints_per_thread = max(1, max_checkpoints_per_thread)
+        self.thread_ttl = thread_ttl
+        self._thread_access: "OrderedDict[str, float]" = OrderedDict()
+        # Thread id -> keys of its channel blobs, so trimming and deleting a
+        # thread never scan the blobs of every other thread
+        self._thread_blobs: Dict[str, Set[tuple]] = {}
+
+        self.evicted_threads = 0
+        self.trimmed_checkpoints = 0
+
+    def _touch(self, thread_id: str):
+        self._thread_access[thread_id] = time.monotonic()
+        self._thread_access.move_to_end(thread_id)
+
+    def _evict_threads(self):
+        expire_before = time.monotonic() - self.thread_ttl
+        while self._thread_access:
+            thread_id, last_access = next(iter(self._thread_access.items()))
+            if (
+                len(self._thread_access) <= self.max_threads
+                and last_access >= expire_before
+            ):
+                break
+            del self._thread_access[thread_id]
+            self.delete_thread(thread_id)
+            self.evicted_threads += 1
+
+    def _trim_thread(self, thread_id: str):
+        for checkpoint_ns, checkpoints in self.storage[thread_id].items():
+            if len(checkpoints) <= self.max_checkpoints_per_thread:
+                continue
+
+            # Checkpoint ids are time-ordered, so the newest sort last
+            ordered = sorted(checkpoints)
+            stale = ordered[: -self.max_checkpoints_per_thread]
+            for checkpoint_id in stale:
+                del checkpoints[checkpoint_id]
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+            self.trimmed_checkpoints += len(stale)
+
+            # Drop channel blobs no retained checkpoint refers to any more
+            live_versions = set()
+            for saved_checkpoint, _, _ in checkpoints.values():
+                channel_versions = self.serde.loads_typed(saved_checkpoint)[
+                    "channel_versions"
+                ]
+                live_versions.update(channel_versions.items())
+            thread_blobs = self._thread_blobs.get(thread_id, set())
+            for key in [
+                key
+                for key in thread_blobs
+                if key[1] == checkpoint_ns and (key[2], key[3]) not in live_versions
+            ]:
+                thread_blobs.discard(key)
+                self.blobs.pop(key, None)
+
+    def get_tuple(self, config):
+        thread_id = config["configurable"]["thread_id"]
+        if thread_id in self._thread_access:
+            self._touch(thread_id)
+        return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        self._thread_blobs.setdefault(thread_id, set()).update(
+            (thread_id, checkpoint_ns, channel, version)
+            for channel, version in new_versions.items()
+        )
+        self._touch(thread_id)
+        self._trim_thread(thread_id)
+        self._evict_threads()
+        return next_config
+
+    def delete_thread(self, thread_id: str):
+        # Uses the indexes instead of MemorySaver's scan of every write and blob
+        self._thread_access.pop(thread_id, None)
+        for checkpoint_ns, checkpoints in self.storage.pop(thread_id, {}).items():
+            for checkpoint_id in checkpoints:
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        for key in self._thread_blobs.pop(thread_id, ()):
+            self.blobs.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Report how much conversation state is held in memory."""
+        checkpoints = 0
+        approx_bytes = 0
+        for namespaces in self.storage.values():
+            for saved in namespaces.values():
+                checkpoints += len(saved)
+                for saved_checkpoint, saved_metadata, _ in saved.values():
+                    approx_bytes += len(saved_checkpoint[1]) + len(saved_metadata[1])
+        for _, blob in self.blobs.values():
+            approx_bytes += len(blob)
+        for writes in self.writes.values():
+            for write in writes.values():
+                approx_bytes += len(write[2][1])
+
+        return {
+            "threads": len(self.storage),
+            "checkpoints": checkpoints,
+            "blobs": len(self.blobs),
+            "approx_bytes": approx_bytes,
+            "evicted_threads": self.evicted_threads,
+            "trimmed_checkpoints": self.trimmed_checkpoints,
+        }
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS threads_last_access ON threads (last_access);
+"""
+
+# Threads idle past the TTL, and the least recently used beyond the limit
+_STALE_THREADS = """
+SELECT thread_id FROM threads WHERE last_access < ?
+UNION
+SELECT thread_id FROM (
+    SELECT thread_id FROM threads ORDER BY last_access DESC LIMIT -1 OFFSET ?
+)
+"""
+_TRIM_CHECKPOINTS = """
+DELETE FROM checkpoints WHERE (thread_id, checkpoint_ns, checkpoint_id) IN (
+    SELECT thread_id, checkpoint_ns, checkpoint_id FROM (
+        SELECT thread_id, checkpoint_ns, checkpoint_id, ROW_NUMBER() OVER (
+            PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+        ) AS newest
+        FROM checkpoints
+    )
+    WHERE newest > ?
+)
+"""
+_DELETE_ORPHAN_WRITES = """
+DELETE FROM writes WHERE NOT EXISTS (
+    SELECT 1 FROM checkpoints
+    WHERE checkpoints.thread_id = writes.thread_id
+    AND checkpoints.checkpoint_ns = writes.checkpoint_ns
+    AND checkpoints.checkpoint_id = writes.checkpoint_id
+)
+"""
+
+
+class SQLiteCheckpointer(BaseCheckpointSaver):
+    """Durable checkpointer backed by SQLite in WAL mode.
+
+    Each checkpoint is serialized once into a single compact blob. Writes are
+    grouped into one transaction that is committed every `commit_interval`
+    seconds or after `commit_batch_size` statements, so a turn only pays for an
+    uncommitted insert. The database is opened on first use and nothing is
+    replayed at startup; reads go through the primary key, which is indexed by
+    thread_id first. The async methods run the database work in a thread.
+
+    Every `prune_interval` seconds the flusher also drops threads idle for
+    longer than `thread_ttl`, the least recently written threads beyond
+    `max_threads`, and all but the latest `max_checkpoints_per_thread`
+    checkpoints of each thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        commit_interval: float = 0.05,
+        commit_batch_size: int = 64,
+        max_threads: int = 100000,
+        max_checkpoints_per_thread: int = 2,
+        thread_ttl: float = 604800.0,
+        prune_interval: float = 60.0,
+        serde=None,
+    ):
+        super().__init__(serde=serde)
+        self.path = path
+        self.commit_interval = commit_interval
+        self.commit_batch_size = commit_batch_size
+        self.max_threads = max_threads
+        self.max_checkpoints_per_thread = max(1, max_checkpoints_per_thread)
+        self.thread_ttl = thread_ttl
+        self.prune_interval = prune_interval
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._closed = threading.Event()
+        self._pending_statements = 0
+        self.commits = 0
+        self.evicted_threads = 0
+        self.trimmed_checkpoints = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            with self._lock:
+                if self._conn is None:
+                    directory = os.path.dirname(self.path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    conn = sqlite3.connect(
+                        self.path, check_same_thread=False, isolation_level=None
+                    )
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    conn.execute("PRAGMA busy_timeout=5000")
+                    conn.executescript(_SQLITE_SCHEMA)
+                    self._conn = conn
+
+                    threading.Thread(
+                        target=self._flush_loop,
+                        name="sqlite-checkpoint-flusher",
+                        daemon=True,
+                    ).start()
+                    atexit.register(self.close)
+        return self._conn
+
+    def _write(self, statement: str, rows: list) -> sqlite3.Cursor:
+        with self._lock:
+            conn = self._connection()
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            cursor = conn.executemany(statement, rows)
+            self._pending_statements += 1
+            if self._pending_statements >= self.commit_batch_size:
+                self._commit()
+            return cursor
+
+    def _commit(self):
+        if self._conn is not None and self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+            self.commits += 1
+        self._pending_statements = 0
+
+    def _flush_loop(self):
+        next_prune = time.monotonic() + self.prune_interval
+        while not self._closed.wait(self.commit_interval):
+            # A failed commit keeps its transaction, so the next pass retries it
+            try:
+                self.flush()
+                if time.monotonic() >= next_prune:
+                    next_prune = time.monotonic() + self.prune_interval
+                    self.prune()
+            except sqlite3.Error as e:
+                logger.error("SQLite checkpoint flush failed: %s", e)
+
+    def flush(self):
+        """Commit any batched writes."""
+        with self._lock:
+            self._commit()
+
+    def prune(self):
+        """Drop stale threads and old checkpoints, then commit."""
+        with self._lock:
+            conn = self._connection()
+            stale = conn.execute(
+                _STALE_THREADS, (time.time() - self.thread_ttl, self.max_threads)
+            ).fetchall()
+            if stale:
+                self._delete_threads(stale)
+                self.evicted_threads += len(stale)
+            trimmed = self._write(
+                _TRIM_CHECKPOINTS, [(self.max_checkpoints_per_thread,)]
+            ).rowcount
+            if trimmed > 0:
+                self._write(_DELETE_ORPHAN_WRITES, [()])
+                self.trimmed_checkpoints += trimmed
+            self._commit()
+
+    def close(self):
+        """Commit outstanding writes and close the database."""
+        self._closed.set()
+        with self._lock:
+            if self._conn is not None:
+                self._commit()
+                self._conn.close()
+                self._conn = None
+
+    def _load_tuple(self, row, pending_writes) -> CheckpointTuple:
+        (
+            thread_id,
+            checkpoint_ns,
+            checkpoint_id,
+            parent_checkpoint_id,
+            type_,
+            checkpoint,
+            metadata_type,
+            metadata,
+        ) = row
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((type_, checkpoint)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, channel, value_type, value in pending_writes
+            ],
+        )
+
+    def _pending_writes(self, conn, thread_id, checkpoint_ns, checkpoint_id):
+        return conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+
+    def get_tuple(self, config) -> Optional[CheckpointTuple]:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = configurable.get("checkpoint_id")
+
+        with self._lock:
+            conn = self._connection()
+            if checkpoint_id:
+                row = conn.execute(
+                    "SELECT * FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT * FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            pending_writes = self._pending_writes(conn, row[0], row[1], row[2])
+
+        return self._load_tuple(row, pending_writes)
+
+    def list(
+        self, config, *, filter=None, before=None, limit=None
+    ) -> Iterator[CheckpointTuple]:
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+        if before:
+            clauses.append("checkpoint_id < ?")
+            params.append(before["configurable"]["checkpoint_id"])
+
+        query = "SELECT * FROM checkpoints"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY checkpoint_id DESC"
+
+        with self._lock:
+            conn = self._connection()
+            rows = conn.execute(query, params).fetchall()
+
+        yielded = 0
+        for row in rows:
+            if limit is not None and yielded >= limit:
+                break
+            with self._lock:
+                pending_writes = self._pending_writes(conn, row[0], row[1], row[2])
+            checkpoint_tuple = self._load_tuple(row, pending_writes)
+            if filter and not all(
+                checkpoint_tuple.metadata.get(key) == value
+                for key, value in filter.items()
+            ):
+                continue
+            yielded += 1
+            yield checkpoint_tuple
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(metadata)
+
+        self._write(
+            "INSERT OR REPLACE INTO threads VALUES (?, ?)", [(thread_id, time.time())]
+        )
+        self._write(
+            "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    configurable.get("checkpoint_id"),
+                    type_,
+                    serialized_checkpoint,
+                    metadata_type,
+                    serialized_metadata,
+                )
+            ],
+        )
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        configurable = config["configurable"]
+        statement = (
+            "INSERT OR REPLACE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            if all(channel in WRITES_IDX_MAP for channel, _ in writes)
+            else "INSERT OR IGNORE INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+        rows = [
+            (
+                configurable["thread_id"],
+                configurable.get("checkpoint_ns", ""),
+                configurable["checkpoint_id"],
+                task_id,
+                WRITES_IDX_MAP.get(channel, idx),
+                channel,
+                *self.serde.dumps_typed(value),
+                task_path,
+            )
+            for idx, (channel, value) in enumerate(writes)
+        ]
+        self._write(statement, rows)
+
+    def _delete_threads(self, rows: list):
+        for table in ("checkpoints", "writes", "threads"):
+            self._write(f"DELETE FROM {table} WHERE thread_id = ?", rows)
+
+    def delete_thread(self, thread_id: str):
+        self._delete_threads([(thread_id,)])
+
+    async def aget_tuple(self, config) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self, config, *, filter=None, before=None, limit=None
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoint_tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in checkpoint_tuples:
+            yield checkpoint_tuple
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str):
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Report the size of the persisted conversation state."""
+        with self._lock:
+            conn = self._connection()
+            threads, checkpoints = conn.execute(
+                "SELECT COUNT(DISTINCT thread_id), COUNT(*) FROM checkpoints"
+            ).fetchone()
+        return {
+            "threads": threads,
+            "checkpoints": checkpoints,
+            "approx_bytes": sum(
+                os.path.getsize(path)
+                for path in (self.path, f"{self.path}-wal")
+                if os.path.exists(path)
+            ),
+            "commits": self.commits,
+            "evicted_threads": self.evicted_threads,
+            "trimmed_checkpoints": self.trimmed_checkpoints,
+        }
+
+
+def _database_name(name: str) -> str:
+    """One database per process, so workers never contend for a write lock.
+
+    Workers spawned by the server manager add their process name (e.g.
+    "Math Agent worker 0" -> mathagent-math-agent-worker-0.db); a restarted
+    worker takes over its predecessor's database.
+    """
+    if multiprocessing.parent_process() is None:
+        return f"{name}.db"
+    process = multiprocessing.current_process()
+    slug = re.sub(r"[^a-z0-9]+", "-", process.name.lower()).strip("-")
+    return f"{name}-{slug or os.getpid()}.db"
+
+
+def create_checkpointer(backend: str, name: str = "agent") -> BaseCheckpointSaver:
+    """Create the checkpointer selected by name ("memory", "bounded" or "sqlite")."""
+    if backend == "memory":
+        return MemorySaver()
+    if backend == "bounded":
+        return BoundedMemorySaver(
+            max_threads=settings.MEMORY_MAX_THREADS,
+            max_checkpoints_per_thread=settings.MEMORY_MAX_CHECKPOINTS_PER_THREAD,
+            thread_ttl=settings.MEMORY_THREAD_TTL,
+        )
+    if backend == "sqlite":
+        return SQLiteCheckpointer(
+            os.path.join(settings.SQLITE_CHECKPOINT_DIR, _database_name(name)),
+            commit_interval=settings.SQLITE_COMMIT_INTERVAL,
+            commit_batch_size=settings.SQLITE_COMMIT_BATCH_SIZE,
+            max_threads=settings.SQLITE_MAX_THREADS,
+            max_checkpoints_per_thread=settings.MEMORY_MAX_CHECKPOINTS_PER_THREAD,
+            thread_ttl=settings.SQLITE_THREAD_TTL,
+            prune_interval=settings.SQLITE_PRUNE_INTERVAL,
+        )
+    raise ValueError(f"Unknown checkpointer backend: {backend}")
+
+
+def make_history_trimmer(max_messages: int):
+    """Build a pre-model hook that keeps only the latest messages of a thread.
+
+    The trimmed history replaces the stored one, so the checkpointed state stops
+    growing. Trimming starts on a human message to keep tool calls paired with
+    their results.
+    """
+
+    def trim_history(state: Dict[str, Any]) -> Dict[str, Any]:
+        messages = state["messages"]
+        if len(messages) <= max_messages:
+            return {"messages": []}
+
+        trimmed = trim_messages(
+            messages,
+            strategy="last",
+            token_counter=len,
+            max_tokens=max_messages,
+            start_on="human",
+            include_system=True,
+        )
+        if not trimmed:
+            # A single turn is longer than the limit; keep it rather than lose it
+            return {"messages": []}
+        return {"messages": [RemoveMessage(id=REMOVE_ALL_MESSAGES), *trimmed]}
+
+    return trim_history
+
+
+def get_memory_stats(checkpointer: Optional[BaseCheckpointSaver]) -> Dict[str, Any]:
+    """Return checkpointer statistics, if the backend reports any."""
+    if checkpointer is not None and hasattr(checkpointer, "get_stats"):
+        return checkpointer.get_stats()
+    return {}
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+from logger import logger
+
+from .retry import is_retryable
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an agent whose circuit breaker is open."""
+
+    error_type = "circuit_open"
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(
+            f"Agent {name} is unavailable (circuit open, retry in {retry_after:.1f}s)"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "error_type": self.error_type,
+            "agent": self.name,
+            "retry_after": round(self.retry_after, 1),
+        }
+
+
+def is_breaker_failure(error: BaseException) -> bool:
+    """Whether an error says the agent is unhealthy, as opposed to the request."""
+    return is_retryable(error) or isinstance(error, asyncio.TimeoutError)
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for one remote agent.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail immediately with `CircuitOpenError`. Once `recovery_timeout` has passed
+    the circuit is half-open: up to `half_open_max_calls` probe calls go
+    through, and a successful probe closes the circuit while a failed one opens
+    it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if (
+            self._state == OPEN
+            and time.monotonic() - self.opened_at >= self.recovery_timeout
+        ):
+            self._state = HALF_OPEN
+            self.probes_in_flight = 0
+        return self._state
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.recovery_timeout - time.monotonic())
+
+    def allows_request(self) -> bool:
+        """Whether a call made now would be let through."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN:
+            return self.probes_in_flight < self.half_open_max_calls
+        return False
+
+    def _open(self):
+        if self._state != OPEN:
+            self.times_opened += 1
+            logger.warning(
+                "Circuit for %s opened after %s consecutive failures",
+                self.name,
+                self.consecutive_failures,
+            )
+        self._state = OPEN
+        self.opened_at = time.monotonic()
+
+    def record_success(self):
+        if self._state != CLOSED:
+            logger.info("Circuit for %s closed", self.name)
+        self._state = CLOSED
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if (
+            self._state == HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            self._open()
+
+    @asynccontextmanager
+    async def guard(self) -> AsyncIterator[None]:
+        """Fail fast if the circuit is open, otherwise record the call's outcome."""
+        if not self.allows_request():
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self.retry_after())
+
+        probe = self.state == HALF_OPEN
+        if probe:
+            self.probes_in_flight += 1
+        try:
+            yield
+        except Exception as e:
+            if is_breaker_failure(e):
+                self.record_failure()
+            else:
+                # The agent answered; the failure is about this request
+                self.record_success()
+            raise
+        else:
+            self.record_success()
+        finally:
+            if probe:
+                self.probes_in_flight = max(0, self.probes_in_flight - 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_after": self.retry_after() if self._state == OPEN else 0.0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+
+class FairLimiter:
+    """Concurrency limiter that admits waiters strictly in arrival order."""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        self.admitted = 0
+        self.queued = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> float:
+        """Wait for a slot and return the time spent waiting, in seconds."""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return 0.0
+
+        start = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation landed
+                self.release()
+            elif waiter in self._waiters:
+                # Otherwise a release in the same tick already skipped it
+                self._waiters.remove(waiter)
+            raise
+
+        waited = time.monotonic() - start
+        self.admitted += 1
+        self.queued += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def release(self) -> None:
+        """Release a slot, handing it to the oldest waiter if there is one."""
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    def set_limit(self, limit: int) -> None:
+        """Change the limit, admitting queued waiters if it was raised."""
+        self.limit = max(1, limit)
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.in_flight += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the limiter's counters."""
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "avg_wait": self.total_wait / self.queued if self.queued else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+class ConcurrencyLimiter:
+    """Per-agent concurrency limits combined with a global in-flight cap.
+
+    A caller first waits for a slot on its agent's limiter and only then for a
+    global slot, so a backlog on one agent never holds global capacity that
+    calls to other agents could use.
+    """
+
+    def __init__(
+        self,
+        global_limit: int,
+        default_agent_limit: int,
+        agent_limits: Optional[Dict[str, int]] = None,
+    ):
+        self.global_limiter = FairLimiter(global_limit)
+        self.default_agent_limit = default_agent_limit
+        self.agent_limits = dict(agent_limits or {})
+        self.agent_limiters: Dict[str, FairLimiter] = {}
+
+    def _get_limiter(self, agent_name: str) -> FairLimiter:
+        limiter = self.agent_limiters.get(agent_name)
+        if limiter is None:
+            limit = self.agent_limits.get(agent_name, self.default_agent_limit)
+            limiter = FairLimiter(limit)
+            self.agent_limiters[agent_name] = limiter
+        return limiter
+
+    def set_agent_limit(self, agent_name: str, limit: int) -> None:
+        """Override the concurrency limit for a single agent."""
+        self.agent_limits[agent_name] = limit
+        self._get_limiter(agent_name).set_limit(limit)
+
+    @asynccontextmanager
+    async def slot(self, agent_name: str) -> AsyncIterator[float]:
+        """Hold one agent slot and one global slot. Yields the total wait time."""
+        agent_limiter = self._get_limiter(agent_name)
+        waited = await agent_limiter.acquire()
+        try:
+            waited += await self.global_limiter.acquire()
+        except BaseException:
+            agent_limiter.release()
+            raise
+
+        try:
+            yield waited
+        finally:
+            self.global_limiter.release()
+            agent_limiter.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return queue depth and wait statistics, globally and per agent."""
+        return {
+            "global": self.global_limiter.get_stats(),
+            "agents": {
+                name: limiter.get_stats()
+                for name, limiter in self.agent_limiters.items()
+            },
+        }
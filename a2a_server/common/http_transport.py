@@ -0,0 +1,103 @@
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from logger import logger
+from settings import settings
+
+
+class HttpTransport:
+    """Pool of keep-alive HTTP clients shared by every remote agent connection.
+
+    One `httpx.AsyncClient` is kept per origin so that each remote host gets its
+    own connection pool, sized independently of the others.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = 100,
+        max_keepalive_per_host: int = 20,
+        keepalive_expiry: float = 30.0,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 600.0,
+        total_timeout: float = 600.0,
+        http2: bool = False,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_per_host,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=connect_timeout,
+            pool=connect_timeout,
+        )
+        self.total_timeout = total_timeout
+        self.http2 = http2 and self._http2_available()
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    @classmethod
+    def from_settings(cls) -> "HttpTransport":
+        """Create a transport configured from the application settings."""
+        return cls(
+            max_connections_per_host=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_per_host=settings.HTTP_MAX_KEEPALIVE_PER_HOST,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            connect_timeout=settings.HTTP_CONNECT_TIMEOUT,
+            read_timeout=settings.HTTP_READ_TIMEOUT,
+            total_timeout=settings.HTTP_TOTAL_TIMEOUT,
+            http2=settings.HTTP2_ENABLED,
+        )
+
+    @staticmethod
+    def _http2_available() -> bool:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed")
+            return False
+        return True
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def get_client(self, url: str) -> httpx.AsyncClient:
+        """Return the pooled client for the host serving the given URL."""
+        origin = self._origin(url)
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=self.limits, timeout=self.timeout, http2=self.http2
+            )
+            self._clients[origin] = client
+        return client
+
+    async def aclose(self):
+        """Close every pooled client."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+_shared_transport: Optional[HttpTransport] = None
+
+
+def get_shared_transport() -> HttpTransport:
+    """Return the process-wide transport, creating it on first use."""
+    global _shared_transport
+    if _shared_transport is None:
+        _shared_transport = HttpTransport.from_settings()
+    return _shared_transport
+
+
+async def close_shared_transport():
+    """Close the process-wide transport, if it was ever created."""
+    global _shared_transport
+    if _shared_transport is not None:
+        await _shared_transport.aclose()
+        _shared_transport = None
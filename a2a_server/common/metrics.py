@@ -0,0 +1,352 @@
+import asyncio
+import bisect
+import math
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+
+from logger import logger
+
+from .tracing import token_usage
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+Labels = Tuple[str, ...]
+Collector = Callable[[], List["Metric"]]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """A named metric family with a fixed set of label names."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Labels:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> Iterator[Tuple[str, Sequence[str], Sequence[Any], float]]:
+        for key, value in self._values.items():
+            yield self.name, self.labelnames, key, value
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for name, labelnames, values, value in self.samples():
+            lines.append(
+                f"{name}{_format_labels(labelnames, values)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels: Any):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any):
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            # Per-bucket (non-cumulative) counts, then sum and count
+            state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self):
+        bucket_labels = self.labelnames + ("le",)
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                yield (
+                    f"{self.name}_bucket",
+                    bucket_labels,
+                    key + (_format_value(bound),),
+                    cumulative,
+                )
+            yield f"{self.name}_sum", self.labelnames, key, total
+            yield f"{self.name}_count", self.labelnames, key, count
+
+
+class MetricsRegistry:
+    """Holds the process's metrics and renders them in Prometheus text format.
+
+    Instrumented code updates registered metrics directly. Collectors are
+    called at scrape time and return freshly built metrics, which is how the
+    stats that components already keep (caches, pools, breakers) are exposed
+    without touching their hot paths.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Collector] = []
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, *args, **kwargs)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def add_collector(self, collector: Collector):
+        self._collectors.append(collector)
+
+    def remove_collector(self, collector: Collector):
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def collect(self) -> List[Metric]:
+        metrics = list(self._metrics.values())
+        for collector in self._collectors:
+            try:
+                metrics.extend(collector())
+            except Exception as e:
+                logger.warning("Metrics collector failed: %s", e)
+        return metrics
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.collect():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter(
+    "a2a_requests_total",
+    "A2A requests handled, by method and outcome.",
+    ("method", "status"),
+)
+REQUEST_DURATION = registry.histogram(
+    "a2a_request_duration_seconds",
+    "A2A request handling time, by method.",
+    ("method",),
+)
+EXECUTIONS_IN_FLIGHT = registry.gauge(
+    "a2a_executions_in_flight", "Agent executions currently running."
+)
+EXECUTIONS_IN_FLIGHT.set(0)
+LLM_CALL_DURATION = registry.histogram(
+    "llm_call_duration_seconds", "LLM call latency, by model.", ("model",)
+)
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total",
+    "LLM tokens used, by model and kind (input or output).",
+    ("model", "kind"),
+)
+TOOL_CALL_DURATION = registry.histogram(
+    "tool_call_duration_seconds",
+    "Tool call latency, by tool and outcome.",
+    ("tool", "status"),
+)
+REMOTE_CALLS = registry.counter(
+    "a2a_remote_calls_total",
+    "Calls to downstream agents, by agent and outcome.",
+    ("agent", "outcome"),
+)
+REMOTE_CALL_DURATION = registry.histogram(
+    "a2a_remote_call_duration_seconds",
+    "Downstream agent call latency, by agent.",
+    ("agent",),
+)
+
+
+@contextmanager
+def track_request(method: str) -> Iterator[None]:
+    """Count and time one A2A request."""
+    started = time.perf_counter()
+    status = "error"
+    try:
+        yield
+        status = "ok"
+    finally:
+        REQUESTS.inc(method=method, status=status)
+        REQUEST_DURATION.observe(time.perf_counter() - started, method=method)
+
+
+@contextmanager
+def track_remote_call(agent: str) -> Iterator[None]:
+    """Count and time one call to a downstream agent, classified by outcome."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+        raise
+    except Exception as e:
+        outcome = getattr(e, "error_type", "error")
+        raise
+    except BaseException:
+        outcome = "cancelled"
+        raise
+    finally:
+        REMOTE_CALLS.inc(agent=agent, outcome=outcome)
+        REMOTE_CALL_DURATION.observe(time.perf_counter() - started, agent=agent)
+
+
+def stats_metrics(
+    prefix: str,
+    documentation: str,
+    stats: Dict[str, Any],
+    counters: Sequence[str] = (),
+    labels: Optional[Dict[str, Any]] = None,
+) -> List[Metric]:
+    """Expose the numeric entries of a stats dict as `<prefix>_<key>` metrics.
+
+    Keys listed in `counters` are cumulative and exported as counters (with a
+    `_total` suffix); the rest are gauges.
+    """
+    labels = labels or {}
+    metrics: List[Metric] = []
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if key in counters:
+            metric = Counter(f"{prefix}_{key}_total", f"{documentation}: {key}", labels)
+            metric.inc(value, **labels)
+        else:
+            metric = Gauge(f"{prefix}_{key}", f"{documentation}: {key}", labels)
+            metric.set(value, **labels)
+        metrics.append(metric)
+    return metrics
+
+
+def merge_metrics(metrics: List[Metric]) -> List[Metric]:
+    """Merge same-named metrics built per label set into one family each."""
+    merged: Dict[str, Metric] = {}
+    for metric in metrics:
+        existing = merged.get(metric.name)
+        if existing is None:
+            merged[metric.name] = metric
+        else:
+            existing._values.update(metric._values)
+    return list(merged.values())
+
+
+class MetricsCallbackHandler(AsyncCallbackHandler):
+    """Records LLM and tool call latency and token usage for one agent run."""
+
+    def __init__(self):
+        self._started: Dict[UUID, Tuple[float, str]] = {}
+
+    async def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        model = (kwargs.get("metadata") or {}).get("ls_model_name") or "unknown"
+        self._started[run_id] = (time.perf_counter(), model)
+
+    async def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        model = (kwargs.get("metadata") or {}).get("ls_model_name") or "unknown"
+        self._started[run_id] = (time.perf_counter(), model)
+
+    async def on_llm_end(self, response, *, run_id, **kwargs):
+        started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        model = started[1]
+        LLM_CALL_DURATION.observe(time.perf_counter() - started[0], model=model)
+        usage = token_usage(response)
+        if usage:
+            LLM_TOKENS.inc(usage["input_tokens"], model=model, kind="input")
+            LLM_TOKENS.inc(usage["output_tokens"], model=model, kind="output")
+
+    async def on_llm_error(self, error, *, run_id, **kwargs):
+        self._started.pop(run_id, None)
+
+    async def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        tool = (serialized or {}).get("name") or "unknown"
+        self._started[run_id] = (time.perf_counter(), tool)
+
+    async def _end_tool(self, run_id: UUID, status: str):
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            TOOL_CALL_DURATION.observe(
+                time.perf_counter() - started[0], tool=started[1], status=status
+            )
+
+    async def on_tool_end(self, output, *, run_id, **kwargs):
+        await self._end_tool(run_id, "ok")
+
+    async def on_tool_error(self, error, *, run_id, **kwargs):
+        await self._end_tool(run_id, "error")
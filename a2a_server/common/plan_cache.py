@@ -0,0 +1,193 @@
+import copy
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Literals are numbers and capitalized names that do not start a sentence,
+# e.g. "What is 5 + 7?" -> "what is {0} + {1}?" and "weather in New York"
+# -> "weather in {0}".
+_LITERAL_PATTERN = re.compile(
+    r"(?P<number>\d+(?:\.\d+)?)|(?P<name>[A-Z][\w'-]*(?:\s+[A-Z][\w'-]*)*)"
+)
+_SENTENCE_START_PATTERN = re.compile(r"(?:^|[.!?:;]\s*|\n\s*)$")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def extract_template(query: str) -> Tuple[str, List[str]]:
+    """Split a query into a normalized template and the literals pulled from it."""
+    literals: List[str] = []
+    pieces: List[str] = []
+    position = 0
+
+    for match in _LITERAL_PATTERN.finditer(query):
+        is_name = match.group("name") is not None
+        if is_name and _SENTENCE_START_PATTERN.search(query[: match.start()]):
+            continue
+
+        pieces.append(query[position : match.start()].lower())
+        pieces.append(f"{{{len(literals)}}}")
+        literals.append(match.group(0))
+        position = match.end()
+
+    pieces.append(query[position:].lower())
+    template = _WHITESPACE_PATTERN.sub(" ", "".join(pieces)).strip()
+    return template, literals
+
+
+def roster_fingerprint(available_agents: Dict[str, Dict[str, Any]]) -> str:
+    """Return a stable fingerprint of the agents available for planning."""
+    payload = json.dumps(available_agents, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class _PlanCacheEntry:
+    def __init__(self, literals: List[str], plan_response: Dict[str, Any]):
+        self.literals = literals
+        self.plan_response = plan_response
+        self.created_at = time.monotonic()
+
+
+class PlanCache:
+    """LRU/TTL cache of orchestrator plans keyed on query template and agent roster.
+
+    An identical query is an exact hit. A query with the same template but
+    different literals is a templated hit: the cached plan is re-parameterized
+    by swapping the old literals for the new ones in the task inputs. The
+    summary and task descriptions are shown to the user, so they are rewritten
+    only when every literal in them is one of the query's; a plan whose text
+    holds anything else, such as a value the planner computed, is not reused.
+    """
+
+    def __init__(
+        self, max_entries: int = 512, ttl: float = 600.0, templated: bool = True
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.templated = templated
+        self.roster = roster_fingerprint({})
+        self._entries: "OrderedDict[Tuple[str, str], _PlanCacheEntry]" = OrderedDict()
+
+        self.hits = 0
+        self.template_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def set_roster(self, available_agents: Dict[str, Dict[str, Any]]):
+        """Track the current agent roster, invalidating the cache if it changed."""
+        fingerprint = roster_fingerprint(available_agents)
+        if fingerprint != self.roster:
+            self.roster = fingerprint
+            self.invalidate()
+
+    def invalidate(self):
+        """Drop every cached plan."""
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """Return a plan response for the query, or None on a miss."""
+        template, literals = extract_template(query)
+        key = (self.roster, template)
+        entry = self._entries.get(key)
+
+        if entry is not None and time.monotonic() - entry.created_at > self.ttl:
+            del self._entries[key]
+            self.evictions += 1
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if [l.lower() for l in literals] == [l.lower() for l in entry.literals]:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry.plan_response)
+
+        plan_response = (
+            self._reparameterize(entry, literals) if self.templated else None
+        )
+        if plan_response is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.template_hits += 1
+        return plan_response
+
+    def put(self, query: str, plan_response: Dict[str, Any]):
+        """Cache the plan response produced for the query."""
+        template, literals = extract_template(query)
+        key = (self.roster, template)
+        self._entries[key] = _PlanCacheEntry(literals, copy.deepcopy(plan_response))
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _reparameterize(
+        self, entry: _PlanCacheEntry, literals: List[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Swap the cached literals for new ones, or return None if that is unsafe."""
+        old_literals = entry.literals
+        if len(set(l.lower() for l in old_literals)) != len(old_literals):
+            return None
+
+        tasks = entry.plan_response["plan"]["tasks"]
+        task_inputs = " ".join(task["task_input"] for task in tasks)
+
+        replacements = {}
+        for old, new in zip(old_literals, literals):
+            pattern = rf"(?<!\w){re.escape(old)}(?!\w)"
+            # Each literal must flow into a task input, otherwise the plan may
+            # have been built around a value we cannot see
+            if not re.search(pattern, task_inputs, re.IGNORECASE):
+                return None
+            replacements[old.lower()] = new
+
+        # Agent names are capitalized but are not literals of the query
+        known = set(replacements) | {task["agent_name"].lower() for task in tasks}
+        plan = entry.plan_response["plan"]
+        for text in [plan["summary"], *(task["task_description"] for task in tasks)]:
+            _, text_literals = extract_template(text)
+            if any(literal.lower() not in known for literal in text_literals):
+                return None
+
+        pattern = re.compile(
+            "|".join(
+                rf"(?<!\w){re.escape(old)}(?!\w)"
+                for old in sorted(old_literals, key=len, reverse=True)
+            ),
+            re.IGNORECASE,
+        )
+
+        def substitute(text: str) -> str:
+            return pattern.sub(lambda match: replacements[match.group(0).lower()], text)
+
+        plan_response = copy.deepcopy(entry.plan_response)
+        plan = plan_response["plan"]
+        plan["summary"] = substitute(plan["summary"])
+        for task in plan["tasks"]:
+            task["task_description"] = substitute(task["task_description"])
+            task["task_input"] = substitute(task["task_input"])
+        return plan_response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        lookups = self.hits + self.template_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "template_hits": self.template_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": (self.hits + self.template_hits) / lookups if lookups else 0.0,
+        }
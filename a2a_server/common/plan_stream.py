@@ -0,0 +1,72 @@
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+
+_TASKS_KEY_PATTERN = re.compile(r'"tasks"\s*:\s*\[')
+
+
+class PlanStreamParser:
+    """Pulls complete task objects out of a plan's JSON while it is streamed.
+
+    Text is fed as it arrives. Once the `"tasks"` array has opened, every
+    element is returned as soon as its closing brace is seen, without waiting
+    for the rest of the document. Elements that are not valid JSON are
+    skipped; the complete plan is still checked when the stream ends.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._position: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._start = 0
+        self.done = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """Add streamed text and return the task objects it completed."""
+        self._buffer += text
+        if self.done:
+            return []
+        if self._position is None:
+            match = _TASKS_KEY_PATTERN.search(self._buffer)
+            if match is None:
+                return []
+            self._position = match.end()
+
+        entries: List[Dict[str, Any]] = []
+        buffer = self._buffer
+        position = self._position
+        while position < len(buffer):
+            char = buffer[position]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 0:
+                    self._start = position
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # End of the tasks array
+                    self.done = True
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        entry = json.loads(buffer[self._start : position + 1])
+                    except ValueError:
+                        entry = None
+                    if isinstance(entry, dict):
+                        entries.append(entry)
+            position += 1
+
+        self._position = position
+        return entries
@@ -1,14 +1,19 @@
-from typing import Callable
+import asyncio
+from typing import AsyncIterator, Callable, Optional, Tuple
 
-import httpx
 import uuid
 from a2a.client import A2AClient, A2ACardResolver
 from a2a.types import (
     AgentCard,
+    CancelTaskRequest,
     SendMessageRequest,
     SendMessageResponse,
+    SendStreamingMessageRequest,
+    SendStreamingMessageResponse,
     Task,
     TaskArtifactUpdateEvent,
+    TaskIdParams,
+    TaskState,
     TaskStatusUpdateEvent,
     Message,
     Role,
@@ -16,51 +21,205 @@ from a2a.types import (
     TextPart,
     MessageSendParams,
 )
+from .agent_card_cache import AgentCardCache
+from .circuit_breaker import CircuitBreaker
+from .http_transport import HttpTransport, get_shared_transport
+from .metrics import track_remote_call
+from .tracing import Span, get_tracer, inject
+from logger import logger
+from settings import settings
 
 
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 
+TERMINAL_TASK_STATES = {
+    TaskState.completed,
+    TaskState.canceled,
+    TaskState.failed,
+    TaskState.rejected,
+}
+
+
+def _remote_task_state(event) -> Tuple[Optional[str], bool]:
+    """The remote task id a streaming event refers to, and whether it is final."""
+    if isinstance(event, Task):
+        return event.id, event.status.state in TERMINAL_TASK_STATES
+    if isinstance(event, TaskStatusUpdateEvent):
+        return event.task_id, event.final
+    if isinstance(event, TaskArtifactUpdateEvent):
+        return event.task_id, False
+    return getattr(event, "task_id", None), False
+
 
 class RemoteAgentConnection:
     """A class to hold the connections to the remote agents."""
 
-    def __init__(self, agent_card: AgentCard, agent_url: str):
-        self._httpx_client = httpx.AsyncClient(timeout=600)
+    def __init__(
+        self,
+        agent_card: AgentCard,
+        agent_url: str,
+        transport: Optional[HttpTransport] = None,
+    ):
+        self.transport = transport or get_shared_transport()
+        self._httpx_client = self.transport.get_client(agent_url)
         self.agent_client = A2AClient(self._httpx_client, agent_card, url=agent_url)
         self.card = agent_card
         self.agent_url = agent_url
         self.conversation_name = None
         self.conversation = None
         self.pending_tasks = set()
+        self.breaker = CircuitBreaker(
+            agent_card.name,
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            recovery_timeout=settings.CIRCUIT_RECOVERY_TIMEOUT,
+            half_open_max_calls=settings.CIRCUIT_HALF_OPEN_MAX_CALLS,
+        )
 
     @classmethod
-    async def create_from_url(cls, agent_url: str) -> "RemoteAgentConnection":
+    async def create_from_url(
+        cls,
+        agent_url: str,
+        transport: Optional[HttpTransport] = None,
+        card_cache: Optional[AgentCardCache] = None,
+    ) -> "RemoteAgentConnection":
         """Create a RemoteAgentConnections instance by resolving the agent card from URL."""
-        async with httpx.AsyncClient(timeout=600) as client:
+        transport = transport or get_shared_transport()
+        client = transport.get_client(agent_url)
+        if card_cache:
+            card = await card_cache.get_card(client, agent_url)
+        else:
             card_resolver = A2ACardResolver(client, agent_url)
             card = await card_resolver.get_agent_card()
-            return cls(agent_card=card, agent_url=agent_url)
+        return cls(agent_card=card, agent_url=agent_url, transport=transport)
 
     def get_agent(self) -> AgentCard:
         return self.card
 
-    async def send_message(self, text_message: str) -> SendMessageResponse:
-        """Send a text message to the agent."""
-        message_id = uuid.uuid4().hex
+    @property
+    def supports_streaming(self) -> bool:
+        """Whether the remote agent advertises streaming in its card."""
+        return bool(self.card.capabilities and self.card.capabilities.streaming)
+
+    def _build_params(
+        self, text_message: str, span: Optional[Span] = None
+    ) -> MessageSendParams:
         message = Message(
             role=Role.user,
-            message_id=message_id,
+            message_id=uuid.uuid4().hex,
             parts=[Part(root=TextPart(text=text_message))],
+            # Lets the remote agent continue the caller's trace
+            metadata=inject(span) or None,
         )
+        return MessageSendParams(message=message)
+
+    def _timeout(self, timeout: Optional[float]) -> float:
+        if timeout is None:
+            return self.transport.total_timeout
+        return max(0.0, min(timeout, self.transport.total_timeout))
+
+    async def send_message(
+        self, text_message: str, timeout: Optional[float] = None
+    ) -> SendMessageResponse:
+        """Send a text message to the agent.
+
+        Raises CircuitOpenError without calling the agent while its circuit
+        breaker is open. A call that times out counts against the breaker.
+        """
+        tracer = get_tracer()
+        with tracer.span(
+            "a2a.send_message", agent=self.card.name, url=self.agent_url
+        ) as span, track_remote_call(self.card.name):
+            params = self._build_params(text_message, span)
+            request = SendMessageRequest(id=params.message.message_id, params=params)
 
-        request = SendMessageRequest(
-            id=message_id, params=MessageSendParams(message=message)
+            async with self.breaker.guard():
+                return await asyncio.wait_for(
+                    self.agent_client.send_message(request),
+                    timeout=self._timeout(timeout),
+                )
+
+    async def send_message_streaming(
+        self, text_message: str, timeout: Optional[float] = None
+    ) -> AsyncIterator[SendStreamingMessageResponse]:
+        """Send a text message and yield the agent's events as they arrive.
+
+        If the caller is cancelled, stops consuming or runs out of time before
+        the remote task finished, the remote task is cancelled too.
+        """
+        # Not made current: this generator runs interleaved with its consumer
+        tracer = get_tracer()
+        span = tracer.start_span(
+            "a2a.send_message_streaming", agent=self.card.name, url=self.agent_url
         )
+        params = self._build_params(text_message, span)
+        request = SendStreamingMessageRequest(
+            id=params.message.message_id, params=params
+        )
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._timeout(timeout)
+        events = 0
+        task_id, finished = None, False
+        try:
+            with track_remote_call(self.card.name):
+                async with self.breaker.guard():
+                    stream = self.agent_client.send_message_streaming(request)
+                    stream = stream.__aiter__()
+                    try:
+                        while True:
+                            try:
+                                event = await asyncio.wait_for(
+                                    stream.__anext__(),
+                                    timeout=max(0.0, deadline - loop.time()),
+                                )
+                            except StopAsyncIteration:
+                                return
+                            events += 1
+                            result = getattr(event.root, "result", None)
+                            event_task_id, final = _remote_task_state(result)
+                            task_id = task_id or event_task_id
+                            finished = finished or final
+                            yield event
+                    finally:
+                        await stream.aclose()
+        except BaseException as e:
+            abandoned = (asyncio.CancelledError, GeneratorExit, asyncio.TimeoutError)
+            if task_id and not finished and isinstance(e, abandoned):
+                self._cancel_in_background(task_id)
+            if isinstance(e, Exception):
+                span.record_error(e)
+            raise
+        finally:
+            span.set_attribute("events", events)
+            tracer.end_span(span)
 
-        return await self.agent_client.send_message(request)
+    async def cancel_task(self, task_id: str) -> None:
+        """Ask the agent to cancel one of its tasks. Failures are only logged."""
+        request = CancelTaskRequest(
+            id=uuid.uuid4().hex, params=TaskIdParams(id=task_id)
+        )
+        try:
+            response = await asyncio.wait_for(
+                self.agent_client.cancel_task(request),
+                timeout=settings.REMOTE_CANCEL_TIMEOUT,
+            )
+            if hasattr(response.root, "error"):
+                raise Exception(response.root.error.message)
+            logger.info("Cancelled task %s on %s", task_id, self.card.name)
+        except Exception as e:
+            logger.warning(
+                "Could not cancel task %s on %s: %r", task_id, self.card.name, e
+            )
+
+    def _cancel_in_background(self, task_id: str):
+        # The caller is being cancelled and must not wait for the remote agent
+        cancellation = asyncio.get_running_loop().create_task(
+            self.cancel_task(task_id)
+        )
+        self.pending_tasks.add(cancellation)
+        cancellation.add_done_callback(self.pending_tasks.discard)
 
     async def close(self):
-        """Close the HTTP client."""
-        if self._httpx_client:
-            await self._httpx_client.aclose()
+        """Release the connection. The pooled HTTP client stays open for reuse."""
+        self._httpx_client = None
@@ -0,0 +1,241 @@
+import random
+import statistics
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Sequence
+
+from a2a.types import AgentCard
+from logger import logger
+
+from .circuit_breaker import CircuitOpenError
+from .remote_agent_connection import RemoteAgentConnection
+
+
+LEAST_OUTSTANDING = "least_outstanding"
+POWER_OF_TWO_CHOICES = "p2c"
+
+
+class Replica:
+    """One replica of a remote agent with passively tracked health."""
+
+    def __init__(self, connection: RemoteAgentConnection):
+        self.connection = connection
+        self.outstanding = 0
+        self.latency_ewma: Optional[float] = None
+        self.error_ewma = 0.0
+        self.samples = 0
+        self.ejected_until = 0.0
+
+        self.requests = 0
+        self.errors = 0
+        self.ejections = 0
+
+    @property
+    def url(self) -> str:
+        return self.connection.agent_url
+
+    def is_ejected(self, now: float) -> bool:
+        return now < self.ejected_until
+
+    def load(self, default_latency: float) -> float:
+        """Expected wait if one more request is sent here."""
+        latency = self.latency_ewma if self.latency_ewma is not None else default_latency
+        return (self.outstanding + 1) * latency
+
+    def record(self, latency: float, error: bool, alpha: float):
+        self.requests += 1
+        self.samples += 1
+        if error:
+            self.errors += 1
+        else:
+            self.latency_ewma = (
+                latency
+                if self.latency_ewma is None
+                else alpha * latency + (1 - alpha) * self.latency_ewma
+            )
+        self.error_ewma = alpha * float(error) + (1 - alpha) * self.error_ewma
+
+    def eject(self, duration: float):
+        self.ejected_until = time.monotonic() + duration
+        self.ejections += 1
+        # Start from a clean slate once the ejection expires
+        self.latency_ewma = None
+        self.error_ewma = 0.0
+        self.samples = 0
+
+
+class ReplicaPool:
+    """Load-balances calls to one agent across its replicas.
+
+    Routing is least-outstanding-requests or power-of-two-choices weighted by
+    latency. Each replica's error rate and latency are tracked as EWMAs; a
+    replica whose error rate passes `error_threshold`, or whose latency is
+    `slow_factor` times the median of its peers, is ejected for
+    `ejection_time` seconds. The last available replica is never ejected.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        strategy: str = LEAST_OUTSTANDING,
+        ewma_alpha: float = 0.2,
+        error_threshold: float = 0.5,
+        slow_factor: float = 3.0,
+        ejection_time: float = 30.0,
+        min_samples: int = 5,
+        latency_window: int = 256,
+    ):
+        if strategy not in (LEAST_OUTSTANDING, POWER_OF_TWO_CHOICES):
+            raise ValueError(f"Unknown replica routing strategy: {strategy}")
+        self.name = name
+        self.strategy = strategy
+        self.ewma_alpha = ewma_alpha
+        self.error_threshold = error_threshold
+        self.slow_factor = slow_factor
+        self.ejection_time = ejection_time
+        self.min_samples = min_samples
+        self.replicas: List[Replica] = []
+        # Recent successful call latencies across all replicas
+        self.latencies: Deque[float] = deque(maxlen=latency_window)
+
+    def __len__(self) -> int:
+        return len(self.replicas)
+
+    @property
+    def card(self) -> AgentCard:
+        return self.replicas[0].connection.card
+
+    def add(self, connection: RemoteAgentConnection) -> bool:
+        """Add a replica. Returns False if its URL is already in the pool."""
+        if any(replica.url == connection.agent_url for replica in self.replicas):
+            return False
+        self.replicas.append(Replica(connection))
+        return True
+
+    def is_available(self) -> bool:
+        """Whether any replica's circuit breaker would let a call through."""
+        return any(r.connection.breaker.allows_request() for r in self.replicas)
+
+    def _available(self, now: float) -> List[Replica]:
+        reachable = [r for r in self.replicas if r.connection.breaker.allows_request()]
+        available = [r for r in reachable if not r.is_ejected(now)]
+        if available:
+            return available
+        if reachable:
+            # Everything reachable is ejected: use whichever comes back first
+            return [min(reachable, key=lambda r: r.ejected_until)]
+        # Every circuit is open: the call will fail fast with CircuitOpenError
+        return [min(self.replicas, key=lambda r: r.connection.breaker.retry_after())]
+
+    def _default_latency(self) -> float:
+        latencies = [r.latency_ewma for r in self.replicas if r.latency_ewma is not None]
+        return statistics.median(latencies) if latencies else 1.0
+
+    def latency_quantile(self, quantile: float) -> Optional[float]:
+        """Latency quantile of recent successful calls, once enough are recorded."""
+        if len(self.latencies) < self.min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(quantile * (len(ordered) - 1))]
+
+    def select(self, exclude: Sequence[Replica] = ()) -> Optional[Replica]:
+        """Pick the replica for the next call, or None if every one is excluded."""
+        if not self.replicas:
+            raise LookupError(f"No replicas available for {self.name}")
+
+        candidates = [r for r in self._available(time.monotonic()) if r not in exclude]
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0]
+
+        default_latency = self._default_latency()
+        if self.strategy == POWER_OF_TWO_CHOICES:
+            candidates = random.sample(candidates, 2)
+            return min(candidates, key=lambda r: r.load(default_latency))
+
+        # Break ties randomly so idle replicas share the load evenly
+        random.shuffle(candidates)
+        return min(
+            candidates,
+            key=lambda r: (r.outstanding, r.latency_ewma or default_latency),
+        )
+
+    def _maybe_eject(self, replica: Replica):
+        now = time.monotonic()
+        if replica.samples < self.min_samples or replica.is_ejected(now):
+            return
+        if sum(1 for r in self.replicas if not r.is_ejected(now)) <= 1:
+            return
+
+        reason = None
+        if replica.error_ewma > self.error_threshold:
+            reason = f"error rate {replica.error_ewma:.2f}"
+        elif replica.latency_ewma is not None:
+            peers = [
+                r.latency_ewma
+                for r in self.replicas
+                if r is not replica and r.latency_ewma is not None
+                and not r.is_ejected(now)
+            ]
+            if peers and replica.latency_ewma > self.slow_factor * statistics.median(
+                peers
+            ):
+                reason = f"latency {replica.latency_ewma:.2f}s"
+
+        if reason:
+            logger.warning(
+                "Ejecting %s replica %s for %ss: %s",
+                self.name,
+                replica.url,
+                self.ejection_time,
+                reason,
+            )
+            replica.eject(self.ejection_time)
+
+    @asynccontextmanager
+    async def lease(self, replica: Optional[Replica] = None) -> AsyncIterator[Replica]:
+        """Route one call to `replica` (or a selected one) and record its outcome."""
+        replica = replica or self.select()
+        replica.outstanding += 1
+        started = time.monotonic()
+        try:
+            yield replica
+        except CircuitOpenError:
+            # Failed fast without calling the replica, so there is no sample
+            raise
+        except Exception:
+            replica.record(time.monotonic() - started, True, self.ewma_alpha)
+            self._maybe_eject(replica)
+            raise
+        else:
+            latency = time.monotonic() - started
+            self.latencies.append(latency)
+            replica.record(latency, False, self.ewma_alpha)
+            self._maybe_eject(replica)
+        finally:
+            # Cancelled and fail-fast calls release their slot without counting
+            # as samples
+            replica.outstanding -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return per-replica load and health statistics."""
+        now = time.monotonic()
+        return {
+            "strategy": self.strategy,
+            "replicas": [
+                {
+                    "url": r.url,
+                    "outstanding": r.outstanding,
+                    "latency_ewma": r.latency_ewma,
+                    "error_ewma": r.error_ewma,
+                    "ejected": r.is_ejected(now),
+                    "requests": r.requests,
+                    "errors": r.errors,
+                    "ejections": r.ejections,
+                    "circuit": r.connection.breaker.get_stats(),
+                }
+                for r in self.replicas
+            ],
+        }
@@ -0,0 +1,173 @@
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+HIT = "hit"
+COALESCED = "coalesced"
+MISS = "miss"
+
+
+def normalize_input(text: str) -> str:
+    """Normalize a task input so trivially different spellings share an entry."""
+    return _WHITESPACE_PATTERN.sub(" ", text).strip().lower()
+
+
+class _ResultCacheEntry:
+    def __init__(self, result: str, size: int, ttl: float):
+        self.result = result
+        self.size = size
+        self.expires_at = time.monotonic() + ttl
+
+
+class RemoteResultCache:
+    """LRU cache of remote agent results with single-flight de-duplication.
+
+    Entries are keyed on agent name plus normalized input. Each agent has its
+    own TTL; agents with a TTL of zero are never cached. Identical calls that
+    arrive while one is already in flight wait for it instead of calling the
+    agent again, whether or not the agent is cacheable. The cache is bounded by
+    the total size of its keys and results in bytes. Results rejected by
+    `is_cacheable` (by default, empty ones) are not stored.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 16 * 1024 * 1024,
+        default_ttl: float = 0.0,
+        agent_ttls: Optional[Dict[str, float]] = None,
+        is_cacheable: Callable[[str], bool] = bool,
+    ):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.agent_ttls = dict(agent_ttls or {})
+        self.is_cacheable = is_cacheable
+        self._entries: "OrderedDict[Tuple[str, str], _ResultCacheEntry]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.bytes = 0
+
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, agent_name: str) -> float:
+        return self.agent_ttls.get(agent_name, self.default_ttl)
+
+    def _lookup(self, key: Tuple[str, str]) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry.expires_at:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.result
+
+    def peek(self, agent_name: str, task_input: str) -> Optional[str]:
+        """Return the cached result for the input without counting a lookup."""
+        return self._lookup((agent_name, normalize_input(task_input)))
+
+    def _remove(self, key: Tuple[str, str]):
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+
+    def _store(self, key: Tuple[str, str], result: str, ttl: float):
+        size = len(key[0].encode("utf-8")) + len(key[1].encode("utf-8"))
+        size += len(result.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _ResultCacheEntry(result, size, ttl)
+        self.bytes += size
+
+        while self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    async def get_or_call(
+        self,
+        agent_name: str,
+        task_input: str,
+        call: Callable[[], Awaitable[str]],
+        deadline: Optional[float] = None,
+    ) -> Tuple[str, str]:
+        """Return `(result, source)` for the input, calling the agent if needed.
+
+        `source` is one of "hit", "coalesced" or "miss". Failed calls are not
+        cached and their error is raised to every caller waiting on them. A
+        caller waiting on another's call gives up with `asyncio.TimeoutError`
+        at its own `deadline` (an event loop time); the call itself goes on.
+        """
+        key = (agent_name, normalize_input(task_input))
+        ttl = self.ttl_for(agent_name)
+        loop = asyncio.get_running_loop()
+
+        while True:
+            if ttl > 0:
+                result = self._lookup(key)
+                if result is not None:
+                    self.hits += 1
+                    return result, HIT
+
+            future = self._in_flight.get(key)
+            if future is None:
+                break
+            timeout = None if deadline is None else max(deadline - loop.time(), 0)
+            try:
+                result = await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.CancelledError:
+                # The call we were waiting on was cancelled, not us: retry
+                if future.cancelled():
+                    continue
+                raise
+            self.coalesced += 1
+            return result, COALESCED
+
+        self.misses += 1
+        future = loop.create_future()
+        self._in_flight[key] = future
+        try:
+            result = await call()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark the exception retrieved when nobody else was waiting
+                future.exception()
+            raise
+        else:
+            future.set_result(result)
+            if ttl > 0 and self.is_cacheable(result):
+                self._store(key, result, ttl)
+            return result, MISS
+        finally:
+            del self._in_flight[key]
+
+    def invalidate(self, agent_name: Optional[str] = None):
+        """Drop cached results, for one agent or for all of them."""
+        for key in [k for k in self._entries if agent_name in (None, k[0])]:
+            self._remove(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, size and hit ratio."""
+        lookups = self.hits + self.coalesced + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "in_flight": len(self._in_flight),
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
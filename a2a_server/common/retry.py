@@ -0,0 +1,34 @@
+import random
+
+import httpx
+from a2a.client.errors import A2AClientHTTPError, A2AClientTimeoutError
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed remote call is worth retrying.
+
+    Only transport-level failures qualify: the request may never have reached
+    the agent, or the agent was briefly unavailable. Errors reported by the
+    agent itself and exhausted deadlines are final.
+    """
+    if isinstance(error, A2AClientHTTPError):
+        # The A2A client reports network failures as 503
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(
+        error, (A2AClientTimeoutError, httpx.TransportError, ConnectionError)
+    )
+
+
+class RetryPolicy:
+    """Bounded retries with exponential backoff and full jitter."""
+
+    def __init__(
+        self, max_retries: int = 2, backoff_base: float = 0.2, backoff_max: float = 2.0
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (starting at 0)."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
@@ -0,0 +1,165 @@
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from .models import Task
+
+
+TaskRunner = Callable[[Task], Awaitable[None]]
+
+
+class DataflowScheduler:
+    """Dependency-driven scheduler for execution plans.
+
+    Every task is started as soon as its own dependencies have finished instead
+    of waiting for a whole wave of tasks. Completion of a task only touches the
+    in-degree counters of its direct dependents. If the run is cancelled, the
+    running tasks are cancelled and the remaining ones are never started.
+
+    A scheduler created with `closed=False` accepts more tasks through
+    `add_task` while it runs, e.g. as a plan is being generated, and finishes
+    once `close` has been called and nothing more can start.
+    """
+
+    def __init__(self, tasks: List[Task], closed: bool = True):
+        self.tasks: Dict[int, Task] = {}
+        self.dependents: Dict[int, List[int]] = {}
+        self.in_degree: Dict[int, int] = {}
+        self.started: Set[int] = set()
+        self.finished: Set[int] = set()
+        self.closed = closed
+
+        # Dependencies not finished yet, for the tasks that have not started
+        self._waiting: Dict[int, int] = {}
+        self._ready: Deque[int] = deque()
+        self._changed = asyncio.Event()
+
+        for task in tasks:
+            self.add_task(task)
+
+    def add_task(self, task: Task) -> bool:
+        """Register a task; it starts once its dependencies have finished.
+
+        Returns False for a task whose order is already taken.
+        """
+        if task.order in self.tasks:
+            return False
+
+        self.tasks[task.order] = task
+        self.dependents.setdefault(task.order, [])
+        dependencies = set(task.dependencies)
+        self.in_degree[task.order] = len(dependencies)
+        for dep in dependencies:
+            self.dependents.setdefault(dep, []).append(task.order)
+
+        self._waiting[task.order] = len(dependencies - self.finished)
+        if not self._waiting[task.order]:
+            self._ready.append(task.order)
+        self._changed.set()
+        return True
+
+    def close(self):
+        """Signal that no more tasks will be added."""
+        self.closed = True
+        self._changed.set()
+
+    def blocked(self) -> List[int]:
+        """Tasks that never started, e.g. behind an unknown dependency or a cycle."""
+        return sorted(self.tasks.keys() - self.started)
+
+    def validate(self) -> Optional[str]:
+        """Check the plan once before execution. Return an error message or None."""
+        unknown = {
+            order: sorted(set(task.dependencies) - self.tasks.keys())
+            for order, task in self.tasks.items()
+            if set(task.dependencies) - self.tasks.keys()
+        }
+        if unknown:
+            return f"Tasks depend on unknown tasks: {unknown}"
+
+        # Kahn's algorithm on a copy of the counters: anything left over is part
+        # of (or blocked behind) a cycle.
+        in_degree = dict(self.in_degree)
+        ready = deque(order for order, degree in in_degree.items() if degree == 0)
+        visited = 0
+        while ready:
+            order = ready.popleft()
+            visited += 1
+            for dependent in self.dependents[order]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    ready.append(dependent)
+
+        if visited < len(self.tasks):
+            blocked = sorted(order for order, degree in in_degree.items() if degree)
+            return f"Circular dependency between tasks: {blocked}"
+
+        return None
+
+    def heights(self) -> Dict[int, int]:
+        """Number of tasks on the longest path from each task to the end of the plan.
+
+        A task nothing depends on has height 1. A plan that is still arriving is
+        not validated yet; a task already on the current path counts as 0 there.
+        """
+        heights: Dict[int, int] = {}
+        path: Set[int] = set()
+
+        def height(order: int) -> int:
+            if order in path:
+                return 0
+            if order not in heights:
+                path.add(order)
+                heights[order] = 1 + max(
+                    (height(dependent) for dependent in self.dependents[order]),
+                    default=0,
+                )
+                path.discard(order)
+            return heights[order]
+
+        for order in self.tasks:
+            height(order)
+        return heights
+
+    async def run(self, run_task: TaskRunner) -> None:
+        """Run every task, starting each one as soon as it becomes ready."""
+        running: Dict[asyncio.Task, int] = {}
+        changed: Optional[asyncio.Task] = None
+
+        try:
+            while self._ready or running or not self.closed:
+                while self._ready:
+                    order = self._ready.popleft()
+                    running[asyncio.create_task(run_task(self.tasks[order]))] = order
+                    self.started.add(order)
+
+                self._changed.clear()
+                waiting = set(running)
+                if not self.closed:
+                    if changed is None:
+                        changed = asyncio.create_task(self._changed.wait())
+                    waiting.add(changed)
+                if not waiting:
+                    break
+
+                done, _ = await asyncio.wait(
+                    waiting, return_when=asyncio.FIRST_COMPLETED
+                )
+                if changed in done:
+                    changed = None
+                for finished in done & running.keys():
+                    order = running.pop(finished)
+                    self.finished.add(order)
+                    finished.result()
+                    for dependent in self.dependents[order]:
+                        if dependent in self._waiting:
+                            self._waiting[dependent] -= 1
+                            if self._waiting[dependent] == 0:
+                                self._ready.append(dependent)
+        finally:
+            if changed is not None:
+                changed.cancel()
+            for pending in running:
+                pending.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
@@ -0,0 +1,169 @@
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Words, numbers and arithmetic operators; numbers all map to one token so
+# "5 + 7" in a skill example matches "12 + 30" in a query
+_TOKEN_PATTERN = re.compile(r"[a-z]+|\d+(?:\.\d+)?|[-+*/^×÷%]")
+_NUMBER_TOKEN = "<number>"
+_STOPWORDS = frozenset(
+    "a an and are as at be by can could do for from give how i in is it me my "
+    "of on or please s show tell that the this to using via what whats with "
+    "you your".split()
+)
+# Capitalized words after the first one, i.e. likely place and person names
+_PROPER_NOUN_PATTERN = re.compile(r"(?<=\s)[A-Z][a-z]+")
+# How much each part of an agent card counts towards the agent's vocabulary
+_FIELD_WEIGHTS = (("tags", 2.0), ("name", 1.5), ("examples", 1.0))
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase content tokens of a text, with numbers collapsed to one token."""
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token[0].isdigit():
+            tokens.append(_NUMBER_TOKEN)
+        elif token not in _STOPWORDS:
+            tokens.append(token)
+    return tokens
+
+
+class RouteDecision:
+    """The router's pick for a query and how sure it is."""
+
+    def __init__(self, agent_name: Optional[str], confidence: float, routed: bool):
+        self.agent_name = agent_name
+        self.confidence = confidence
+        self.routed = routed
+
+
+class SkillRouter:
+    """Keyword classifier that routes single-agent queries without planning.
+
+    Each agent's vocabulary is built from its card: description, skill names,
+    descriptions, tags and examples. A query scores against every agent by the
+    IDF-weighted vocabulary it shares with it. Confidence is the top agent's
+    share of the total score; a query is routed only when that share reaches
+    `min_confidence`, so queries that touch several agents still get planned.
+    The top agent must also know at least `min_coverage` of the query's words
+    (names aside), so a query that is mostly about something no card covers is
+    planned too. Shadow checks against the planner measure how often routing
+    is right.
+    """
+
+    def __init__(
+        self,
+        min_confidence: float = 0.9,
+        min_score: float = 1.0,
+        min_coverage: float = 0.6,
+    ):
+        self.min_confidence = min_confidence
+        self.min_score = min_score
+        self.min_coverage = min_coverage
+        self._vocabularies: Dict[str, Dict[str, float]] = {}
+        self._idf: Dict[str, float] = {}
+
+        self.routed = 0
+        self.planned = 0
+        self.confidence_sum = 0.0
+        self.shadow_checks = 0
+        self.shadow_agreements = 0
+
+    def set_agents(self, available_agents: Dict[str, Dict[str, Any]]):
+        """Rebuild the vocabularies from the agents available for planning."""
+        self._vocabularies = {}
+        for name, info in available_agents.items():
+            weights: Counter = Counter()
+            for token in tokenize(f"{name} {info.get('description', '')}"):
+                weights[token] = max(weights[token], 1.0)
+            for skill in info.get("skills", []):
+                for token in tokenize(skill.get("description", "")):
+                    weights[token] = max(weights[token], 1.0)
+                for field, weight in _FIELD_WEIGHTS:
+                    values = skill.get(field) or []
+                    if isinstance(values, str):
+                        values = [values]
+                    for token in tokenize(" ".join(values)):
+                        weights[token] = max(weights[token], weight)
+            self._vocabularies[name] = dict(weights)
+
+        # Smoothed, so a roster of one agent can still route
+        document_frequency = Counter(
+            token for vocabulary in self._vocabularies.values() for token in vocabulary
+        )
+        agents = len(self._vocabularies)
+        self._idf = {
+            token: math.log((agents + 1) / count)
+            for token, count in document_frequency.items()
+        }
+
+    def scores(self, query: str) -> Dict[str, float]:
+        """Score every agent for the query."""
+        tokens = set(tokenize(query))
+        return {
+            name: sum(
+                vocabulary[token] * self._idf[token]
+                for token in tokens
+                if token in vocabulary
+            )
+            for name, vocabulary in self._vocabularies.items()
+        }
+
+    def coverage(self, query: str, agent_name: str) -> float:
+        """Share of the query's words, names aside, in the agent's vocabulary."""
+        names = set(tokenize(" ".join(_PROPER_NOUN_PATTERN.findall(query))))
+        tokens = set(tokenize(query)) - names
+        if not tokens:
+            return 0.0
+        vocabulary = self._vocabularies.get(agent_name, {})
+        return sum(token in vocabulary for token in tokens) / len(tokens)
+
+    def route(self, query: str, unavailable: Tuple[str, ...] = ()) -> RouteDecision:
+        """Pick an agent for the query, routing it only when the pick is confident."""
+        scores = self.scores(query)
+        total = sum(scores.values())
+        if not total:
+            self.planned += 1
+            return RouteDecision(None, 0.0, False)
+
+        agent_name, top = max(scores.items(), key=lambda item: item[1])
+        confidence = top / total
+        routed = (
+            confidence >= self.min_confidence
+            and top >= self.min_score
+            and agent_name not in unavailable
+            and self.coverage(query, agent_name) >= self.min_coverage
+        )
+        if routed:
+            self.routed += 1
+            self.confidence_sum += confidence
+        else:
+            self.planned += 1
+        return RouteDecision(agent_name, confidence, routed)
+
+    def record_shadow(self, agreed: bool):
+        """Record whether the planner agreed with a routing decision."""
+        self.shadow_checks += 1
+        if agreed:
+            self.shadow_agreements += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return routing counts, mean confidence and shadow-checked accuracy."""
+        decisions = self.routed + self.planned
+        return {
+            "routed": self.routed,
+            "planned": self.planned,
+            "route_ratio": self.routed / decisions if decisions else 0.0,
+            "mean_confidence": (
+                self.confidence_sum / self.routed if self.routed else 0.0
+            ),
+            "shadow_checks": self.shadow_checks,
+            "shadow_agreements": self.shadow_agreements,
+            "accuracy": (
+                self.shadow_agreements / self.shadow_checks
+                if self.shadow_checks
+                else 0.0
+            ),
+        }
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .models import Task
+from .result_cache import normalize_input
+
+
+class SpeculationStats:
+    """Process-wide counters for speculatively started tasks."""
+
+    def __init__(self):
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.abandoned = 0
+        self.wasted_seconds = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/waste counters and rates."""
+        wasted = self.misses + self.abandoned
+        return {
+            "started": self.started,
+            "hits": self.hits,
+            "misses": self.misses,
+            "abandoned": self.abandoned,
+            "wasted_seconds": self.wasted_seconds,
+            "hit_rate": self.hits / self.started if self.started else 0.0,
+            "waste_rate": wasted / self.started if self.started else 0.0,
+        }
+
+
+class PlanSpeculation:
+    """Speculative calls for the dependent tasks of one plan.
+
+    A dependent task is started early on the input it would get if its
+    dependency returned the predicted result. When the task really runs, it
+    claims the speculative call: if its actual input matches the predicted one
+    the call is used (a hit), otherwise the call is cancelled and the task runs
+    normally (a miss). Calls never claimed are cancelled when the plan ends.
+    """
+
+    def __init__(
+        self,
+        stats: SpeculationStats,
+        tasks: Dict[int, Task],
+        dependents: Dict[int, List[int]],
+        deadline: Optional[float] = None,
+    ):
+        self.stats = stats
+        # The scheduler's own maps, so tasks added while the plan runs count
+        self.tasks = tasks
+        self.dependents = dependents
+        self.deadline = deadline
+        # Task order -> (predicted input, speculative call, start time)
+        self._calls: Dict[int, Tuple[str, asyncio.Task, float]] = {}
+
+    def __contains__(self, order: int) -> bool:
+        return order in self._calls
+
+    def dependents_of(self, order: int) -> List[Task]:
+        """The known tasks that depend on task `order`."""
+        return [self.tasks[dependent] for dependent in self.dependents.get(order, [])]
+
+    def start(
+        self, order: int, predicted_input: str, call: Callable[[], Awaitable[Any]]
+    ):
+        """Start the call for task `order` on its predicted input."""
+        if order in self._calls:
+            return
+        self._calls[order] = (
+            predicted_input,
+            asyncio.create_task(call()),
+            time.monotonic(),
+        )
+        self.stats.started += 1
+
+    def claim(self, order: int, task_input: str) -> Optional[asyncio.Task]:
+        """Return the speculative call for the task if it was made on `task_input`."""
+        entry = self._calls.pop(order, None)
+        if entry is None:
+            return None
+        predicted_input, call, started = entry
+        if normalize_input(predicted_input) == normalize_input(task_input):
+            self.stats.hits += 1
+            return call
+        self.stats.misses += 1
+        self._discard(call, started)
+        return None
+
+    def _discard(self, call: asyncio.Task, started: float):
+        if call.done():
+            # Retrieve the outcome so a failed call is not reported as unhandled
+            if not call.cancelled():
+                call.exception()
+        else:
+            call.cancel()
+        self.stats.wasted_seconds += time.monotonic() - started
+
+    async def aclose(self):
+        """Cancel the calls that were never claimed."""
+        calls = list(self._calls.values())
+        self._calls.clear()
+        for _, call, started in calls:
+            self.stats.abandoned += 1
+            self._discard(call, started)
+        if calls:
+            await asyncio.gather(*(entry[1] for entry in calls), return_exceptions=True)
@@ -0,0 +1,311 @@
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel, PrivateAttr
+
+
+STUB_PREFIX = "stub"
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "exponential", "lognormal")
+
+_AGENT_LIST_PATTERN = re.compile(
+    r"Available agents and their capabilities:\n(.*?)\n\n", re.DOTALL
+)
+_AGENT_NAME_PATTERN = re.compile(r"^- ([^:\n]+):", re.MULTILINE)
+_CLAUSE_SPLIT_PATTERN = re.compile(
+    r"\.\s+(?:then,?\s+)?"
+    r"|;\s*"
+    r"|,?\s+then,?\s+"
+    r"|,?\s+and\s+(?:then\s+)?(?=(?:tell|what|get|give|calculate|compute|show|find"
+    r"|check|how)\b)",
+    re.IGNORECASE,
+)
+_LEADING_WORDS_PATTERN = re.compile(r"^(?:first|then|next|finally|and)\b,?\s*", re.I)
+_WEATHER_PATTERN = re.compile(
+    r"\b(?:weather|forecast|temperature|rain|sunny|humid)\b", re.IGNORECASE
+)
+_MATH_PATTERN = re.compile(
+    r"\d\s*(?:[-+*/×÷^²³]|\*\*)|\b(?:calculate|compute|sum|product|plus|minus|times"
+    r"|divided|squared|cubed|power|square|cube|add|subtract|multiply|divide)\b",
+    re.IGNORECASE,
+)
+_DEPENDENCY_PATTERN = re.compile(
+    r"\b(?:that|the|this|previous)\s+result\b|\busing\b", re.IGNORECASE
+)
+_LOCATION_PATTERN = re.compile(
+    r"\bin\s+([A-Z][\w'-]*(?:\s+[A-Z][\w'-]*)*)"
+    r"|\bin\s+([a-z][\w'-]*(?:\s+[a-z][\w'-]*)?)"
+)
+_FOLLOW_UP_PATTERN = re.compile(r"\bNow:\s*(.*)$", re.DOTALL)
+
+
+class LatencyModel:
+    """Samples simulated model latencies from a named distribution.
+
+    `mean` is the average latency in seconds for every distribution; `spread`
+    is the relative half-width for "uniform" and the sigma for "lognormal".
+    """
+
+    def __init__(
+        self,
+        mean: float = 0.0,
+        distribution: str = "constant",
+        spread: float = 0.5,
+        seed: Optional[int] = None,
+    ):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.mean = mean
+        self.distribution = distribution
+        self.spread = spread
+        self.rng = random.Random(seed)
+
+    def sample(self) -> float:
+        if self.mean <= 0:
+            return 0.0
+        if self.distribution == "uniform":
+            return self.mean * self.rng.uniform(1 - self.spread, 1 + self.spread)
+        if self.distribution == "exponential":
+            return self.rng.expovariate(1 / self.mean)
+        if self.distribution == "lognormal":
+            sigma = self.spread
+            return self.mean * math.exp(self.rng.gauss(-sigma * sigma / 2, sigma))
+        return self.mean
+
+
+def _text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return " ".join(
+        part.get("text", "") if isinstance(part, dict) else str(part)
+        for part in content
+    )
+
+
+def _last(messages: Sequence[BaseMessage], kind) -> Optional[BaseMessage]:
+    for message in reversed(messages):
+        if isinstance(message, kind):
+            return message
+    return None
+
+
+def _request_text(messages: Sequence[BaseMessage]) -> str:
+    """The latest user request, without context prepended by the orchestrator."""
+    human = _last(messages, HumanMessage)
+    text = _text(human) if human else ""
+    follow_up = _FOLLOW_UP_PATTERN.search(text)
+    return follow_up.group(1).strip() if follow_up else text.strip()
+
+
+def _solve_math(text: str) -> str:
+    # Imported lazily: the math agent imports base_agent, which imports us
+    from a2a_server.agents.math_agent_server.fast_path import format_solution, solve
+
+    solution = solve(text)
+    if solution is None:
+        return f"Could not evaluate: {text}"
+    return format_solution(*solution)
+
+
+def _extract_location(text: str) -> str:
+    match = _LOCATION_PATTERN.search(text)
+    if not match:
+        return "other"
+    return (match.group(1) or match.group(2)).strip()
+
+
+def _agent_names(messages: Sequence[BaseMessage]) -> List[str]:
+    system = _last(messages, SystemMessage)
+    if system is None:
+        return []
+    block = _AGENT_LIST_PATTERN.search(_text(system))
+    return _AGENT_NAME_PATTERN.findall(block.group(1)) if block else []
+
+
+def build_plan(query: str, agent_names: Sequence[str]) -> Dict[str, Any]:
+    """Rule-based stand-in for the orchestrator's planning step."""
+    math_agent = next((n for n in agent_names if "math" in n.lower()), "Math Agent")
+    weather_agent = next(
+        (n for n in agent_names if "weather" in n.lower()), "Weather Agent"
+    )
+
+    tasks = []
+    for clause in _CLAUSE_SPLIT_PATTERN.split(query):
+        clause = _LEADING_WORDS_PATTERN.sub("", clause.strip()).strip(" ,")
+        if not clause:
+            continue
+        if _WEATHER_PATTERN.search(clause):
+            agent, description = weather_agent, "Get weather information"
+        elif _MATH_PATTERN.search(clause):
+            agent, description = math_agent, "Perform the calculation"
+        else:
+            continue
+
+        dependencies = []
+        if tasks and _DEPENDENCY_PATTERN.search(clause):
+            dependencies = [tasks[-1]["order"]]
+        tasks.append(
+            {
+                "agent_name": agent,
+                "task_description": description,
+                "task_input": clause,
+                "order": len(tasks) + 1,
+                "dependencies": dependencies,
+            }
+        )
+
+    if not tasks:
+        return {
+            "status": "input_required",
+            "question": "Which calculation or weather question can I help with?",
+        }
+    return {
+        "status": "ready",
+        "plan": {"tasks": tasks, "summary": f"Stub plan with {len(tasks)} task(s)"},
+    }
+
+
+class StubChatModel(BaseChatModel):
+    """Offline chat model with rule-based answers and simulated latency.
+
+    Covers what the agents in this repo ask of a model: tool calls for the
+    weather tools, arithmetic for the math agent, execution plans for the
+    orchestrator and the matching structured responses. Selected with a model
+    name of the form `stub[:mean_latency[:distribution]]`.
+    """
+
+    latency_mean: float = 0.0
+    latency_distribution: str = "constant"
+    latency_spread: float = 0.5
+    seed: Optional[int] = None
+
+    _latency: LatencyModel = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        self._latency = LatencyModel(
+            self.latency_mean, self.latency_distribution, self.latency_spread, self.seed
+        )
+
+    @property
+    def _llm_type(self) -> str:
+        return STUB_PREFIX
+
+    def _respond(
+        self, messages: Sequence[BaseMessage], tools: Sequence[Dict[str, Any]]
+    ) -> AIMessage:
+        tool_names = {tool["function"]["name"] for tool in tools}
+        last = messages[-1] if messages else None
+
+        if isinstance(last, ToolMessage):
+            return AIMessage(content=_text(last))
+
+        request = _request_text(messages)
+        if "get_weather" in tool_names:
+            return AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": "get_weather",
+                        "args": {"location": _extract_location(request)},
+                        "id": f"call_{uuid.uuid4().hex[:12]}",
+                    }
+                ],
+            )
+        if tool_names & {"add", "multiply", "power"}:
+            return AIMessage(content=_solve_math(request))
+
+        agent_names = _agent_names(messages)
+        if agent_names:
+            return AIMessage(content=json.dumps(build_plan(request, agent_names)))
+        return AIMessage(content=request)
+
+    def _structured(self, schema: type, messages: Sequence[BaseMessage]) -> BaseModel:
+        fields = schema.model_fields
+        answer = _last(messages, AIMessage)
+        answer_text = _text(answer) if answer else ""
+
+        if "plan" in fields:
+            try:
+                return schema.model_validate(json.loads(answer_text))
+            except ValueError:
+                return schema.model_validate(build_plan(_request_text(messages), []))
+        if "math_output" in fields:
+            answer_text = answer_text or _solve_math(_request_text(messages))
+            return schema(math_output=answer_text)
+        if "weather_output" in fields:
+            return schema(weather_output=answer_text)
+        raise ValueError(f"Stub model has no rule for {schema.__name__}")
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self._latency.sample())
+        message = self._respond(messages, kwargs.get("tools", []))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self._latency.sample())
+        message = self._respond(messages, kwargs.get("tools", []))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools])
+
+    def with_structured_output(self, schema: Any, **kwargs: Any):
+        def respond(value: Any) -> BaseModel:
+            time.sleep(self._latency.sample())
+            return self._structured(schema, self._convert_input(value).to_messages())
+
+        async def arespond(value: Any) -> BaseModel:
+            await asyncio.sleep(self._latency.sample())
+            return self._structured(schema, self._convert_input(value).to_messages())
+
+        return RunnableLambda(respond, afunc=arespond)
+
+
+def create_stub_model(
+    model_name: str,
+    latency: float = 0.0,
+    distribution: str = "constant",
+    spread: float = 0.5,
+    seed: Optional[int] = None,
+) -> StubChatModel:
+    """Build a stub model; `stub:0.2:lognormal` overrides latency and distribution."""
+    parts = model_name.split(":")
+    if len(parts) > 1 and parts[1]:
+        latency = float(parts[1])
+    if len(parts) > 2 and parts[2]:
+        distribution = parts[2]
+    return StubChatModel(
+        latency_mean=latency,
+        latency_distribution=distribution,
+        latency_spread=spread,
+        seed=seed,
+    )
@@ -0,0 +1,409 @@
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler
+
+from logger import logger
+from settings import settings
+
+
+TRACEPARENT_KEY = "traceparent"
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class SpanContext:
+    """The part of a span that crosses process boundaries."""
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+    def to_traceparent(self) -> str:
+        """Encode as a W3C `traceparent` header value."""
+        flags = "01" if self.sampled else "00"
+        return f"00-{self.trace_id}-{self.span_id}-{flags}"
+
+    @classmethod
+    def from_traceparent(cls, value: Any) -> Optional["SpanContext"]:
+        if not isinstance(value, str):
+            return None
+        parts = value.split("-")
+        if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+            return None
+        return cls(parts[1], parts[2], parts[3] == "01")
+
+
+class Span:
+    """A timed operation within a trace.
+
+    Unsampled spans still carry the trace id, so a sampling decision made at
+    the root is honoured downstream, but they are never exported.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent_id: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def trace_id(self) -> str:
+        return self.context.trace_id
+
+    @property
+    def sampled(self) -> bool:
+        return self.context.sampled
+
+    def set_attribute(self, key: str, value: Any):
+        if self.sampled:
+            self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any):
+        if self.sampled:
+            self.attributes.update(attributes)
+
+    def record_error(self, error: BaseException):
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+            "pid": os.getpid(),
+        }
+
+
+class SpanExporter:
+    """Receives finished, sampled spans in batches."""
+
+    def export(self, spans: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Appends spans to a JSON-lines file, one span per line.
+
+    Each batch is written with a single append so that worker processes can
+    share the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: List[Dict[str, Any]]):
+        lines = "".join(json.dumps(span, default=str) + "\n" for span in spans)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class Tracer:
+    """Creates spans, makes head-based sampling decisions and batches exports.
+
+    A trace is sampled at its root with probability `sample_rate`; spans
+    joining a trace from another process follow the sampling flag they
+    received. Finished spans are buffered and a background thread exports
+    them once `batch_size` have accumulated or every `flush_interval` seconds,
+    so ending a span never waits on the exporter's I/O.
+    """
+
+    def __init__(
+        self,
+        exporter: Optional[SpanExporter] = None,
+        sample_rate: float = 1.0,
+        batch_size: int = 64,
+        flush_interval: float = 1.0,
+    ):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._batch_ready = threading.Event()
+        self._closed = threading.Event()
+        self._export_thread: Optional[threading.Thread] = None
+
+        self.spans_started = 0
+        self.spans_exported = 0
+        self.export_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def _sample(self) -> bool:
+        return self.enabled and random.random() < self.sample_rate
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[SpanContext] = None,
+        **attributes: Any,
+    ) -> Span:
+        """Start a span without making it current; call `end_span` when done.
+
+        The parent defaults to the current span; without one a new trace starts.
+        """
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+
+        span_id = uuid.uuid4().hex[:16]
+        if parent is not None:
+            context = SpanContext(parent.trace_id, span_id, parent.sampled)
+            parent_id = parent.span_id
+        else:
+            context = SpanContext(uuid.uuid4().hex, span_id, self._sample())
+            parent_id = None
+
+        if not context.sampled:
+            return Span(name, context, parent_id)
+        self.spans_started += 1
+        return Span(name, context, parent_id, attributes)
+
+    def end_span(self, span: Span):
+        if span.duration is not None:
+            return
+        span.duration = time.perf_counter() - span._started
+        if span.sampled and self.enabled:
+            self._enqueue(span.to_dict())
+
+    @contextmanager
+    def span(
+        self, name: str, parent: Optional[SpanContext] = None, **attributes: Any
+    ) -> Iterator[Span]:
+        """Run the body inside a new span that is current for its duration.
+
+        Only use this around code that runs in a single task; async generators
+        should use `start_span` and `end_span` instead.
+        """
+        span = self.start_span(name, parent, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+    def _enqueue(self, record: Dict[str, Any]):
+        with self._lock:
+            self._buffer.append(record)
+            full = len(self._buffer) >= self.batch_size
+            if self._export_thread is None and not self._closed.is_set():
+                self._export_thread = threading.Thread(
+                    target=self._export_loop, name="span-exporter", daemon=True
+                )
+                self._export_thread.start()
+        if full:
+            self._batch_ready.set()
+
+    def _export_loop(self):
+        while not self._closed.is_set():
+            self._batch_ready.wait(self.flush_interval)
+            self._batch_ready.clear()
+            self.flush()
+
+    def flush(self):
+        """Export every buffered span."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch or self.exporter is None:
+            return
+        try:
+            self.exporter.export(batch)
+            self.spans_exported += len(batch)
+        except Exception as e:
+            self.export_errors += 1
+            logger.warning("Dropped %s spans: %s", len(batch), e)
+
+    def close(self):
+        """Stop the export thread and export what is left."""
+        self._closed.set()
+        self._batch_ready.set()
+        if self._export_thread is not None:
+            self._export_thread.join()
+            self._export_thread = None
+        self.flush()
+        if self.exporter is not None:
+            self.exporter.close()
+
+    def callbacks(self) -> List["TracingCallbackHandler"]:
+        """LangChain callbacks that trace model and tool calls, if sampled."""
+        current = _current_span.get()
+        if current is None or not current.sampled:
+            return []
+        return [TracingCallbackHandler(self, current.context)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "spans_started": self.spans_started,
+            "spans_exported": self.spans_exported,
+            "buffered": len(self._buffer),
+            "export_errors": self.export_errors,
+        }
+
+
+class TracingCallbackHandler(AsyncCallbackHandler):
+    """Records a span for every LLM and tool call of one agent run."""
+
+    def __init__(self, tracer: Tracer, parent: SpanContext):
+        self.tracer = tracer
+        self.parent = parent
+        self._spans: Dict[UUID, Span] = {}
+
+    def _start(self, run_id: UUID, name: str, **attributes: Any):
+        self._spans[run_id] = self.tracer.start_span(name, self.parent, **attributes)
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None):
+        span = self._spans.pop(run_id, None)
+        if span is not None:
+            if error is not None:
+                span.record_error(error)
+            self.tracer.end_span(span)
+
+    async def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[Any]],
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ):
+        model = (kwargs.get("metadata") or {}).get("ls_model_name")
+        self._start(
+            run_id, "llm.call", model=model, messages=sum(len(m) for m in messages)
+        )
+
+    async def on_llm_start(
+        self,
+        serialized: Dict[str, Any],
+        prompts: List[str],
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ):
+        model = (kwargs.get("metadata") or {}).get("ls_model_name")
+        self._start(run_id, "llm.call", model=model, prompts=len(prompts))
+
+    async def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any):
+        span = self._spans.get(run_id)
+        if span is not None:
+            span.set_attributes(**token_usage(response))
+        self._end(run_id)
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        self._end(run_id, error)
+
+    async def on_tool_start(
+        self,
+        serialized: Dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ):
+        self._start(run_id, "tool.call", tool=(serialized or {}).get("name"))
+
+    async def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any):
+        self._end(run_id)
+
+    async def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        self._end(run_id, error)
+
+
+def token_usage(response: Any) -> Dict[str, int]:
+    """Token counts from an LLMResult, whichever way the provider reports them."""
+    for generations in getattr(response, "generations", None) or []:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return {
+                    "input_tokens": usage.get("input_tokens", 0),
+                    "output_tokens": usage.get("output_tokens", 0),
+                    "total_tokens": usage.get("total_tokens", 0),
+                }
+    usage = (getattr(response, "llm_output", None) or {}).get("token_usage") or {}
+    if usage:
+        return {
+            "input_tokens": usage.get("prompt_tokens", 0),
+            "output_tokens": usage.get("completion_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0),
+        }
+    return {}
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def inject(span: Optional[Span] = None) -> Dict[str, str]:
+    """Message metadata that continues the trace of `span` (or the current one)."""
+    span = span or _current_span.get()
+    if span is None:
+        return {}
+    return {TRACEPARENT_KEY: span.context.to_traceparent()}
+
+
+def extract(metadata: Optional[Dict[str, Any]]) -> Optional[SpanContext]:
+    """The trace context a caller propagated in message metadata, if any."""
+    if not metadata:
+        return None
+    return SpanContext.from_traceparent(metadata.get(TRACEPARENT_KEY))
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer, configured from settings on first use."""
+    global _tracer
+    if _tracer is None:
+        exporter = None
+        if settings.TRACING_ENABLED:
+            path = settings.TRACE_FILE or os.path.join(settings.LOG_DIR, "traces.jsonl")
+            exporter = JsonlSpanExporter(path)
+        _tracer = Tracer(
+            exporter,
+            sample_rate=settings.TRACE_SAMPLE_RATE,
+            batch_size=settings.TRACE_EXPORT_BATCH_SIZE,
+        )
+    return _tracer
@@ -16,7 +16,7 @@ async def get_weather(location: str) -> str:
         Weather information as a string
     """
     try:
-        logger.info(f"Getting weather for: {location}")
+        logger.info("Getting weather for: %s", location)
 
         # Simple mock weather response - replace with real API call if needed
         weather_responses = {
@@ -44,11 +44,11 @@ async def get_weather(location: str) -> str:
                 weather_info = f"Current weather in {location}: Partly cloudy, 20°C (68°F), moderate conditions"
 
         result = f"Weather for {location}: {weather_info}"
-        logger.info(f"Returning weather: {result}")
+        logger.info("Returning weather: %s", result)
         return result
 
     except Exception as e:
-        logger.error(f"Error getting weather for {location}: {e}")
+        logger.error("Error getting weather for %s: %s", location, e)
         return f"Sorry, I couldn't get weather information for {location}. Please try again."
 
 
@@ -64,7 +64,7 @@ async def get_forecast(location: str, days: int = 3) -> str:
         Weather forecast as a string
     """
     try:
-        logger.info(f"Getting {days}-day forecast for: {location}")
+        logger.info("Getting %s-day forecast for: %s", days, location)
 
         if days < 1 or days > 7:
             return "Forecast available for 1-7 days only"
@@ -101,11 +101,11 @@ async def get_forecast(location: str, days: int = 3) -> str:
             )
 
         result = "\n".join(forecast_lines)
-        logger.info(f"Returning forecast: {result}")
+        logger.info("Returning forecast: %s", result)
         return result
 
     except Exception as e:
-        logger.error(f"Error getting forecast for {location}: {e}")
+        logger.error("Error getting forecast for %s: %s", location, e)
         return f"Sorry, I couldn't get forecast information for {location}. Please try again."
 
 
@@ -0,0 +1,290 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import anyio
+from langchain_core.tools import BaseTool, StructuredTool, ToolException
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp import ClientSession
+from logger import logger
+
+
+def _server_identity(connection: Dict[str, Any]) -> tuple:
+    """What a server connection launches or connects to, launcher aside.
+
+    `uv run python -m server` and `python -m server` start the same server, so
+    both map to ("stdio", "python", "-m", "server").
+    """
+    transport = connection.get("transport", "stdio")
+    if transport != "stdio":
+        return (transport, connection.get("url"))
+    command = [os.path.basename(connection.get("command", ""))]
+    command += connection.get("args", [])
+    if command[0] == "uv" and command[1:2] == ["run"]:
+        command = command[2:]
+    return (transport, *command)
+
+
+class _PooledSession:
+    """A long-lived MCP session owned by its own background task.
+
+    The session's transport (e.g. a stdio subprocess) is entered and exited
+    inside the same task, which is what anyio requires, so it can be stopped or
+    restarted from anywhere.
+    """
+
+    def __init__(self, client: MultiServerMCPClient, server_name: str):
+        self.client = client
+        self.server_name = server_name
+        self.session: Optional[ClientSession] = None
+        self.error: Optional[BaseException] = None
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self._task is not None and not self._task.done() and self.session is not None
+        )
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+        await self._ready.wait()
+        if self.error:
+            raise self.error
+
+    async def _run(self):
+        try:
+            async with self.client.session(self.server_name) as session:
+                self.session = session
+                self._ready.set()
+                await self._stop.wait()
+        except Exception as e:
+            self.error = e
+            logger.warning("MCP session to %s ended: %r", self.server_name, e)
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout=timeout)
+            except (asyncio.TimeoutError, Exception):
+                self._task.cancel()
+
+
+class MCPSessionPool:
+    """Fixed-size pool of long-lived sessions to one MCP server."""
+
+    def __init__(self, client: MultiServerMCPClient, server_name: str, size: int = 2):
+        self.client = client
+        self.server_name = server_name
+        self.size = max(1, size)
+        self.sessions: List[_PooledSession] = []
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self.restarts = 0
+
+    async def _open_session(self) -> _PooledSession:
+        pooled = _PooledSession(self.client, self.server_name)
+        await pooled.start()
+        return pooled
+
+    async def start(self, size: Optional[int] = None):
+        """Open sessions until the pool holds `size` (default: the pool size)."""
+        missing = (size or self.size) - len(self.sessions)
+        if missing <= 0:
+            return
+        opened = await asyncio.gather(*[self._open_session() for _ in range(missing)])
+        for pooled in opened:
+            self.sessions.append(pooled)
+            self._idle.put_nowait(pooled)
+
+    async def _restart(self, pooled: _PooledSession) -> _PooledSession:
+        logger.info("Restarting MCP session to %s", self.server_name)
+        await pooled.stop()
+        replacement = await self._open_session()
+        self.sessions[self.sessions.index(pooled)] = replacement
+        self.restarts += 1
+        return replacement
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[ClientSession]:
+        """Borrow a live session, restarting it first if it has died."""
+        pooled = await self._idle.get()
+        try:
+            if not pooled.alive:
+                pooled = await self._restart(pooled)
+            try:
+                yield pooled.session
+            except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                pooled = await self._restart(pooled)
+                raise
+            except Exception:
+                if not pooled.alive:
+                    pooled = await self._restart(pooled)
+                raise
+        finally:
+            self._idle.put_nowait(pooled)
+
+    async def health_check(self, timeout: float = 5.0):
+        """Ping the idle sessions and restart the ones that do not answer.
+
+        Sessions are taken out of the pool one at a time, so tool calls can
+        borrow the others while a ping is pending.
+        """
+        for _ in range(self._idle.qsize()):
+            try:
+                pooled = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            try:
+                if not pooled.alive:
+                    raise ConnectionError("session is not running")
+                await asyncio.wait_for(pooled.session.send_ping(), timeout=timeout)
+            except Exception as e:
+                logger.warning("MCP session to %s failed ping: %r", self.server_name, e)
+                try:
+                    pooled = await self._restart(pooled)
+                except Exception as restart_error:
+                    logger.error(
+                        "Could not restart MCP session to %s: %r",
+                        self.server_name,
+                        restart_error,
+                    )
+            finally:
+                self._idle.put_nowait(pooled)
+
+    async def close(self):
+        """Stop every session in the pool."""
+        await asyncio.gather(*[pooled.stop() for pooled in self.sessions])
+        self.sessions.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self.sessions),
+            "idle": self._idle.qsize(),
+            "alive": sum(1 for pooled in self.sessions if pooled.alive),
+            "restarts": self.restarts,
+        }
+
+
+class MCPToolPool:
+    """Exposes the tools of every configured MCP server over pooled sessions.
+
+    Servers that launch the same command as an earlier server in the config
+    (for example the same server launched through `uv`) are skipped without
+    being started, as are servers whose tools are all provided already.
+    """
+
+    def __init__(
+        self,
+        connections: Dict[str, Dict[str, Any]],
+        pool_size: int = 2,
+        health_check_interval: float = 30.0,
+    ):
+        self.connections = connections
+        self.client = MultiServerMCPClient(connections)
+        self.pool_size = pool_size
+        self.health_check_interval = health_check_interval
+        self.pools: Dict[str, MCPSessionPool] = {}
+        self._health_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> List[BaseTool]:
+        """Open the session pools and return the de-duplicated pooled tools."""
+        tools: List[BaseTool] = []
+        provided = set()
+        launched: Dict[tuple, str] = {}
+
+        for server_name, connection in self.connections.items():
+            identity = _server_identity(connection)
+            if identity in launched:
+                logger.info(
+                    "Skipping MCP server %s: it runs the same server as %s",
+                    server_name,
+                    launched[identity],
+                )
+                continue
+            launched[identity] = server_name
+
+            pool = MCPSessionPool(self.client, server_name, self.pool_size)
+            try:
+                # Probe with a single session before committing to a full pool
+                await pool.start(size=1)
+                async with pool.acquire() as session:
+                    server_tools = await load_mcp_tools(session)
+            except Exception as e:
+                logger.error("Failed to start MCP server %s: %r", server_name, e)
+                await pool.close()
+                continue
+
+            new_tools = [tool for tool in server_tools if tool.name not in provided]
+            if not new_tools:
+                logger.info(
+                    "Skipping MCP server %s: its tools are already provided",
+                    server_name,
+                )
+                await pool.close()
+                continue
+
+            await pool.start()
+            self.pools[server_name] = pool
+            provided.update(tool.name for tool in new_tools)
+            tools.extend(self._pooled_tool(pool, tool) for tool in new_tools)
+            logger.info(
+                "MCP server %s: %s tools over %s pooled sessions",
+                server_name,
+                len(new_tools),
+                pool.size,
+            )
+
+        if self.health_check_interval > 0 and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+        return tools
+
+    def _pooled_tool(self, pool: MCPSessionPool, tool: BaseTool) -> BaseTool:
+        async def call_tool(**arguments: Any) -> str:
+            # A session that died mid-call is restarted by the pool; retry once
+            for attempt in range(2):
+                try:
+                    async with pool.acquire() as session:
+                        result = await session.call_tool(tool.name, arguments)
+                    break
+                except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                    if attempt:
+                        raise
+
+            text = "\n".join(
+                content.text for content in result.content if content.type == "text"
+            )
+            if result.isError:
+                raise ToolException(text)
+            return text
+
+        return StructuredTool(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            coroutine=call_tool,
+        )
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            for pool in list(self.pools.values()):
+                await pool.health_check()
+
+    async def close(self):
+        """Stop health checks and every pooled session."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        await asyncio.gather(*[pool.close() for pool in self.pools.values()])
+        self.pools.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {name: pool.get_stats() for name, pool in self.pools.items()}
@@ -1,51 +1,122 @@
 import asyncio
+import multiprocessing
 import signal
+import socket
 import sys
-import threading
-from typing import Dict, Any
-from concurrent.futures import ThreadPoolExecutor
+import time
+from typing import Dict, Any, List, Optional
+
+import httpx
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
 
 from a2a_server.agents.math_agent_server import MathAgentServer
 from a2a_server.agents.weather_agent_server import WeatherAgentServer
 from a2a_server.agents.orchestrator_agent_server import OrchestratorServer
 from logger import logger
+from settings import settings
+
+# Workers that stay up this long are considered healthy again, which resets
+# their restart backoff
+STABLE_WORKER_SECONDS = 30.0
+
+spawn = multiprocessing.get_context("spawn")
+
+
+def _run_worker(server_class, host: str, port: int, sockets: List[socket.socket]):
+    """Worker process entry point: serve the agent on the inherited socket."""
+    server = server_class(host=host, port=port)
+    server.run(sockets=sockets)
+
+
+class _Worker:
+    """One worker process of an agent server and its restart bookkeeping."""
+
+    def __init__(self, name: str, index: int):
+        self.name = name
+        self.index = index
+        self.process: Optional[multiprocessing.Process] = None
+        self.started_at = 0.0
+        self.failures = 0
+        self.restart_at: Optional[float] = None
 
 
 class A2AServerManager:
-    """Manages multiple A2A agent servers."""
+    """Supervises A2A agent servers, each running in its own worker processes.
+
+    The manager binds every listening socket itself and hands it to the
+    workers, so several workers of one agent share a port. Servers are started
+    in registration order and each one must answer its agent card endpoint
+    before the next is started. Crashed workers are restarted with exponential
+    backoff; on shutdown workers get SIGTERM to drain in-flight requests and are
+    killed only if they do not exit in time.
+    """
 
     def __init__(self):
         self.servers: Dict[str, Dict[str, Any]] = {}
         self.running = False
-        self.executor = ThreadPoolExecutor(max_workers=10)
 
-    def add_server(self, name: str, server_class, host: str, port: int):
+    def add_server(
+        self, name: str, server_class, host: str, port: int, workers: int = 1
+    ):
         """Add a server to the manager."""
         self.servers[name] = {
             "class": server_class,
             "host": host,
             "port": port,
-            "instance": None,
-            "thread": None,
+            "workers": [_Worker(name, i) for i in range(max(1, workers))],
+            "socket": None,
         }
 
-    def _run_server(self, name: str, server_config: Dict[str, Any]):
-        """Run a single server in a thread."""
-        try:
-            logger.info(
-                f"Starting {name} server on {server_config['host']}:{server_config['port']}"
-            )
-            server = server_config["class"](
-                host=server_config["host"], port=server_config["port"]
-            )
-            server_config["instance"] = server
-            server.run()
-        except Exception as e:
-            logger.error(f"Error running {name} server: {e}")
-            raise
+    def _bind_socket(self, host: str, port: int) -> socket.socket:
+        sock = socket.create_server((host, port), backlog=2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _spawn_worker(self, server_config: Dict[str, Any], worker: _Worker):
+        process = spawn.Process(
+            target=_run_worker,
+            args=(
+                server_config["class"],
+                server_config["host"],
+                server_config["port"],
+                [server_config["socket"]],
+            ),
+            name=f"{worker.name} worker {worker.index}",
+        )
+        process.start()
+        worker.process = process
+        worker.started_at = time.monotonic()
+        worker.restart_at = None
+        logger.info("Started %s (pid %s)", process.name, process.pid)
+
+    async def _wait_until_ready(self, name: str, server_config: Dict[str, Any]):
+        """Poll the agent card endpoint until the server answers."""
+        url = (
+            f"http://{server_config['host']}:{server_config['port']}"
+            f"{AGENT_CARD_WELL_KNOWN_PATH}"
+        )
+        deadline = time.monotonic() + settings.SERVER_READY_TIMEOUT
+
+        async with httpx.AsyncClient(timeout=2.0) as client:
+            while time.monotonic() < deadline:
+                workers = server_config["workers"]
+                if not any(w.process and w.process.is_alive() for w in workers):
+                    raise RuntimeError(f"{name} server exited during startup")
+                try:
+                    response = await client.get(url)
+                    if response.status_code == 200:
+                        logger.info("%s server is ready at %s", name, url)
+                        return
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.1)
+
+        raise TimeoutError(
+            f"{name} server not ready after {settings.SERVER_READY_TIMEOUT}s"
+        )
 
     async def start_all(self):
-        """Start all registered servers."""
+        """Start all registered servers, each once the previous one is ready."""
         if self.running:
             logger.warning("Servers are already running")
             return
@@ -53,26 +124,80 @@ class A2AServerManager:
         logger.info("Starting A2A Server Manager...")
         self.running = True
 
-        # Start all servers in separate threads
         for name, config in self.servers.items():
-            thread = threading.Thread(
-                target=self._run_server,
-                args=(name, config),
-                daemon=True,
-                name=f"{name}_server_thread",
+            logger.info(
+                "Starting %s server on %s:%s with %s worker(s)",
+                name,
+                config["host"],
+                config["port"],
+                len(config["workers"]),
             )
-            thread.start()
-            config["thread"] = thread
-
-        # Wait a bit for servers to start
-        await asyncio.sleep(2)
+            config["socket"] = self._bind_socket(config["host"], config["port"])
+            for worker in config["workers"]:
+                self._spawn_worker(config, worker)
+            await self._wait_until_ready(name, config)
 
         logger.info("All servers started successfully!")
 
+    def _supervise(self):
+        """Restart crashed workers, backing off on repeated failures."""
+        now = time.monotonic()
+        for config in self.servers.values():
+            for worker in config["workers"]:
+                process = worker.process
+                if process is None or process.is_alive():
+                    continue
+
+                if worker.restart_at is None:
+                    if now - worker.started_at >= STABLE_WORKER_SECONDS:
+                        worker.failures = 0
+                    delay = min(
+                        settings.SERVER_RESTART_BACKOFF_BASE * 2**worker.failures,
+                        settings.SERVER_RESTART_BACKOFF_MAX,
+                    )
+                    worker.failures += 1
+                    worker.restart_at = now + delay
+                    logger.warning(
+                        "%s exited with code %s, restarting in %.1fs",
+                        process.name,
+                        process.exitcode,
+                        delay,
+                    )
+                elif now >= worker.restart_at:
+                    self._spawn_worker(config, worker)
+
     def stop_all(self):
-        """Stop all servers."""
-        logger.info("Stopping all servers...")
+        """Stop all servers, letting workers drain before killing them."""
         self.running = False
+        processes = [
+            worker.process
+            for config in self.servers.values()
+            for worker in config["workers"]
+            if worker.process is not None
+        ]
+        if not processes:
+            return
+
+        logger.info("Stopping all servers...")
+        # Stop in reverse start order so the orchestrator drains first
+        for process in reversed(processes):
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + settings.SERVER_GRACEFUL_TIMEOUT + 5.0
+        for process in processes:
+            process.join(timeout=max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.warning("%s did not drain in time, killing it", process.name)
+                process.kill()
+                process.join()
+
+        for config in self.servers.values():
+            for worker in config["workers"]:
+                worker.process = None
+            if config["socket"] is not None:
+                config["socket"].close()
+                config["socket"] = None
 
     async def run_forever(self):
         """Run servers forever until interrupted."""
@@ -80,7 +205,8 @@ class A2AServerManager:
 
         try:
             while self.running:
-                await asyncio.sleep(1)
+                self._supervise()
+                await asyncio.sleep(0.5)
         except KeyboardInterrupt:
             logger.info("Received interrupt signal")
         finally:
@@ -91,9 +217,9 @@ def setup_signal_handlers(server_manager: A2AServerManager):
     """Setup signal handlers for graceful shutdown."""
 
     def signal_handler(signum, frame):
-        logger.info(f"Received signal {signum}")
-        server_manager.stop_all()
-        sys.exit(0)
+        logger.info("Received signal %s", signum)
+        # run_forever notices the flag and drains the workers
+        server_manager.running = False
 
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -102,12 +228,30 @@ def setup_signal_handlers(server_manager: A2AServerManager):
 async def main():
     """Main entry point."""
     server_manager = A2AServerManager()
+    workers = settings.SERVER_WORKERS
 
-    # Register all agent servers
-    server_manager.add_server("Math Agent", MathAgentServer, "localhost", 10004)
-    server_manager.add_server("Weather Agent", WeatherAgentServer, "localhost", 10005)
+    # Register all agent servers; the orchestrator goes last so the agents it
+    # discovers are already serving
+    server_manager.add_server(
+        "Math Agent",
+        MathAgentServer,
+        "localhost",
+        10004,
+        workers=workers.get("Math Agent", 1),
+    )
+    server_manager.add_server(
+        "Weather Agent",
+        WeatherAgentServer,
+        "localhost",
+        10005,
+        workers=workers.get("Weather Agent", 1),
+    )
     server_manager.add_server(
-        "Orchestrator Agent", OrchestratorServer, "localhost", 10003
+        "Orchestrator Agent",
+        OrchestratorServer,
+        "localhost",
+        10003,
+        workers=workers.get("Orchestrator Agent", 1),
     )
 
     # Setup signal handlers
@@ -119,7 +263,7 @@ async def main():
     except KeyboardInterrupt:
         logger.info("Shutting down...")
     except Exception as e:
-        logger.error(f"Server manager error: {e}")
+        logger.error("Server manager error: %s", e)
         raise
     finally:
         server_manager.stop_all()
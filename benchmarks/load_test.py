@@ -0,0 +1,344 @@
+"""Load generator for the full orchestrator pipeline.
+
+Starts the agent servers (unless `--no-start-servers`), replays a weighted
+query mix at each concurrency level and writes throughput, latency percentiles
+and a per-phase breakdown (planning, each task, formatting) to a JSON file.
+
+    python -m benchmarks.load_test --concurrency 1,4,16 --requests 100
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from a2a.types import Task as A2ATask, TaskState
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+
+from a2a_server.common.http_transport import close_shared_transport
+from a2a_server.common.remote_agent_connection import RemoteAgentConnection
+from logger import logger
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_QUERIES = Path(__file__).resolve().parent / "queries.jsonl"
+DEFAULT_RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def load_queries(path: Path) -> List[Tuple[str, float]]:
+    """Read `{"query": ..., "weight": ...}` lines; weight defaults to 1."""
+    queries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            queries.append((entry["query"], float(entry.get("weight", 1))))
+    if not queries:
+        raise ValueError(f"No queries found in {path}")
+    return queries
+
+
+def percentile(values: List[float], quantile: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(quantile * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 0.50),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "max": max(values),
+    }
+
+
+class Sample:
+    """Outcome of one request."""
+
+    def __init__(
+        self,
+        query: str,
+        latency: float,
+        ok: bool,
+        error: Optional[str] = None,
+        timings: Optional[Dict[str, Any]] = None,
+    ):
+        self.query = query
+        self.latency = latency
+        self.ok = ok
+        self.error = error
+        self.timings = timings or {}
+
+
+def _result_timings(task: A2ATask) -> Dict[str, Any]:
+    for artifact in reversed(task.artifacts or []):
+        if artifact.metadata and "timings" in artifact.metadata:
+            return artifact.metadata["timings"]
+    return {}
+
+
+async def run_query(connection: RemoteAgentConnection, query: str) -> Sample:
+    started = time.perf_counter()
+    try:
+        response = await connection.send_message(query)
+    except Exception as e:
+        return Sample(query, time.perf_counter() - started, False, repr(e))
+    latency = time.perf_counter() - started
+
+    root = response.root
+    if hasattr(root, "error"):
+        return Sample(query, latency, False, root.error.message)
+
+    result = root.result
+    if isinstance(result, A2ATask):
+        ok = result.status.state == TaskState.completed
+        error = None if ok else f"task {result.status.state.value}"
+        return Sample(query, latency, ok, error, _result_timings(result))
+    return Sample(query, latency, True)
+
+
+async def run_level(
+    connection: RemoteAgentConnection,
+    queries: List[Tuple[str, float]],
+    concurrency: int,
+    total_requests: int,
+    rng: random.Random,
+) -> Dict[str, Any]:
+    """Send `total_requests` queries with `concurrency` requests in flight."""
+    picks = rng.choices(
+        [query for query, _ in queries],
+        weights=[weight for _, weight in queries],
+        k=total_requests,
+    )
+    pending = iter(picks)
+    samples: List[Sample] = []
+
+    async def worker():
+        for query in pending:
+            samples.append(await run_query(connection, query))
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    wall_time = time.perf_counter() - started
+
+    succeeded = [s for s in samples if s.ok]
+    phases: Dict[str, List[float]] = defaultdict(list)
+    for sample in succeeded:
+        for phase in ("planning", "execution", "formatting"):
+            if phase in sample.timings:
+                phases[phase].append(sample.timings[phase])
+        for task in sample.timings.get("tasks", []):
+            phases[f"task:{task['agent']}"].append(task["duration"])
+
+    errors: Dict[str, int] = defaultdict(int)
+    for sample in samples:
+        if not sample.ok:
+            errors[sample.error] += 1
+
+    # Cached plans and results make repeated queries cheap; report how many
+    # requests they served so levels run with caches on can be compared
+    plan_hits = [
+        s.timings["plan_cache_hit"] for s in succeeded if "plan_cache_hit" in s.timings
+    ]
+    task_caches = [
+        task.get("cache") for s in succeeded for task in s.timings.get("tasks", [])
+    ]
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "succeeded": len(succeeded),
+        "failed": len(samples) - len(succeeded),
+        "wall_time": wall_time,
+        "throughput": len(succeeded) / wall_time if wall_time else 0.0,
+        "latency": summarize([s.latency for s in succeeded]),
+        "phases": {name: summarize(values) for name, values in sorted(phases.items())},
+        "errors": dict(errors),
+        "cache": {
+            "plan_hit_ratio": sum(plan_hits) / len(plan_hits) if plan_hits else 0.0,
+            "result_hit_ratio": (
+                sum(cache in ("hit", "coalesced") for cache in task_caches)
+                / len(task_caches)
+                if task_caches
+                else 0.0
+            ),
+        },
+    }
+
+
+def start_servers(model: Optional[str], caches: bool = False) -> subprocess.Popen:
+    """Launch the server manager with the benchmark's model and cache settings."""
+    env = dict(os.environ)
+    if model:
+        env["LLM_MODEL_OVERRIDE"] = model
+    if not caches:
+        env["PLAN_CACHE_ENABLED"] = "false"
+        env["RESULT_CACHE_ENABLED"] = "false"
+    return subprocess.Popen(
+        [sys.executable, "a2a_server_manager.py"], cwd=REPO_ROOT, env=env
+    )
+
+
+def stop_servers(process: subprocess.Popen, timeout: float = 30.0):
+    process.terminate()
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+async def wait_for_server(
+    url: str, timeout: float, process: Optional[subprocess.Popen] = None
+):
+    """Poll the agent card endpoint until the server answers."""
+    card_url = url.rstrip("/") + AGENT_CARD_WELL_KNOWN_PATH
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(timeout=2.0) as client:
+        while time.monotonic() < deadline:
+            if process is not None and process.poll() is not None:
+                raise RuntimeError(f"Servers exited with code {process.returncode}")
+            try:
+                if (await client.get(card_url)).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=Path, default=DEFAULT_QUERIES)
+    parser.add_argument(
+        "--concurrency",
+        default="1,4,16",
+        help="Comma-separated concurrency levels to sweep",
+    )
+    parser.add_argument(
+        "--requests", type=int, default=50, help="Requests per concurrency level"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=3, help="Unmeasured requests before the sweep"
+    )
+    parser.add_argument("--orchestrator-url", default="http://localhost:10003")
+    parser.add_argument(
+        "--model",
+        default="stub",
+        help="Model every agent uses (sets LLM_MODEL_OVERRIDE for the servers); "
+        "the default offline stub needs no API keys, pass '' for each agent's own",
+    )
+    parser.add_argument(
+        "--caches",
+        action="store_true",
+        help="Keep the plan and result caches on in the servers the benchmark "
+        "starts; by default they are off so repeated queries do the full work",
+    )
+    parser.add_argument(
+        "--no-start-servers",
+        dest="start_servers",
+        action="store_false",
+        help="Benchmark servers that are already running",
+    )
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None)
+    return parser.parse_args(argv)
+
+
+async def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    started_at = datetime.now(timezone.utc).isoformat()
+    queries = load_queries(args.queries)
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    rng = random.Random(args.seed)
+
+    servers = start_servers(args.model, args.caches) if args.start_servers else None
+    try:
+        await wait_for_server(args.orchestrator_url, args.startup_timeout, servers)
+        connection = await RemoteAgentConnection.create_from_url(args.orchestrator_url)
+
+        for query, _ in queries[: args.warmup]:
+            await run_query(connection, query)
+
+        results = []
+        for concurrency in levels:
+            logger.info(
+                "Running %s requests at concurrency %s", args.requests, concurrency
+            )
+            level = await run_level(
+                connection, queries, concurrency, args.requests, rng
+            )
+            latency = level["latency"]
+            logger.info(
+                "concurrency=%s throughput=%.2f/s p50=%.3fs p95=%.3fs p99=%.3fs "
+                "failed=%s plan_cache_hits=%.0f%% result_cache_hits=%.0f%%",
+                concurrency,
+                level["throughput"],
+                latency.get("p50", 0),
+                latency.get("p95", 0),
+                latency.get("p99", 0),
+                level["failed"],
+                level["cache"]["plan_hit_ratio"] * 100,
+                level["cache"]["result_hit_ratio"] * 100,
+            )
+            results.append(level)
+    finally:
+        await close_shared_transport()
+        if servers is not None:
+            stop_servers(servers)
+
+    report = {
+        "started_at": started_at,
+        "config": {
+            "queries": str(args.queries),
+            "requests_per_level": args.requests,
+            "warmup": args.warmup,
+            "model": args.model,
+            "seed": args.seed,
+            # Unknown for servers the benchmark did not start
+            "caches": args.caches if args.start_servers else None,
+            "orchestrator_url": args.orchestrator_url,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "levels": results,
+    }
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = DEFAULT_RESULTS_DIR / f"load_test-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    logger.info("Results written to %s", output)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("Benchmark interrupted")
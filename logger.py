@@ -1,23 +1,114 @@
 # logger.py (Modified)
+import atexit
+import json
 import logging
+import logging.handlers
+import multiprocessing
 import os
+import queue
+import re
 import sys
 from settings import settings
 
+
+def _log_file_name() -> str:
+    """One log file per process, so no two processes rotate the same file.
+
+    The server manager's spawned workers are named after their agent and
+    index (e.g. "Math Agent worker 0" -> app-math-agent-worker-0.log); a
+    restarted worker takes over its predecessor's file.
+    """
+    process = multiprocessing.current_process()
+    if multiprocessing.parent_process() is None:
+        return "app.log"
+    slug = re.sub(r"[^a-z0-9]+", "-", process.name.lower()).strip("-")
+    return f"app-{slug or os.getpid()}.log"
+
+
 LOG_DIR = settings.LOG_DIR or "logs"
 os.makedirs(LOG_DIR, exist_ok=True)
-LOG_FILE = os.path.join(LOG_DIR, "app.log")
+LOG_FILE = os.path.join(LOG_DIR, _log_file_name())
+LOG_FORMAT = "%(asctime)s [%(levelname)s]: %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "process": record.process,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _file_handler() -> logging.Handler:
+    if settings.LOG_ROTATION == "size":
+        return logging.handlers.RotatingFileHandler(
+            LOG_FILE,
+            maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+    if settings.LOG_ROTATION == "time":
+        return logging.handlers.TimedRotatingFileHandler(
+            LOG_FILE,
+            when=settings.LOG_ROTATE_WHEN,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding="utf-8",
+        )
+    return logging.FileHandler(LOG_FILE, encoding="utf-8")
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route all logging through a queue; a background thread does the I/O.
+
+    Callers only format the record and enqueue it, so logging never blocks the
+    event loop on file or terminal writes.
+    """
+    formatter = JsonFormatter() if settings.LOG_JSON else logging.Formatter(LOG_FORMAT)
+    handlers = [_file_handler(), logging.StreamHandler(sys.stdout)]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DroppingQueueHandler(log_queue))
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    listener.start()
+    # Flush what is still queued when the process exits
+    atexit.register(listener.stop)
+    return listener
+
 
-stream_handler = logging.StreamHandler(sys.stdout)
-stream_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s]: %(message)s"))
+def debug_enabled() -> bool:
+    """Whether debug output (including LangGraph's step traces) is wanted."""
+    return logger.isEnabledFor(logging.DEBUG)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s]: %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding='utf-8'),
-        stream_handler
-    ],
-)
 
-logger = logging.getLogger(__name__)
\ No newline at end of file
+listener = setup_logging()
+logger = logging.getLogger(__name__)
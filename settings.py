@@ -1,12 +1,148 @@
+from typing import Dict, List, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
-    OPENAI_API_KEY: str
-    OPENAI_BASE_URL: str
-    GOOGLE_API_KEY: str
+    # Only needed by agents that run on the corresponding provider
+    OPENAI_API_KEY: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None
+    GOOGLE_API_KEY: Optional[str] = None
     LOG_DIR: str = "logs"
 
+    # Logging; LOG_ROTATION is "size", "time" or "none"
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = False
+    LOG_ROTATION: str = "size"
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT: int = 5
+    LOG_ROTATE_WHEN: str = "midnight"
+    LOG_QUEUE_SIZE: int = 10000
+
+    # Use this model for every agent instead of each agent's own choice
+    LLM_MODEL_OVERRIDE: str = ""
+
+    # Offline stub model ("stub" or "stub:<mean latency>:<distribution>")
+    STUB_LLM_LATENCY: float = 0.0
+    STUB_LLM_LATENCY_DISTRIBUTION: str = "constant"
+    STUB_LLM_LATENCY_SPREAD: float = 0.5
+    STUB_LLM_SEED: Optional[int] = None
+
+    # Orchestrator concurrency limits
+    GLOBAL_MAX_IN_FLIGHT: int = 64
+    AGENT_MAX_IN_FLIGHT: int = 8
+    AGENT_CONCURRENCY_LIMITS: Dict[str, int] = {}
+
+    # Shared HTTP transport for remote agent connections
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 100
+    HTTP_MAX_KEEPALIVE_PER_HOST: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 600.0
+    HTTP_TOTAL_TIMEOUT: float = 600.0
+    HTTP2_ENABLED: bool = False
+
+    # Remote agent discovery
+    AGENT_DISCOVERY_TIMEOUT: float = 10.0
+    AGENT_CARD_CACHE_DIR: str = ".cache/agent_cards"
+    AGENT_CARD_CACHE_TTL: float = 300.0
+    EAGER_AGENT_WARMUP: bool = False
+
+    # Orchestrator plan cache
+    PLAN_CACHE_ENABLED: bool = True
+    PLAN_CACHE_MAX_ENTRIES: int = 512
+    PLAN_CACHE_TTL: float = 600.0
+    PLAN_CACHE_TEMPLATES: bool = True
+
+    # Conversation memory ("memory", "bounded" or "sqlite")
+    CHECKPOINTER_BACKEND: str = "bounded"
+    MEMORY_MAX_THREADS: int = 1000
+    MEMORY_MAX_CHECKPOINTS_PER_THREAD: int = 2
+    MEMORY_THREAD_TTL: float = 3600.0
+    MEMORY_MAX_MESSAGES: int = 40
+    SQLITE_CHECKPOINT_DIR: str = ".cache/checkpoints"
+    SQLITE_COMMIT_INTERVAL: float = 0.05
+    SQLITE_COMMIT_BATCH_SIZE: int = 64
+    SQLITE_MAX_THREADS: int = 100000
+    SQLITE_THREAD_TTL: float = 604800.0
+    SQLITE_PRUNE_INTERVAL: float = 60.0
+
+    # Math agent
+    MATH_FAST_PATH_ENABLED: bool = True
+
+    # MCP session pool
+    MCP_POOL_SIZE: int = 2
+    MCP_HEALTH_CHECK_INTERVAL: float = 30.0
+
+    # Server supervisor
+    SERVER_WORKERS: Dict[str, int] = {}
+    SERVER_READY_TIMEOUT: float = 30.0
+    SERVER_GRACEFUL_TIMEOUT: float = 10.0
+    SERVER_RESTART_BACKOFF_BASE: float = 1.0
+    SERVER_RESTART_BACKOFF_MAX: float = 30.0
+
+    # Remote agents and replica load balancing
+    REMOTE_AGENT_URLS: List[str] = ["http://localhost:10004", "http://localhost:10005"]
+    REPLICA_STRATEGY: str = "least_outstanding"
+    REPLICA_EWMA_ALPHA: float = 0.2
+    REPLICA_ERROR_THRESHOLD: float = 0.5
+    REPLICA_SLOW_FACTOR: float = 3.0
+    REPLICA_EJECTION_TIME: float = 30.0
+    REPLICA_MIN_SAMPLES: int = 5
+
+    # Remote call deadlines, retries, hedging and cancellation
+    REQUEST_BUDGET: float = 300.0
+    TASK_MAX_RETRIES: int = 2
+    RETRY_BACKOFF_BASE: float = 0.2
+    RETRY_BACKOFF_MAX: float = 2.0
+    HEDGING_ENABLED: bool = False
+    HEDGE_QUANTILE: float = 0.95
+    HEDGE_MIN_DELAY: float = 0.05
+    REMOTE_CANCEL_TIMEOUT: float = 5.0
+
+    # Execute plan tasks as the planner streams them instead of after the
+    # whole plan has been generated
+    INCREMENTAL_PLANNING: bool = False
+
+    # Queries from one batch request that are processed at a time
+    BATCH_MAX_CONCURRENCY: int = 32
+
+    # Skill router: confident single-agent queries skip planning; a sample of
+    # routed queries is re-planned in the background to measure accuracy
+    SKILL_ROUTER_ENABLED: bool = False
+    SKILL_ROUTER_MIN_CONFIDENCE: float = 0.9
+    SKILL_ROUTER_MIN_SCORE: float = 1.0
+    SKILL_ROUTER_MIN_COVERAGE: float = 0.6
+    SKILL_ROUTER_SHADOW_RATE: float = 0.05
+
+    # Speculative execution: start dependent tasks early on a predicted result
+    # (a result cache hit, or a fast path answer for the listed agents)
+    SPECULATIVE_EXECUTION: bool = False
+    SPECULATION_FAST_PATH_AGENTS: List[str] = ["Math Agent"]
+
+    # Circuit breaker per remote agent connection
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RECOVERY_TIMEOUT: float = 30.0
+    CIRCUIT_HALF_OPEN_MAX_CALLS: int = 1
+
+    # Remote task result cache; agents without a positive TTL are not cached
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    RESULT_CACHE_DEFAULT_TTL: float = 0.0
+    RESULT_CACHE_AGENT_TTLS: Dict[str, float] = {
+        "Math Agent": 3600.0,
+        "Weather Agent": 300.0,
+    }
+
+    # Prometheus-style /metrics endpoint on every agent server
+    METRICS_ENABLED: bool = True
+
+    # Request tracing; spans go to TRACE_FILE (default: <LOG_DIR>/traces.jsonl)
+    TRACING_ENABLED: bool = False
+    TRACE_SAMPLE_RATE: float = 0.1
+    TRACE_FILE: str = ""
+    TRACE_EXPORT_BATCH_SIZE: int = 64
+
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", case_sensitive=False
     )
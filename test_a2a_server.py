@@ -1,19 +1,15 @@
 from a2a_server.common.remote_agent_connection import RemoteAgentConnection
+from a2a_server.common.http_transport import close_shared_transport
 import time
 import asyncio
 from logger import logger
 
 
-async def test_single_query(query: str):
+async def test_single_query(connection: RemoteAgentConnection, query: str):
     """Test a single query against the orchestrator."""
 
-    connection = None
     try:
-        # Connect to orchestrator using RemoteAgentConnections
-        orchestrator_url = "http://localhost:10003"
-        connection = await RemoteAgentConnection.create_from_url(orchestrator_url)
-
-        logger.info(f"\n🔍 Query: {query}")
+        logger.info("\n🔍 Query: %s", query)
         logger.info("=" * 60)
 
         start_time = time.time()
@@ -27,22 +23,18 @@ async def test_single_query(query: str):
         # Extract response
         if hasattr(response, "root") and hasattr(response.root, "result"):
             result = response.root.result
-            logger.info(f"✓ Success ({response_time:.2f}s)")
-            logger.info(f"📝 Result: {result}")
+            logger.info("✓ Success (%.2fs)", response_time)
+            logger.info("📝 Result: %s", result)
             return True, result
         else:
-            logger.info(f"✗ Unexpected response format")
-            logger.info(f"📝 Raw response: {response}")
+            logger.info("✗ Unexpected response format")
+            logger.info("📝 Raw response: %s", response)
             return False, str(response)
 
     except Exception as e:
-        logger.info(f"✗ Error: {e}")
+        logger.info("✗ Error: %s", e)
         return False, str(e)
 
-    finally:
-        if connection:
-            await connection.close()
-
 
 async def main():
     """Run simple tests."""
@@ -65,13 +57,23 @@ async def main():
 
     results = []
 
-    for i, query in enumerate(queries, 1):
-        logger.info(f"\n--- Test {i}/{len(queries)} ---")
-        success, result = await test_single_query(query)
-        results.append((query, success, result))
+    # Connect to orchestrator once and reuse the pooled connection for every query
+    orchestrator_url = "http://localhost:10003"
+    try:
+        connection = await RemoteAgentConnection.create_from_url(orchestrator_url)
+
+        for i, query in enumerate(queries, 1):
+            logger.info("\n--- Test %s/%s ---", i, len(queries))
+            success, result = await test_single_query(connection, query)
+            results.append((query, success, result))
 
-        # Small delay between queries
-        await asyncio.sleep(1)
+            # Small delay between queries
+            await asyncio.sleep(1)
+    except Exception as e:
+        logger.info("✗ Could not connect to orchestrator: %s", e)
+        return
+    finally:
+        await close_shared_transport()
 
     # Summary
     logger.info("\n" + "=" * 60)
@@ -80,16 +82,16 @@ async def main():
 
     successful = sum(1 for _, success, _ in results if success)
 
-    logger.info(f"Total tests: {len(results)}")
-    logger.info(f"Successful: {successful}")
-    logger.info(f"Failed: {len(results) - successful}")
-    logger.info(f"Success rate: {successful/len(results)*100:.1f}%")
+    logger.info("Total tests: %s", len(results))
+    logger.info("Successful: %s", successful)
+    logger.info("Failed: %s", len(results) - successful)
+    logger.info("Success rate: %.1f%%", successful / len(results) * 100)
 
     if successful < len(results):
         logger.info("\nFailed tests:")
         for query, success, result in results:
             if not success:
-                logger.info(f"  • {query}: {result}")
+                logger.info("  • %s: %s", query, result)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+import asyncio
+import unittest
+
+from a2a_server.common.concurrency import FairLimiter
+
+
+class FairLimiterCancellationTest(unittest.IsolatedAsyncioTestCase):
+    async def test_cancelling_holder_and_waiter_together(self):
+        limiter = FairLimiter(1)
+
+        async def hold():
+            await limiter.acquire()
+            try:
+                await asyncio.sleep(10)
+            finally:
+                limiter.release()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        last = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        # What cancelling a plan does: every task is cancelled in the same tick
+        holder.cancel()
+        waiter.cancel()
+        results = await asyncio.gather(holder, waiter, return_exceptions=True)
+
+        self.assertTrue(
+            all(isinstance(result, asyncio.CancelledError) for result in results)
+        )
+        await asyncio.wait_for(last, timeout=1)
+        self.assertEqual(limiter.in_flight, 1)
+        self.assertEqual(limiter.queue_depth, 0)
+        limiter.release()
+        self.assertEqual(limiter.in_flight, 0)
+
+    async def test_cancelled_after_slot_handed_over(self):
+        limiter = FairLimiter(1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        limiter.release()
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertEqual(limiter.queue_depth, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from a2a_server.common.plan_cache import PlanCache
+
+
+def math_plan(summary: str, task_description: str, task_input: str):
+    return {
+        "status": "ready",
+        "plan": {
+            "summary": summary,
+            "tasks": [
+                {
+                    "agent_name": "Math Agent",
+                    "task_description": task_description,
+                    "task_input": task_input,
+                    "order": 1,
+                    "dependencies": [],
+                }
+            ],
+        },
+    }
+
+
+class PlanCacheTemplateTest(unittest.TestCase):
+    def test_templated_hit_rewrites_summary(self):
+        cache = PlanCache()
+        cache.put(
+            "What is 10 + 5?",
+            math_plan("Add 10 and 5 with the Math Agent", "Add 10 and 5", "10 + 5"),
+        )
+
+        plan = cache.get("What is 1 + 5?")["plan"]
+
+        self.assertEqual(plan["summary"], "Add 1 and 5 with the Math Agent")
+        self.assertEqual(plan["tasks"][0]["task_description"], "Add 1 and 5")
+        self.assertEqual(plan["tasks"][0]["task_input"], "1 + 5")
+        self.assertEqual(cache.template_hits, 1)
+
+    def test_summary_with_computed_value_is_not_reused(self):
+        cache = PlanCache()
+        cache.put(
+            "What is 10 + 5?",
+            math_plan("Add 10 and 5 to get 15", "Add 10 and 5", "10 + 5"),
+        )
+
+        self.assertIsNone(cache.get("What is 1 + 5?"))
+        self.assertEqual(cache.template_hits, 0)
+        # The exact query still hits
+        self.assertIsNotNone(cache.get("What is 10 + 5?"))
+
+
+if __name__ == "__main__":
+    unittest.main()